@@ -0,0 +1,33 @@
+"""unique_strategy_names
+
+Revision ID: 5c1e7d2b9f4a
+Revises: a94c61a0c75a
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1e7d2b9f4a"
+down_revision: Union[str, None] = "a94c61a0c75a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the oldest row per name so the unique index can be created;
+    # upsert_strategy uses it as the ON CONFLICT target.
+    op.execute(
+        "DELETE FROM strategies WHERE id NOT IN "
+        "(SELECT MIN(id) FROM strategies GROUP BY name)"
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_strategies_name ON strategies (name)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_strategies_name")
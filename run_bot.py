@@ -33,6 +33,7 @@ from src.database import DatabaseManager
 from src.exchanges.paper_perps import PaperPerpsExchange
 from src.exchanges.zoomex_v3 import ZoomexV3Client
 from src.exchanges.bybit_ws import BybitWebsocketClient
+from src.indicators import warmup_kernels
 from src.messaging import MessagingClient
 from src.paper_trader import PaperBroker
 from src.risk.risk_manager import RiskManager
@@ -353,6 +354,8 @@ class TradingBot:
         self._validate_mode()
         self._maybe_run_health_gating()
 
+        await asyncio.to_thread(warmup_kernels)
+
         self.session = aiohttp.ClientSession()
         trade_log_path = Path(self.trade_log_csv or "results/live_trades.csv")
         self.trade_logger = TradeLogger(trade_log_path)
@@ -867,6 +870,12 @@ class TradingBot:
         if self.runtime_health_thread:
             self.runtime_health_thread.join(timeout=5)
 
+        if self.perps_service:
+            await self.perps_service.flush_state()
+
+        if self.risk_manager:
+            self.risk_manager.close()
+
         if self.session:
             await self.session.close()
             logger.info("HTTP session closed")
@@ -0,0 +1,531 @@
+"""
+Compiled kernels backing ``TechnicalIndicators`` and the dynamic strategy engine.
+
+Each kernel takes float64 ndarrays and returns a preallocated float64
+ndarray that matches the pandas implementation in ``src.indicators``
+bar-for-bar, including NaN warm-up periods. Kernels are compiled with
+Numba when it is installed; otherwise ``NUMBA_AVAILABLE`` is False and
+``TechnicalIndicators`` keeps using its pandas code path.
+"""
+
+import math
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+njit: Optional[Callable[..., Any]]
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+
+# fastmath without nnan/ninf (NaN warm-up values must survive) and without
+# reassoc/contract (they would optimise away the Kahan compensation below).
+_FASTMATH = {"nsz", "arcp", "afn"}
+# nogil lets callers run kernels from worker threads concurrently.
+_JIT_OPTIONS = {
+    "cache": True,
+    "nogil": True,
+    "fastmath": _FASTMATH,
+    "error_model": "numpy",
+}
+
+
+def _jit(func):
+    if njit is None:  # pragma: no cover - optional dependency
+        return func
+    return njit(**_JIT_OPTIONS)(func)
+
+
+@_jit
+def ema(values, period):
+    """EMA with ``adjust=False`` semantics (``Series.ewm(span=period)``)."""
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+    alpha = 2.0 / (period + 1.0)
+    decay = 1.0 - alpha
+    weighted = values[0]
+    out[0] = weighted
+    old_wt = 1.0
+    for i in range(1, n):
+        cur = values[i]
+        observed = not math.isnan(cur)
+        if not math.isnan(weighted):
+            old_wt *= decay
+            if observed:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+        elif observed:
+            weighted = cur
+        out[i] = weighted
+    return out
+
+
+@_jit
+def ema_recursive(values, period):
+    """``alpha * x + (1 - alpha) * prev`` seeded with ``values[0]``; NaNs propagate."""
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+    alpha = 2.0 / (period + 1.0)
+    decay = 1.0 - alpha
+    prev = values[0]
+    out[0] = prev
+    for i in range(1, n):
+        prev = alpha * values[i] + decay * prev
+        out[i] = prev
+    return out
+
+
+@_jit
+def rsi_ema(values, period):
+    """RSI from ``ema_recursive``-smoothed gains/losses, fused into one pass.
+
+    Matches ``IndicatorLibrary.rsi``: RSI is 0 while no loss has been seen.
+    """
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+    alpha = 2.0 / (period + 1.0)
+    decay = 1.0 - alpha
+    avg_gain = 0.0
+    avg_loss = 0.0
+    out[0] = 0.0
+    for i in range(1, n):
+        delta = values[i] - values[i - 1]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        avg_gain = alpha * gain + decay * avg_gain
+        avg_loss = alpha * loss + decay * avg_loss
+        rs = avg_gain / avg_loss if avg_loss != 0 else 0.0
+        out[i] = 100 - (100 / (1 + rs))
+    return out
+
+
+@_jit
+def wavetrend(ap, n1, n2):
+    """WaveTrend (Market Cipher B) over the typical price ``ap`` in one pass.
+
+    Returns ``(wt1, wt2, diff, dot)`` where ``wt2`` is the 4-bar mean of ``wt1``
+    back-filled over the first three bars and ``dot`` codes 0/1/2 for
+    none/green/red crosses, as in ``IndicatorLibrary.wavetrend_cipher_b``.
+    """
+    n = ap.shape[0]
+    wt1 = np.empty(n, dtype=np.float64)
+    wt2 = np.full(n, np.nan)
+    diff = np.empty(n, dtype=np.float64)
+    dot = np.zeros(n, dtype=np.int8)
+    if n == 0:
+        return wt1, wt2, diff, dot
+    a1 = 2.0 / (n1 + 1.0)
+    decay1 = 1.0 - a1
+    a2 = 2.0 / (n2 + 1.0)
+    decay2 = 1.0 - a2
+    esa = ap[0]
+    dev = abs(ap[0] - esa)
+    tci = (ap[0] - esa) / (0.015 * dev + 1e-9)
+    wt1[0] = tci
+    for i in range(1, n):
+        esa = a1 * ap[i] + decay1 * esa
+        dev = a1 * abs(ap[i] - esa) + decay1 * dev
+        ci = (ap[i] - esa) / (0.015 * dev + 1e-9)
+        tci = a2 * ci + decay2 * tci
+        wt1[i] = tci
+        if i >= 3:
+            wt2[i] = (wt1[i - 3] + wt1[i - 2] + wt1[i - 1] + wt1[i]) / 4
+    if n >= 4:
+        wt2[:3] = wt2[3]
+    for i in range(n):
+        diff[i] = wt1[i] - wt2[i]
+    # ``prev`` wraps to the last bar at i == 0, matching ``np.roll``.
+    for i in range(n):
+        prev = diff[i - 1] if i > 0 else diff[n - 1]
+        if prev < 0 and diff[i] >= 0 and wt1[i] < -60:
+            dot[i] = 1
+        elif prev > 0 and diff[i] <= 0 and wt1[i] > 60:
+            dot[i] = 2
+    return wt1, wt2, diff, dot
+
+
+@_jit
+def rolling_mean(values, window):
+    """Rolling mean requiring ``window`` non-NaN values per window.
+
+    Uses the same Kahan-compensated running sum as pandas so values that
+    cancel out (e.g. RSI losses over a flat window) come back as exact zeros.
+    """
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    total = 0.0
+    comp = 0.0
+    count = 0
+    neg_count = 0
+    for i in range(n):
+        v = values[i]
+        if not math.isnan(v):
+            count += 1
+            if v < 0:
+                neg_count += 1
+            y = v - comp
+            t = total + y
+            comp = (t - total) - y
+            total = t
+        if i >= window:
+            old = values[i - window]
+            if not math.isnan(old):
+                count -= 1
+                if old < 0:
+                    neg_count -= 1
+                y = -old - comp
+                t = total + y
+                comp = (t - total) - y
+                total = t
+        if count >= window:
+            mean = total / window
+            if neg_count == 0 and mean < 0:
+                mean = 0.0
+            out[i] = mean
+    return out
+
+
+@_jit
+def rolling_std(values, window):
+    """Sample (ddof=1) rolling standard deviation."""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    if window < 2:
+        return out
+    for i in range(window - 1, n):
+        total = 0.0
+        valid = True
+        for j in range(i - window + 1, i + 1):
+            if math.isnan(values[j]):
+                valid = False
+                break
+            total += values[j]
+        if not valid:
+            continue
+        mean = total / window
+        acc = 0.0
+        for j in range(i - window + 1, i + 1):
+            d = values[j] - mean
+            acc += d * d
+        out[i] = math.sqrt(acc / (window - 1))
+    return out
+
+
+@_jit
+def rolling_max(values, window):
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    for i in range(window - 1, n):
+        best = values[i - window + 1]
+        valid = not math.isnan(best)
+        j = i - window + 2
+        while valid and j <= i:
+            v = values[j]
+            if math.isnan(v):
+                valid = False
+            elif v > best:
+                best = v
+            j += 1
+        if valid:
+            out[i] = best
+    return out
+
+
+@_jit
+def rolling_min(values, window):
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    for i in range(window - 1, n):
+        best = values[i - window + 1]
+        valid = not math.isnan(best)
+        j = i - window + 2
+        while valid and j <= i:
+            v = values[j]
+            if math.isnan(v):
+                valid = False
+            elif v < best:
+                best = v
+            j += 1
+        if valid:
+            out[i] = best
+    return out
+
+
+@_jit
+def rsi(values, period):
+    """RSI from rolling-mean gains/losses, as in ``TechnicalIndicators.rsi``."""
+    n = values.shape[0]
+    gains = np.zeros(n, dtype=np.float64)
+    losses = np.zeros(n, dtype=np.float64)
+    for i in range(1, n):
+        delta = values[i] - values[i - 1]
+        if delta > 0:
+            gains[i] = delta
+        elif delta < 0:
+            losses[i] = -delta
+    avg_gain = rolling_mean(gains, period)
+    avg_loss = rolling_mean(losses, period)
+    out = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        out[i] = 100.0 - 100.0 / (1.0 + avg_gain[i] / avg_loss[i])
+    return out
+
+
+@_jit
+def true_range(high, low, close):
+    """Bar-wise max of high-low and the gaps to the previous close (NaN-skipping)."""
+    n = high.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        best = high[i] - low[i]
+        if i > 0:
+            prev = close[i - 1]
+            for cand in (abs(high[i] - prev), abs(low[i] - prev)):
+                if not math.isnan(cand) and (math.isnan(best) or cand > best):
+                    best = cand
+        out[i] = best
+    return out
+
+
+@_jit
+def atr(high, low, close, period):
+    return rolling_mean(true_range(high, low, close), period)
+
+
+@_jit
+def adx(high, low, close, period):
+    """ADX using simple rolling means, as in ``TechnicalIndicators.adx``."""
+    n = high.shape[0]
+    plus_dm = np.empty(n, dtype=np.float64)
+    minus_dm = np.empty(n, dtype=np.float64)
+    if n > 0:
+        plus_dm[0] = np.nan
+        minus_dm[0] = np.nan
+    for i in range(1, n):
+        up = high[i] - high[i - 1]
+        down = low[i] - low[i - 1]
+        plus_dm[i] = 0.0 if up < 0 else up
+        minus_dm[i] = 0.0 if down > 0 else abs(down)
+
+    avg_tr = rolling_mean(true_range(high, low, close), period)
+    avg_plus = rolling_mean(plus_dm, period)
+    avg_minus = rolling_mean(minus_dm, period)
+
+    dx = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        plus_di = 100.0 * (avg_plus[i] / avg_tr[i])
+        minus_di = 100.0 * (avg_minus[i] / avg_tr[i])
+        dx[i] = 100.0 * abs(plus_di - minus_di) / (plus_di + minus_di)
+    return rolling_mean(dx, period)
+
+
+@_jit
+def _is_pivot(values, i, order, sign):
+    """Whether ``values[i]`` is a strict extremum over ``order`` bars each side.
+
+    Mirrors ``scipy.signal.argrelextrema`` with its default ``mode="clip"``
+    edge handling; ``sign=1`` tests maxima, ``sign=-1`` minima.
+    """
+    n = values.shape[0]
+    centre = sign * values[i]
+    for shift in range(1, order + 1):
+        right = i + shift
+        if right > n - 1:
+            right = n - 1
+        left = i - shift
+        if left < 0:
+            left = 0
+        if not (centre > sign * values[right] and centre > sign * values[left]):
+            return False
+    return True
+
+
+@_jit
+def pivots(values, order, sign):
+    """Indices of all strict local maxima (``sign=1``) or minima (``sign=-1``)."""
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.int64)
+    found = 0
+    for i in range(n):
+        if _is_pivot(values, i, order, sign):
+            out[found] = i
+            found += 1
+    return out[:found]
+
+
+@_jit
+def last_two_pivots(values, order, sign):
+    """``(previous, latest)`` pivot indices scanned from the end; -1 if absent."""
+    latest = -1
+    i = values.shape[0] - 1
+    while i >= 0:
+        if _is_pivot(values, i, order, sign):
+            if latest < 0:
+                latest = i
+            else:
+                return i, latest
+        i -= 1
+    return -1, latest
+
+
+@_jit
+def divergence(price, indicator, order):
+    """Regular/hidden divergences between the last two price and indicator pivots.
+
+    Returns ``(regular_bullish, hidden_bullish, regular_bearish, hidden_bearish)``.
+    """
+    regular_bullish = hidden_bullish = False
+    regular_bearish = hidden_bearish = False
+
+    p_prev, p_curr = last_two_pivots(price, order, -1)
+    i_prev, i_curr = last_two_pivots(indicator, order, -1)
+    if p_prev >= 0 and i_prev >= 0:
+        price_lower = price[p_curr] < price[p_prev]
+        price_higher = price[p_curr] > price[p_prev]
+        ind_higher = indicator[i_curr] > indicator[i_prev]
+        ind_lower = indicator[i_curr] < indicator[i_prev]
+        regular_bullish = price_lower and ind_higher
+        hidden_bullish = price_higher and ind_lower
+
+    p_prev, p_curr = last_two_pivots(price, order, 1)
+    i_prev, i_curr = last_two_pivots(indicator, order, 1)
+    if p_prev >= 0 and i_prev >= 0:
+        price_higher = price[p_curr] > price[p_prev]
+        price_lower = price[p_curr] < price[p_prev]
+        ind_lower = indicator[i_curr] < indicator[i_prev]
+        ind_higher = indicator[i_curr] > indicator[i_prev]
+        regular_bearish = price_higher and ind_lower
+        hidden_bearish = price_lower and ind_higher
+
+    return regular_bullish, hidden_bullish, regular_bearish, hidden_bearish
+
+
+@_jit
+def simulate_long(close, high, low, signal, equity, risk_pct, stop_loss, take_profit):
+    """Long-only stop/target backtest loop of ``DynamicStrategyEngine._simulate``.
+
+    Returns ``(equity_curve, equity, wins, losses, in_position, qty, entry)``;
+    the caller settles a position still open after the last bar.
+    """
+    n = close.shape[0]
+    curve = np.empty(n, dtype=np.float64)
+    in_position = False
+    qty = 0.0
+    entry = 0.0
+    wins = 0
+    losses = 0
+    for i in range(n):
+        price = close[i]
+        if in_position:
+            stop_price = entry * (1 - stop_loss)
+            target_price = entry * (1 + take_profit)
+            if low[i] <= stop_price:
+                equity += qty * (stop_price - entry)
+                losses += 1
+                in_position = False
+            elif high[i] >= target_price:
+                equity += qty * (target_price - entry)
+                wins += 1
+                in_position = False
+            elif not signal[i]:
+                equity += qty * (price - entry)
+                if price > entry:
+                    wins += 1
+                else:
+                    losses += 1
+                in_position = False
+            if not in_position:
+                qty = 0.0
+                entry = 0.0
+        elif signal[i]:
+            stop_distance = abs(price - price * (1 - stop_loss))
+            if stop_distance > 0:
+                qty = equity * (risk_pct / 100.0) / stop_distance
+            else:
+                qty = 0.0
+            if qty > 0:
+                entry = price
+                in_position = True
+        curve[i] = equity + qty * (price - entry) if in_position else equity
+    return curve, equity, wins, losses, in_position, qty, entry
+
+
+@_jit
+def max_drawdown(equity):
+    """Largest peak-to-trough fraction of an equity curve in a single pass."""
+    n = equity.shape[0]
+    if n == 0:
+        return 0.0
+    peak = equity[0]
+    worst = 0.0
+    for i in range(n):
+        value = equity[i]
+        if value > peak:
+            peak = value
+        if peak > 0:
+            drawdown = (peak - value) / peak
+            if drawdown > worst:
+                worst = drawdown
+    return worst
+
+
+@_jit
+def momentum_features(closes):
+    """``[last return, 5-return momentum, 10-return volatility]`` of ``MLStrategy``.
+
+    ``closes`` holds the most recent closes in arrival order; volatility is 0
+    until ten returns are available.
+    """
+    out = np.zeros(3, dtype=np.float64)
+    n = closes.shape[0] - 1
+    if n < 1:
+        return out
+    returns = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        returns[i] = (closes[i + 1] - closes[i]) / closes[i]
+    out[0] = returns[n - 1]
+    momentum = 0.0
+    for i in range(max(0, n - 5), n):
+        momentum += returns[i]
+    out[1] = momentum
+    if n >= 10:
+        mean = 0.0
+        for i in range(n - 10, n):
+            mean += returns[i]
+        mean /= 10
+        var = 0.0
+        for i in range(n - 10, n):
+            var += (returns[i] - mean) ** 2
+        out[2] = math.sqrt(var / 10)
+    return out
+
+
+def warmup() -> None:
+    """Compile (or load from cache) every kernel on a tiny input."""
+    dummy = np.array([1.0, 2.0], dtype=np.float64)
+    ema(dummy, 2)
+    ema_recursive(dummy, 2)
+    rsi_ema(dummy, 2)
+    wavetrend(dummy, 2, 2)
+    rolling_std(dummy, 2)
+    rolling_max(dummy, 2)
+    rolling_min(dummy, 2)
+    rsi(dummy, 2)
+    atr(dummy, dummy, dummy, 2)
+    adx(dummy, dummy, dummy, 2)
+    pivots(dummy, 1, 1)
+    divergence(dummy, dummy, 1)
+    flags = np.zeros(2, dtype=np.bool_)
+    simulate_long(dummy, dummy, dummy, flags, 1.0, 1.0, 0.01, 0.02)
+    max_drawdown(dummy)
+    momentum_features(dummy)
@@ -500,6 +500,7 @@ class ReplayConfig(StrictModel):
     start: str = "2023-01-01"
     end: str = "2024-12-31"
     seed: int = Field(default=1337, ge=0)
+    batch_size: int = Field(default=64, ge=1, le=1024)
 
     @field_validator("speed")
     @classmethod
@@ -338,6 +338,10 @@ class ParamMutation(DBModel):
 class DatabaseBackend:
     """Interface for database backends."""
 
+    # Set once the unique index on strategies.name exists; until then
+    # upsert_strategy has no ON CONFLICT target and saves by lookup instead.
+    strategy_names_unique: bool = False
+
     async def initialize(self) -> None:
         raise NotImplementedError
 
@@ -375,6 +379,18 @@ class DatabaseBackend:
 
     async def update_strategy(self, strategy: Strategy) -> bool:
         raise NotImplementedError
+
+    async def upsert_strategy(self, strategy: Strategy) -> Optional[int]:
+        raise NotImplementedError
+
+    async def _save_strategy_by_name(self, strategy: Strategy) -> Optional[int]:
+        """Lookup-then-write save used when strategy names are not unique."""
+        existing = await self.get_strategy_by_name(strategy.name)
+        if existing is None:
+            return await self.create_strategy(strategy)
+        strategy.id = existing.id
+        strategy.is_active = existing.is_active
+        return existing.id if await self.update_strategy(strategy) else None
     
     async def toggle_strategy_active(self, strategy_id: int, is_active: bool) -> bool:
         raise NotImplementedError
@@ -883,6 +899,21 @@ class PostgresBackend(DatabaseBackend):
                 await conn.execute("ALTER TABLE agents ADD COLUMN strategy_name TEXT")
                 await conn.execute("ALTER TABLE agents ADD COLUMN strategy_params JSONB")
 
+            # Migration: unique strategy names back the upsert_strategy
+            # conflict target (alembic 5c1e7d2b9f4a removes duplicates first)
+            try:
+                await conn.execute(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_strategies_name "
+                    "ON strategies(name)"
+                )
+                self.strategy_names_unique = True
+            except Exception as exc:
+                logger.error(
+                    "Could not enforce unique strategy names (%s); run the alembic "
+                    "migrations. Saving strategies by lookup until then.",
+                    exc,
+                )
+
     async def close(self) -> None:
         if self.pool:
             await self.pool.close()
@@ -1290,6 +1321,27 @@ class PostgresBackend(DatabaseBackend):
                 strategy.id
             )
             return int(res.split(" ")[-1]) > 0
+
+    async def upsert_strategy(self, strategy: Strategy) -> Optional[int]:
+        if not self.pool:
+            return None
+        if not self.strategy_names_unique:
+            return await self._save_strategy_by_name(strategy)
+        import json
+        query = """
+            INSERT INTO strategies (name, config, is_active)
+            VALUES ($1, $2, $3)
+            ON CONFLICT (name) DO UPDATE
+            SET config = EXCLUDED.config, updated_at = CURRENT_TIMESTAMP
+            RETURNING id
+        """
+        async with self.pool.acquire() as conn:
+            return await conn.fetchval(
+                query,
+                strategy.name,
+                json.dumps(strategy.config),
+                strategy.is_active,
+            )
             
     async def toggle_strategy_active(self, strategy_id: int, is_active: bool) -> bool:
         if not self.pool:
@@ -2315,6 +2367,22 @@ class SQLiteBackend(DatabaseBackend):
             await self.conn.execute("ALTER TABLE agents ADD COLUMN strategy_params TEXT")
             await self.conn.commit()
 
+        # Unique strategy names back the upsert_strategy conflict target
+        # (alembic 5c1e7d2b9f4a removes duplicates first)
+        try:
+            await self.conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_strategies_name "
+                "ON strategies(name)"
+            )
+            await self.conn.commit()
+            self.strategy_names_unique = True
+        except Exception as exc:
+            logger.error(
+                "Could not enforce unique strategy names (%s); run the alembic "
+                "migrations. Saving strategies by lookup until then.",
+                exc,
+            )
+
     async def close(self) -> None:
         if self.conn:
             await self.conn.close()
@@ -2764,6 +2832,35 @@ class SQLiteBackend(DatabaseBackend):
             logger.error("SQLite update_strategy failed: %s", e)
             return False
 
+    async def upsert_strategy(self, strategy: Strategy) -> Optional[int]:
+        if not self.conn:
+            return None
+        if not self.strategy_names_unique:
+            return await self._save_strategy_by_name(strategy)
+        import json
+        query = """
+            INSERT INTO strategies (name, config, is_active)
+            VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE
+            SET config = excluded.config, updated_at = CURRENT_TIMESTAMP
+            RETURNING id
+        """
+        try:
+            async with self.conn.execute(
+                query,
+                (
+                    strategy.name,
+                    json.dumps(strategy.config),
+                    1 if strategy.is_active else 0,
+                ),
+            ) as cursor:
+                row = await cursor.fetchone()
+            await self.conn.commit()
+            return row[0] if row else None
+        except Exception as e:
+            logger.error("SQLite upsert_strategy failed: %s", e)
+            return None
+
     async def toggle_strategy_active(self, strategy_id: int, is_active: bool) -> bool:
         if not self.conn:
             return False
@@ -3627,6 +3724,12 @@ class DatabaseManager:
         if self.backend:
             return await self.backend.update_strategy(strategy)
         return False
+
+    async def upsert_strategy(self, strategy: Strategy) -> Optional[int]:
+        """Insert a strategy or update the config of the one with the same name."""
+        if self.backend:
+            return await self.backend.upsert_strategy(strategy)
+        return None
         
     async def toggle_strategy_active(self, strategy_id: int, is_active: bool) -> bool:
         if self.backend:
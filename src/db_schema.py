@@ -268,6 +268,7 @@ strategies = sa.Table(
         nullable=False,
         server_default=sa.text("CURRENT_TIMESTAMP"),
     ),
+    sa.Index("idx_strategies_name", "name", unique=True),
 )
 
 # ── PnL Entries ─────────────────────────────────────────────────────────────
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 
 from src.state.perps_state_store import PerpsState
 
@@ -15,6 +15,7 @@ class PnLTracker:
         self.daily_pnl: Dict[str, float] = {}
         self.consecutive_losses: int = 0
         self.trade_history: List[Dict] = []
+        self._trade_timestamps: Set[datetime] = set()
 
     def update_peak_equity(self, current_equity: float) -> bool:
         if current_equity > self.peak_equity:
@@ -51,15 +52,23 @@ class PnLTracker:
                 "date": date_key,
             }
         )
+        self._trade_timestamps.add(timestamp)
 
         logger.info(
             f"Trade recorded: PnL=${pnl:.2f} | Daily PnL=${self.daily_pnl[date_key]:.2f} | "
             f"Consecutive losses={self.consecutive_losses}"
         )
 
-    def get_daily_pnl(self, date: Optional[str] = None) -> float:
+    def has_trade(self, timestamp: datetime) -> bool:
+        return timestamp in self._trade_timestamps
+
+    def get_daily_pnl(
+        self, date: Optional[str] = None, *, now: Optional[datetime] = None
+    ) -> float:
+        # daily_pnl is the running per-day aggregate maintained by
+        # record_trade, so this is a single dict lookup.
         if date is None:
-            date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+            date = (now or datetime.now(timezone.utc)).strftime("%Y-%m-%d")
         return self.daily_pnl.get(date, 0.0)
 
     def cleanup_old_days(self, days_to_keep: int = 30) -> None:
@@ -84,3 +93,4 @@ class PnLTracker:
         self.peak_equity = state.peak_equity
         self.daily_pnl = dict(state.daily_pnl_by_date)
         self.consecutive_losses = state.consecutive_losses
+        self._trade_timestamps = {t["timestamp"] for t in self.trade_history}
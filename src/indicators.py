@@ -3,23 +3,62 @@ Technical analysis indicators with vectorized calculations.
 """
 
 import logging
-from typing import List, Optional, Tuple
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 from scipy.signal import argrelextrema
 
+from src import _indicators_nb as _nb
+from src.ta_indicators.ta_core import same_bar
+
 logger = logging.getLogger(__name__)
 
 
+def warmup_kernels() -> None:
+    """
+    Compile (or load from Numba's on-disk cache) the indicator kernels.
+
+    Call once at service startup so the first calculation does not pay the
+    JIT latency; a no-op without Numba.
+    """
+    if _nb.NUMBA_AVAILABLE:
+        _nb.warmup()
+
+
+def _values(series: pd.Series) -> np.ndarray:
+    """Contiguous float64 view of ``series`` for the compiled kernels."""
+    return np.ascontiguousarray(series.to_numpy(dtype=np.float64))
+
+
+def _array(values: Any) -> np.ndarray:
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _wrap(values: np.ndarray, like: pd.Series, name=None) -> pd.Series:
+    return pd.Series(values, index=like.index, name=name)
+
+
 class TechnicalIndicators:
     """Technical analysis indicators collection."""
 
     @staticmethod
     def ema(data: pd.Series, period: int) -> pd.Series:
         """Exponential Moving Average."""
+        if _nb.NUMBA_AVAILABLE:
+            return _wrap(_nb.ema(_values(data), period), data, data.name)
         return data.ewm(span=period, adjust=False).mean()
 
+    @staticmethod
+    def ema_np(values: np.ndarray, period: int) -> np.ndarray:
+        """Exponential Moving Average over a raw array."""
+        values = _array(values)
+        if _nb.NUMBA_AVAILABLE:
+            return _nb.ema(values, period)
+        return TechnicalIndicators.ema(pd.Series(values), period).to_numpy()
+
     @staticmethod
     def sma(data: pd.Series, period: int) -> pd.Series:
         """Simple Moving Average."""
@@ -28,6 +67,8 @@ class TechnicalIndicators:
     @staticmethod
     def rsi(data: pd.Series, period: int = 14) -> pd.Series:
         """Relative Strength Index."""
+        if _nb.NUMBA_AVAILABLE:
+            return _wrap(_nb.rsi(_values(data), period), data, data.name)
         delta = data.diff().astype(float)
         gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
         loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
@@ -42,6 +83,9 @@ class TechnicalIndicators:
         data: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9
     ) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """MACD (Moving Average Convergence Divergence)."""
+        if _nb.NUMBA_AVAILABLE:
+            arrays = TechnicalIndicators.macd_np(_values(data), fast, slow, signal)
+            return tuple(_wrap(arr, data, data.name) for arr in arrays)
         ema_fast = TechnicalIndicators.ema(data, fast)
         ema_slow = TechnicalIndicators.ema(data, slow)
 
@@ -51,22 +95,61 @@ class TechnicalIndicators:
 
         return macd_line, signal_line, histogram
 
+    @staticmethod
+    def macd_np(
+        values: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """MACD line, signal line and histogram over a raw array."""
+        values = _array(values)
+        if not _nb.NUMBA_AVAILABLE:
+            series = TechnicalIndicators.macd(pd.Series(values), fast, slow, signal)
+            return tuple(s.to_numpy() for s in series)
+        macd_line = _nb.ema(values, fast) - _nb.ema(values, slow)
+        signal_line = _nb.ema(macd_line, signal)
+        return macd_line, signal_line, macd_line - signal_line
+
     @staticmethod
     def bollinger_bands(
         data: pd.Series, period: int = 20, std_dev: float = 2.0
     ) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """Bollinger Bands."""
         sma = TechnicalIndicators.sma(data, period)
-        std = data.rolling(window=period).std()
+        if _nb.NUMBA_AVAILABLE:
+            std = _wrap(_nb.rolling_std(_values(data), period), data, data.name)
+        else:
+            std = data.rolling(window=period).std()
 
         upper_band = sma + (std * std_dev)
         lower_band = sma - (std * std_dev)
 
         return upper_band, sma, lower_band
 
+    @staticmethod
+    def bollinger_np(
+        values: np.ndarray, period: int = 20, std_dev: float = 2.0
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Bollinger Bands (upper, middle, lower) over a raw array."""
+        values = _array(values)
+        if not _nb.NUMBA_AVAILABLE:
+            bands = TechnicalIndicators.bollinger_bands(
+                pd.Series(values), period, std_dev
+            )
+            return tuple(b.to_numpy() for b in bands)
+        middle = _nb.rolling_mean(values, period)
+        width = _nb.rolling_std(values, period) * std_dev
+        return middle + width, middle, middle - width
+
     @staticmethod
     def atr(data: pd.DataFrame, period: int = 14) -> pd.Series:
         """Average True Range."""
+        if _nb.NUMBA_AVAILABLE:
+            out = _nb.atr(
+                _values(data["high"]),
+                _values(data["low"]),
+                _values(data["close"]),
+                period,
+            )
+            return _wrap(out, data)
         high = data["high"]
         low = data["low"]
         close = data["close"]
@@ -80,9 +163,28 @@ class TechnicalIndicators:
 
         return atr
 
+    @staticmethod
+    def atr_np(
+        high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14
+    ) -> np.ndarray:
+        """Average True Range over raw high/low/close arrays."""
+        high, low, close = _array(high), _array(low), _array(close)
+        if _nb.NUMBA_AVAILABLE:
+            return _nb.atr(high, low, close, period)
+        frame = pd.DataFrame({"high": high, "low": low, "close": close})
+        return TechnicalIndicators.atr(frame, period).to_numpy()
+
     @staticmethod
     def adx(data: pd.DataFrame, period: int = 14) -> pd.Series:
         """Average Directional Index."""
+        if _nb.NUMBA_AVAILABLE:
+            out = _nb.adx(
+                _values(data["high"]),
+                _values(data["low"]),
+                _values(data["close"]),
+                period,
+            )
+            return _wrap(out, data)
         high = data["high"]
         low = data["low"]
         close = data["close"]
@@ -112,16 +214,45 @@ class TechnicalIndicators:
 
         return adx
 
+    @staticmethod
+    def adx_np(
+        high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14
+    ) -> np.ndarray:
+        """Average Directional Index over raw high/low/close arrays."""
+        high, low, close = _array(high), _array(low), _array(close)
+        if _nb.NUMBA_AVAILABLE:
+            return _nb.adx(high, low, close, period)
+        frame = pd.DataFrame({"high": high, "low": low, "close": close})
+        return TechnicalIndicators.adx(frame, period).to_numpy()
+
     @staticmethod
     def donchian_channels(
         data: pd.DataFrame, period: int = 20
     ) -> Tuple[pd.Series, pd.Series]:
         """Donchian Channels."""
+        if _nb.NUMBA_AVAILABLE:
+            high, low = data["high"], data["low"]
+            return (
+                _wrap(_nb.rolling_max(_values(high), period), high, high.name),
+                _wrap(_nb.rolling_min(_values(low), period), low, low.name),
+            )
         high_channel = data["high"].rolling(window=period).max()
         low_channel = data["low"].rolling(window=period).min()
 
         return high_channel, low_channel
 
+    @staticmethod
+    def donchian_np(
+        high: np.ndarray, low: np.ndarray, period: int = 20
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Donchian Channels over raw high/low arrays."""
+        high, low = _array(high), _array(low)
+        if _nb.NUMBA_AVAILABLE:
+            return _nb.rolling_max(high, period), _nb.rolling_min(low, period)
+        frame = pd.DataFrame({"high": high, "low": low})
+        upper, lower = TechnicalIndicators.donchian_channels(frame, period)
+        return upper.to_numpy(), lower.to_numpy()
+
     @staticmethod
     def stochastic(
         data: pd.DataFrame, k_period: int = 14, d_period: int = 3
@@ -194,67 +325,28 @@ class TechnicalIndicators:
     def detect_divergence(
         price_data: pd.Series, indicator_data: pd.Series, k: int = 3
     ) -> dict:
-        """Detect regular and hidden bullish/bearish divergences."""
+        """Detect regular and hidden bullish/bearish divergences.
+
+        Compares the last two price pivots with the last two indicator pivots
+        (local extrema over ``k`` bars each side). ``bullish``/``bearish``
+        summarise the regular (reversal) divergences.
+        """
         try:
-            # Find pivots
-            price_pivots_max: List[int] = np.asarray(
-                argrelextrema(price_data.to_numpy(), np.greater, order=k)[0]
-            ).tolist()
-            price_pivots_min: List[int] = np.asarray(
-                argrelextrema(price_data.to_numpy(), np.less, order=k)[0]
-            ).tolist()
-
-            ind_pivots_max: List[int] = np.asarray(
-                argrelextrema(indicator_data.to_numpy(), np.greater, order=k)[0]
-            ).tolist()
-            ind_pivots_min: List[int] = np.asarray(
-                argrelextrema(indicator_data.to_numpy(), np.less, order=k)[0]
-            ).tolist()
-
-            # Initialize results
-            results = {
-                "regular_bullish": False,
-                "regular_bearish": False,
-                "hidden_bullish": False,
-                "hidden_bearish": False,
+            (
+                regular_bullish,
+                hidden_bullish,
+                regular_bearish,
+                hidden_bearish,
+            ) = _nb.divergence(_values(price_data), _values(indicator_data), k)
+            return {
+                "regular_bullish": bool(regular_bullish),
+                "regular_bearish": bool(regular_bearish),
+                "hidden_bullish": bool(hidden_bullish),
+                "hidden_bearish": bool(hidden_bearish),
+                "bullish": bool(regular_bullish),
+                "bearish": bool(regular_bearish),
             }
 
-            # Need at least 2 pivots to compare
-            if len(price_pivots_min) >= 2 and len(ind_pivots_min) >= 2:
-                # Check Minima (Bullish Divergences)
-                # We look at the last two minima
-                p_min_curr = price_data.iloc[price_pivots_min[-1]]
-                p_min_prev = price_data.iloc[price_pivots_min[-2]]
-
-                i_min_curr = indicator_data.iloc[ind_pivots_min[-1]]
-                i_min_prev = indicator_data.iloc[ind_pivots_min[-2]]
-
-                # Regular Bullish: Price Lower Low, Indicator Higher Low
-                if p_min_curr < p_min_prev and i_min_curr > i_min_prev:
-                    results["regular_bullish"] = True
-
-                # Hidden Bullish: Price Higher Low, Indicator Lower Low
-                if p_min_curr > p_min_prev and i_min_curr < i_min_prev:
-                    results["hidden_bullish"] = True
-
-            if len(price_pivots_max) >= 2 and len(ind_pivots_max) >= 2:
-                # Check Maxima (Bearish Divergences)
-                p_max_curr = price_data.iloc[price_pivots_max[-1]]
-                p_max_prev = price_data.iloc[price_pivots_max[-2]]
-
-                i_max_curr = indicator_data.iloc[ind_pivots_max[-1]]
-                i_max_prev = indicator_data.iloc[ind_pivots_max[-2]]
-
-                # Regular Bearish: Price Higher High, Indicator Lower High
-                if p_max_curr > p_max_prev and i_max_curr < i_max_prev:
-                    results["regular_bearish"] = True
-
-                # Hidden Bearish: Price Lower High, Indicator Higher High
-                if p_max_curr < p_max_prev and i_max_curr > i_max_prev:
-                    results["hidden_bearish"] = True
-
-            return results
-
         except Exception as e:
             logger.error(f"Error detecting divergence: {e}")
             return {
@@ -262,6 +354,8 @@ class TechnicalIndicators:
                 "regular_bearish": False,
                 "hidden_bullish": False,
                 "hidden_bearish": False,
+                "bullish": False,
+                "bearish": False,
             }
 
     @staticmethod
@@ -432,3 +526,246 @@ class TechnicalIndicators:
         wt2 = TechnicalIndicators.sma(wt1, 4)
 
         return pd.DataFrame({"wt1": wt1, "wt2": wt2, "diff": wt1 - wt2})
+
+
+class _Ema:
+    """``Series.ewm(span=period, adjust=False).mean()`` advanced one value at a time."""
+
+    __slots__ = ("alpha", "decay", "value", "old_wt")
+
+    def __init__(self, period: int):
+        self.alpha = 2.0 / (period + 1.0)
+        self.decay = 1.0 - self.alpha
+        self.value = math.nan
+        self.old_wt = 1.0
+
+    def update(self, x: float) -> float:
+        if self.value == self.value:
+            self.old_wt *= self.decay
+            if x == x:
+                if self.value != x:
+                    self.value = (self.old_wt * self.value + self.alpha * x) / (
+                        self.old_wt + self.alpha
+                    )
+                self.old_wt = 1.0
+        elif x == x:
+            self.value = x
+        return self.value
+
+
+class _Window:
+    """Fixed-size window with pandas ``rolling`` NaN semantics."""
+
+    __slots__ = ("period", "values")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.values: Deque[float] = deque(maxlen=period)
+
+    def push(self, x: float) -> None:
+        self.values.append(x)
+
+    def _full(self) -> bool:
+        return len(self.values) == self.period and not any(v != v for v in self.values)
+
+    def mean(self) -> float:
+        return math.fsum(self.values) / self.period if self._full() else math.nan
+
+    def std(self) -> float:
+        if self.period < 2 or not self._full():
+            return math.nan
+        mean = math.fsum(self.values) / self.period
+        acc = math.fsum((v - mean) ** 2 for v in self.values)
+        return math.sqrt(acc / (self.period - 1))
+
+    def max(self) -> float:
+        return max(self.values) if self._full() else math.nan
+
+    def min(self) -> float:
+        return min(self.values) if self._full() else math.nan
+
+
+def _div(num: float, den: float) -> float:
+    """Float division returning NumPy's inf/NaN results instead of raising."""
+    if den == 0:
+        if num == 0 or num != num:
+            return math.nan
+        return math.copysign(math.inf, num)
+    return num / den
+
+
+class IncrementalIndicators:
+    """
+    Latest indicator values for one OHLC stream, advanced bar by bar.
+
+    Uses the same formulas as ``TechnicalIndicators`` (adjust=False EMAs,
+    simple rolling means for RSI/ATR/ADX) so each new bar costs O(period)
+    instead of recomputing whole Series. ``advance`` recognises a frame
+    that extends the previously seen one by a single bar; anything else
+    (first call, gaps, revised bars) re-seeds the state from the frame.
+    Rolling-window values therefore match a full recompute exactly, while
+    EMAs keep their history across frames rather than re-seeding on each
+    fetched window.
+    """
+
+    def __init__(
+        self,
+        *,
+        emas: Sequence[int] = (),
+        macd: Optional[Tuple[int, int]] = None,
+        rsi_period: Optional[int] = None,
+        atr_period: Optional[int] = None,
+        adx_period: Optional[int] = None,
+        donchian_period: Optional[int] = None,
+        bollinger: Optional[Tuple[int, float]] = None,
+        keep_history: bool = False,
+    ):
+        self._spec: Dict[str, Any] = {
+            "emas": tuple(emas),
+            "macd": macd,
+            "rsi_period": rsi_period,
+            "atr_period": atr_period,
+            "adx_period": adx_period,
+            "donchian_period": donchian_period,
+            "bollinger": bollinger,
+        }
+        self._keep_history = keep_history
+        self._last_bar: Optional[Tuple[Hashable, float, float, float]] = None
+        self.values: Dict[str, float] = {}
+        self.reset()
+
+    def reset(self, history: int = 0) -> None:
+        """Drop all state; ``history`` bounds the retained close/RSI values."""
+        spec = self._spec
+        self._emas = {p: _Ema(p) for p in spec["emas"]}
+        self._macd = (
+            (_Ema(spec["macd"][0]), _Ema(spec["macd"][1])) if spec["macd"] else None
+        )
+        rsi_p = spec["rsi_period"]
+        self._rsi = (_Window(rsi_p), _Window(rsi_p)) if rsi_p else None
+        atr_p = spec["atr_period"]
+        self._tr = _Window(atr_p) if atr_p else None
+        adx_p = spec["adx_period"]
+        if adx_p:
+            self._adx_tr = _Window(adx_p)
+            self._plus_dm = _Window(adx_p)
+            self._minus_dm = _Window(adx_p)
+            self._dx = _Window(adx_p)
+        don_p = spec["donchian_period"]
+        self._donchian = (_Window(don_p), _Window(don_p)) if don_p else None
+        self._bb = _Window(spec["bollinger"][0]) if spec["bollinger"] else None
+        self._prev: Optional[Tuple[float, float, float]] = None
+        self._last_bar = None
+        self.values = {}
+        maxlen = history if self._keep_history and history > 0 else 0
+        self.closes: Deque[float] = deque(maxlen=maxlen)
+        self.rsi_values: Deque[float] = deque(maxlen=maxlen)
+
+    def update(self, close: float, high: float, low: float) -> Dict[str, float]:
+        """Fold one bar into the state and return the latest values."""
+        values = self.values
+        prev = self._prev
+
+        for period, ema in self._emas.items():
+            values[f"ema_{period}"] = ema.update(close)
+        if self._macd is not None:
+            fast, slow = self._macd
+            values["macd"] = fast.update(close) - slow.update(close)
+
+        if self._rsi is not None:
+            gains, losses = self._rsi
+            delta = close - prev[0] if prev is not None else math.nan
+            gains.push(delta if delta > 0 else 0.0)
+            losses.push(-delta if delta < 0 else 0.0)
+            values["rsi"] = 100 - _div(100.0, 1 + _div(gains.mean(), losses.mean()))
+            if self._keep_history:
+                self.rsi_values.append(values["rsi"])
+
+        if self._tr is not None or self._spec["adx_period"]:
+            tr = high - low
+            if prev is not None:
+                for gap in (abs(high - prev[0]), abs(low - prev[0])):
+                    if gap == gap and (tr != tr or gap > tr):
+                        tr = gap
+            if self._tr is not None:
+                self._tr.push(tr)
+                values["atr"] = self._tr.mean()
+            if self._spec["adx_period"]:
+                values["adx"] = self._update_adx(tr, high, low, prev)
+
+        if self._donchian is not None:
+            highs, lows = self._donchian
+            highs.push(high)
+            lows.push(low)
+            values["donchian_high"] = highs.max()
+            values["donchian_low"] = lows.min()
+
+        if self._bb is not None:
+            self._bb.push(close)
+            middle = self._bb.mean()
+            width = self._bb.std() * self._spec["bollinger"][1]
+            values["bb_middle"] = middle
+            values["bb_upper"] = middle + width
+            values["bb_lower"] = middle - width
+
+        if self._keep_history:
+            self.closes.append(close)
+        self._prev = (close, high, low)
+        return values
+
+    def _update_adx(
+        self,
+        tr: float,
+        high: float,
+        low: float,
+        prev: Optional[Tuple[float, float, float]],
+    ) -> float:
+        if prev is None:
+            plus_dm = minus_dm = math.nan
+        else:
+            up = high - prev[1]
+            down = low - prev[2]
+            plus_dm = 0.0 if up < 0 else up
+            minus_dm = 0.0 if down > 0 else abs(down)
+        self._adx_tr.push(tr)
+        self._plus_dm.push(plus_dm)
+        self._minus_dm.push(minus_dm)
+        avg_tr = self._adx_tr.mean()
+        plus_di = 100 * _div(self._plus_dm.mean(), avg_tr)
+        minus_di = 100 * _div(self._minus_dm.mean(), avg_tr)
+        self._dx.push(100 * _div(abs(plus_di - minus_di), plus_di + minus_di))
+        return self._dx.mean()
+
+    def advance(self, data: pd.DataFrame) -> Dict[str, float]:
+        """Return the latest values for ``data``, reusing state when possible."""
+        if data.empty:
+            self.reset()
+            return self.values
+
+        close = data["close"].to_numpy(dtype=np.float64)
+        high = (
+            data["high"].to_numpy(dtype=np.float64) if "high" in data.columns else close
+        )
+        low = data["low"].to_numpy(dtype=np.float64) if "low" in data.columns else close
+        if "timestamp" in data.columns:
+            bars = data["timestamp"].to_numpy()
+        else:
+            bars = data.index.to_numpy()
+
+        def bar(i: int) -> Tuple[Hashable, float, float, float]:
+            return (bars[i], float(close[i]), float(high[i]), float(low[i]))
+
+        last_bar = self._last_bar
+        if last_bar is not None and same_bar(last_bar, bar(-1)):
+            return self.values
+        if len(data) > 1 and last_bar is not None and same_bar(last_bar, bar(-2)):
+            self.update(float(close[-1]), float(high[-1]), float(low[-1]))
+        else:
+            self.reset(history=len(data))
+            update = self.update
+            for c, h, lo in zip(
+                close.tolist(), high.tolist(), low.tolist(), strict=True
+            ):
+                update(c, h, lo)
+        self._last_bar = bar(-1)
+        return self.values
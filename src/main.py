@@ -12,6 +12,7 @@ from src.database import DatabaseManager
 from src.exchange import ExchangeClient
 from src.exchanges.bybit_ws import BybitWebsocketClient
 from src.exchanges.paper_perps import PaperPerpsExchange
+from src.indicators import warmup_kernels
 from src.logging_config import setup_logging
 from src.messaging import MessagingClient
 from src.paper_trader import PaperBroker
@@ -120,6 +121,7 @@ class TradingEngine:
             )
 
             self._last_config_mtime = Path("config/strategy.yaml").stat().st_mtime
+            await asyncio.to_thread(warmup_kernels)
 
             # Initialize Container
             self.container = Container(config)
@@ -7,10 +7,11 @@ from __future__ import annotations
 
 import asyncio
 import importlib
-import json
 import logging
 from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional
 
+from .utils import json_codec
+
 if TYPE_CHECKING:  # pragma: no cover - typing aides
     from nats.aio.msg import Msg as MsgT
     from nats.aio.subscription import Subscription as SubscriptionT
@@ -65,7 +66,7 @@ class MemoryMessagingClient:
         self.subscribers.clear()
         logger.info("Closed In-Memory Messaging Bus")
 
-    async def publish(self, subject: str, message: Dict[str, Any]):
+    async def publish(self, subject: str, message: Dict[str, Any] | bytes):
         """Publish message to local subscribers."""
         if not self.connected:
             logger.warning("Attempted to publish to closed memory bus")
@@ -75,7 +76,10 @@ class MemoryMessagingClient:
             return
 
         # Create a mock NATS message object
-        data_bytes = json.dumps(message).encode("utf-8")
+        if isinstance(message, bytes):
+            data_bytes = message
+        else:
+            data_bytes = json_codec.dumps(message)
 
         class MockMsg:
             def __init__(self, data, subj):
@@ -385,8 +389,11 @@ class MessagingClient:
             self._callbacks.clear()
             self._needs_restore = True
 
-    async def publish(self, subject: str, message: Dict[str, Any]):
-        """Publish a message to a subject with retry/backoff."""
+    async def publish(self, subject: str, message: Dict[str, Any] | bytes):
+        """Publish a message to a subject with retry/backoff.
+
+        ``message`` may be a JSON-serialisable dict or already-encoded bytes.
+        """
         if self._is_memory:
             await self._delegate.publish(subject, message)
             return
@@ -398,11 +405,14 @@ class MessagingClient:
             )
             return
 
-        try:
-            payload = json.dumps(message).encode()
-        except (TypeError, ValueError) as exc:
-            logger.error("Failed to serialise message for %s: %s", subject, exc)
-            return
+        if isinstance(message, bytes):
+            payload = message
+        else:
+            try:
+                payload = json_codec.dumps(message)
+            except (TypeError, ValueError) as exc:
+                logger.error("Failed to serialise message for %s: %s", subject, exc)
+                return
 
         attempts = 0
         total_attempts = max(self._publish_retries, 0) + 1
@@ -441,6 +451,20 @@ class MessagingClient:
                 )
                 await asyncio.sleep(delay)
 
+    async def flush(self, timeout: float = 2.0) -> None:
+        """Flush buffered publishes to the server in a single round-trip."""
+        if self._is_memory or not NATS_AVAILABLE:
+            return
+        if self.nc is None or not self._is_nc_connected():
+            return
+
+        # A failed flush (e.g. a slow server timing out the PING) does not
+        # mean the connection is gone; the NATS callbacks track that.
+        try:
+            await self.nc.flush(timeout=timeout)
+        except Exception as exc:
+            logger.warning("NATS flush failed: %s", exc)
+
     async def subscribe(
         self, subject: str, callback: Callable[[MsgT], Awaitable[None] | None]
     ) -> Optional[SubscriptionT]:
@@ -504,7 +528,7 @@ class MessagingClient:
             return None
 
         try:
-            payload = json.dumps(message).encode()
+            payload = json_codec.dumps(message)
         except (TypeError, ValueError) as exc:
             logger.error("Failed to serialise request payload for %s: %s", subject, exc)
             return None
@@ -528,8 +552,8 @@ class MessagingClient:
             try:
                 response = await self.nc.request(subject, payload, timeout=timeout)
                 try:
-                    return json.loads(response.data)
-                except json.JSONDecodeError as exc:
+                    return json_codec.loads(response.data)
+                except json_codec.JSONDecodeError as exc:
                     logger.error("Failed to decode response from %s: %s", subject, exc)
                     return None
             except asyncio.TimeoutError:
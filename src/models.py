@@ -4,6 +4,7 @@ Shared data models and types.
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Literal, Optional
 
@@ -75,7 +76,8 @@ class MarketSnapshot(BaseModel):
         return (self.spread / mid) * 10_000
 
 
-class MarketRegime(BaseModel):
+@dataclass(slots=True, frozen=True)
+class MarketRegime:
     """Market regime classification."""
 
     regime: str  # 'bullish', 'bearish', 'neutral'
@@ -83,7 +85,8 @@ class MarketRegime(BaseModel):
     confidence: float  # 0-1
 
 
-class TradingSetup(BaseModel):
+@dataclass(slots=True, frozen=True)
+class TradingSetup:
     """Trading setup classification."""
 
     direction: str  # 'long', 'short', 'none'
@@ -91,7 +94,8 @@ class TradingSetup(BaseModel):
     strength: float  # 0-1
 
 
-class TradingSignal(BaseModel):
+@dataclass(slots=True, frozen=True)
+class TradingSignal:
     """Trading signal with metadata."""
 
     signal_type: str  # 'pullback', 'breakout', 'divergence'
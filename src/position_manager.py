@@ -1,6 +1,7 @@
 import logging
 from typing import Dict, Optional
 
+import numpy as np
 import pandas as pd
 
 from src.config import StrategyConfig, TradingBotConfig
@@ -56,10 +57,17 @@ class PositionManager:
                     signal_data = signal_data["signal"]
 
                 if isinstance(signal_data, pd.DataFrame) and not signal_data.empty:
-                    atr = self.indicators.atr(signal_data, 14)
-                    if not atr.empty:
-                        avg_atr = atr.rolling(50).mean().iloc[-1]
-                        current_atr = atr.iloc[-1]
+                    atr = self.indicators.atr_np(
+                        signal_data["high"].to_numpy(),
+                        signal_data["low"].to_numpy(),
+                        signal_data["close"].to_numpy(),
+                        14,
+                    )
+                    if atr.size:
+                        # Mean of the last 50 ATR values (NaN if any are missing)
+                        recent = atr[-50:]
+                        avg_atr = recent.mean() if recent.size == 50 else np.nan
+                        current_atr = atr[-1]
 
                         if current_atr > avg_atr * 2:
                             penalty_score += config.confidence.penalties.get(
@@ -13,6 +13,7 @@ from pydantic import BaseModel, Field
 
 from src.application.backtest_engine import BacktestExecutionEngine
 from src.application.strategy_manager import StrategyManager
+from src.indicators import warmup_kernels
 from src.services.strategy_store import StrategyStore
 from src.strategies.dynamic_engine import DynamicStrategyEngine
 from src.strategies.ml_skeleton import MLStrategy
@@ -498,6 +499,7 @@ async def market_data_simulator():
 
 @app.on_event("startup")
 async def startup_event():
+    await asyncio.to_thread(warmup_kernels)
     await strategy_manager.start()
     asyncio.create_task(market_data_simulator())
 
@@ -116,6 +116,11 @@ class RiskManager:
         pct = max(risk_pct, 0.0)
         return notional_abs * pct
 
+    def close(self) -> None:
+        """Persist any pending daily PnL updates."""
+        if self.daily_pnl_store:
+            self.daily_pnl_store.close()
+
     def _update_daily_pnl(self, delta_pnl: float) -> None:
         date_key = self._current_date_key()
         if self.daily_pnl_store and self.account_id:
@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -32,11 +33,17 @@ from src.state.perps_state_store import (
     save_perps_state,
 )
 from src.state.symbol_health_store import SymbolHealthStore
-from src.strategies.perps_trend_atr_multi_tf import compute_signals_multi_tf
-from src.strategies.perps_trend_vwap import compute_signals
+from src.strategies.perps_trend_atr_multi_tf import (
+    MultiTfSignalState,
+    compute_signals_multi_tf,
+)
+from src.strategies.perps_trend_vwap import VwapSignalState, compute_signals
 
 logger = logging.getLogger(__name__)
 
+CLOSED_PNL_OVERLAP_MS = 5 * 60 * 1000
+STATE_PERSIST_DEBOUNCE_SECONDS = 5.0
+
 
 def _is_ambiguous_submit_error(exc: Exception) -> bool:
     if isinstance(exc, (asyncio.TimeoutError, TimeoutError)):
@@ -73,7 +80,9 @@ class PerpsService:
         self.interval_delta = self._resolve_interval_delta(config.interval)
         self.pnl_tracker = PnLTracker()
         self.entry_bar_time: Optional[datetime] = None
-        self.last_position_check_time: Optional[datetime] = None
+        self.last_position_check_monotonic: Optional[float] = None
+        # Closed-PnL fetch cursor (epoch ms); trails the newest seen trade.
+        self._closed_pnl_cursor_ms: Optional[int] = None
         self.reconciliation_block_active = False
         self.session_start_time: Optional[datetime] = None
         self.session_trades: int = 0
@@ -81,7 +90,11 @@ class PerpsService:
         self.strategy_config = strategy_config or StrategyConfig()
         self.crisis_config = crisis_config
         self.signal_generator = SignalGenerator()
+        self.multi_tf_signal_state = MultiTfSignalState()
+        self.vwap_signal_state = VwapSignalState()
         self.alert_sink: AlertSink = alert_sink or AlertManager()
+        # Fields shared by every alert this service raises.
+        self._alert_ctx: Dict[str, Any] = {"symbol": self.config.symbol}
         self.risk_manager = risk_manager
         self.trade_logger = trade_logger
         self.config_id = config_id
@@ -122,6 +135,14 @@ class PerpsService:
         state_file = self.config.stateFile or "data/perps_state.json"
         self.state_path = Path(state_file)
         self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self._persist_task: Optional[asyncio.Task[None]] = None
+        # The save running in a worker thread; cancelling _persist_task cannot
+        # stop it, so flush_state waits for it before the final write.
+        self._persist_write: Optional[asyncio.Future[None]] = None
+        self._last_persist_monotonic: Optional[float] = None
+        # Bumped by every _schedule_persist call; a write that finishes with a
+        # newer generation than it snapshotted schedules another one.
+        self._persist_generation = 0
 
     def _require_intent_ledger(self, *, context: str) -> bool:
         if self.intent_ledger:
@@ -357,13 +378,14 @@ class PerpsService:
         try:
             await self._sync_time_or_halt(periodic=True)
             await self._refresh_account_state()
-            await self._check_position_pnl()
+            now = datetime.now(timezone.utc)
+            await self._check_position_pnl(now)
             await self._reconcile_open_orders(reason="periodic")
 
-            if not await self._check_risk_limits():
+            if not await self._check_risk_limits(now):
                 return
 
-            if not await self._check_session_limits():
+            if not await self._check_session_limits(now):
                 return
 
             ltf_limit = 100
@@ -430,11 +452,15 @@ class PerpsService:
                 
                 # Fetch 1D Regime Data
                 regime_data = await self.exchange.get_historical_data(self.config.symbol, "1d", limit=200)
-                regime = self.signal_generator.detect_regime(regime_data, self.strategy_config)
+                regime = self.signal_generator.detect_regime(
+                    regime_data, self.strategy_config, stream_id=self.config.symbol
+                )
                 
                 # Fetch 4H Setup Data
                 setup_data = await self.exchange.get_historical_data(self.config.symbol, "4h", limit=100)
-                setup = self.signal_generator.detect_setup(setup_data, self.strategy_config)
+                setup = self.signal_generator.detect_setup(
+                    setup_data, self.strategy_config, stream_id=self.config.symbol
+                )
                 
                 # Use LTF (closed_df) for Signals if specific interval, or fetch 1H?
                 # SignalGenerator likely expects 1H for standard signals.
@@ -443,7 +469,9 @@ class PerpsService:
                 # For efficiency, we reuse closed_df if it's 1h, otherwise fetch.
                 # Given structure, let's fetch what SignalGenerator expects.
                 signal_data = await self.exchange.get_historical_data(self.config.symbol, "1h", limit=100)
-                raw_signals = self.signal_generator.generate_signals(signal_data, self.strategy_config)
+                raw_signals = self.signal_generator.generate_signals(
+                    signal_data, self.strategy_config, stream_id=self.config.symbol
+                )
                 
                 valid_signals = self.signal_generator.filter_signals(raw_signals, regime, setup)
                 
@@ -478,9 +506,10 @@ class PerpsService:
                     closed_df,
                     closed_htf,
                     config=self.config,
+                    state=self.multi_tf_signal_state,
                 )
             else:
-                signals = compute_signals(closed_df)
+                signals = compute_signals(closed_df, state=self.vwap_signal_state)
 
             self.last_candle_time = last_closed_time
 
@@ -550,14 +579,14 @@ class PerpsService:
             await self.alert_sink.send_alert(
                 "runtime_error",
                 f"Zoomex API error: {e}",
-                {"symbol": self.config.symbol},
+                dict(self._alert_ctx),
             )
         except Exception as e:
             logger.error("Perps cycle error: %s", e, exc_info=True)
             await self.alert_sink.send_alert(
                 "runtime_error",
                 f"Perps cycle error: {e}",
-                {"symbol": self.config.symbol},
+                dict(self._alert_ctx),
             )
 
     async def _check_early_exit(self, signals: dict):
@@ -718,7 +747,7 @@ class PerpsService:
             await self.alert_sink.send_alert(
                 "strategy_exit",
                 f"Exited position due to {exit_reason}",
-                {"symbol": self.config.symbol, "bars_in_trade": bars_in_trade},
+                {**self._alert_ctx, "bars_in_trade": bars_in_trade},
             )
             return True
 
@@ -809,11 +838,12 @@ class PerpsService:
         self.current_position_qty = 0.0
         self.entry_bar_time = None
         self.reconciliation_block_active = True  # Block new entries until manual reset
+        await self.flush_state()
 
         await self.alert_sink.send_alert(
             "emergency_halt",
             "Bot halted. Orders cancelled and positions closed.",
-            {"symbol": self.config.symbol},
+            dict(self._alert_ctx),
         )
 
     def _resolve_interval_delta(self, interval: str) -> timedelta:
@@ -858,7 +888,7 @@ class PerpsService:
             self._dispatch_alert(
                 "critical_stale_data",
                 f"{label} candle stale by {staleness:.0f}s",
-                {"symbol": self.config.symbol, "staleness_s": staleness},
+                {**self._alert_ctx, "staleness_s": staleness},
             )
             return True
 
@@ -876,7 +906,7 @@ class PerpsService:
                 self._dispatch_alert(
                     "critical_stale_data_gap",
                     f"{label} candle gap {gap:.0f}s exceeds {max_gap:.0f}s",
-                    {"symbol": self.config.symbol, "gap_s": gap},
+                    {**self._alert_ctx, "gap_s": gap},
                 )
                 return True
 
@@ -914,7 +944,7 @@ class PerpsService:
                 "critical_time_drift",
                 "Server time drift exceeded limit; trading halted.",
                 {
-                    "symbol": self.config.symbol,
+                    **self._alert_ctx,
                     "offset_ms": offset_ms,
                     "limit_ms": self.config.timeSyncMaxSkewMs,
                 },
@@ -1415,7 +1445,7 @@ class PerpsService:
                     "safety_reconciliation",
                     f"Exchange reported {side} exposure; guard enabled.",
                     {
-                        "symbol": self.config.symbol,
+                        **self._alert_ctx,
                         "exposure_side": side,
                         "quantity": size,
                     },
@@ -1445,7 +1475,7 @@ class PerpsService:
                     await self.alert_sink.send_alert(
                         "critical_reconciliation",
                         "Open orders found but no intent ledger configured.",
-                        {"symbol": self.config.symbol, "reason": reason},
+                        {**self._alert_ctx, "reason": reason},
                     )
                 return
 
@@ -1490,7 +1520,7 @@ class PerpsService:
                 await self.alert_sink.send_alert(
                     "critical_reconciliation",
                     "Unknown open orders detected; trading halted.",
-                    {"symbol": self.config.symbol, "orders": unknown_orders},
+                    {**self._alert_ctx, "orders": unknown_orders},
                 )
 
             fill_agg: Dict[str, Dict[str, float]] = {}
@@ -1585,7 +1615,7 @@ class PerpsService:
                     "critical_reconciliation",
                     "Open intent missing from exchange; trading halted.",
                     {
-                        "symbol": self.config.symbol,
+                        **self._alert_ctx,
                         "intents": [intent.client_id for intent in missing_intents],
                     },
                 )
@@ -1625,7 +1655,7 @@ class PerpsService:
         )
         return any(intent.symbol == self.config.symbol for intent in intents)
 
-    async def _check_risk_limits(self) -> bool:
+    async def _check_risk_limits(self, now: Optional[datetime] = None) -> bool:
         if self.reconciliation_block_active:
             logger.warning(
                 "SAFETY_RECON_BLOCK: Reconciliation guard active; refusing new entries until the "
@@ -1658,13 +1688,13 @@ class PerpsService:
                 "safety_circuit_breaker",
                 f"{self.pnl_tracker.consecutive_losses} consecutive losses (limit={self.config.consecutiveLossLimit}).",
                 {
-                    "symbol": self.config.symbol,
+                    **self._alert_ctx,
                     "equity": self.equity_usdt,
                 },
             )
             return False
 
-        daily_pnl = self.pnl_tracker.get_daily_pnl()
+        daily_pnl = self.pnl_tracker.get_daily_pnl(now=now)
         if self.equity_usdt > 0:
             daily_loss_pct = abs(daily_pnl) / self.equity_usdt if daily_pnl < 0 else 0.0
 
@@ -1678,7 +1708,7 @@ class PerpsService:
                     "safety_daily_loss",
                     f"Daily loss {daily_loss_pct * 100:.2f}% exceeded limit {self.max_daily_loss_pct * 100:.2f}%.",
                     {
-                        "symbol": self.config.symbol,
+                        **self._alert_ctx,
                         "equity": self.equity_usdt,
                     },
                 )
@@ -1697,7 +1727,7 @@ class PerpsService:
                     "safety_drawdown",
                     f"Drawdown {drawdown * 100:.2f}% exceeded limit {self.drawdown_threshold * 100:.2f}%.",
                     {
-                        "symbol": self.config.symbol,
+                        **self._alert_ctx,
                         "equity": self.equity_usdt,
                     },
                 )
@@ -1721,18 +1751,79 @@ class PerpsService:
         )
 
     def _persist_state(self) -> None:
+        self._last_persist_monotonic = time.monotonic()
         try:
             save_perps_state(self.state_path, self.pnl_tracker.to_state())
         except Exception as exc:
             logger.warning("Failed to persist perps state: %s", exc)
 
-    async def _check_session_limits(self) -> bool:
+    def _schedule_persist(self) -> None:
+        """Persist risk state off the event loop, coalescing bursts of updates.
+
+        At most one write task is in flight. It snapshots the tracker when it
+        writes and writes again (after the debounce window) if updates were
+        scheduled meanwhile, so the latest state always reaches disk.
+        """
+        self._persist_generation += 1
+        if self._persist_task and not self._persist_task.done():
+            return
+        delay = 0.0
+        if self._last_persist_monotonic is not None:
+            elapsed = time.monotonic() - self._last_persist_monotonic
+            delay = max(STATE_PERSIST_DEBOUNCE_SECONDS - elapsed, 0.0)
+        self._persist_task = asyncio.create_task(self._persist_state_later(delay))
+
+    async def _persist_state_later(self, delay: float) -> None:
+        while True:
+            if delay > 0:
+                await asyncio.sleep(delay)
+            generation = self._persist_generation
+            self._last_persist_monotonic = time.monotonic()
+            state = self.pnl_tracker.to_state()
+            write = asyncio.ensure_future(
+                asyncio.to_thread(save_perps_state, self.state_path, state)
+            )
+            self._persist_write = write
+            try:
+                await asyncio.shield(write)
+            except Exception as exc:
+                logger.warning("Failed to persist perps state: %s", exc)
+            if generation == self._persist_generation:
+                return
+            delay = STATE_PERSIST_DEBOUNCE_SECONDS
+
+    async def flush_state(self) -> None:
+        """Write risk state immediately, superseding any debounced write.
+
+        A write already running in a worker thread is awaited first, so the
+        final snapshot is always the last one to reach disk.
+        """
+        task = self._persist_task
+        self._persist_task = None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        write = self._persist_write
+        self._persist_write = None
+        if write is not None and not write.done():
+            try:
+                await write
+            except Exception:
+                pass  # superseded; the write below logs its own failure
+        self._persist_state()
+
+    async def _check_session_limits(self, now: Optional[datetime] = None) -> bool:
         if not self.session_start_time:
             return True
 
         if self.config.sessionMaxRuntimeMinutes:
+            if now is None:
+                now = datetime.now(timezone.utc)
             elapsed_minutes = (
-                datetime.now(timezone.utc) - self.session_start_time
+                now - self.session_start_time
             ).total_seconds() / 60.0
             if elapsed_minutes > self.config.sessionMaxRuntimeMinutes:
                 logger.warning(
@@ -1744,7 +1835,7 @@ class PerpsService:
                 await self.alert_sink.send_alert(
                     "safety_session_runtime",
                     f"Runtime {elapsed_minutes:.1f}m exceeded limit {self.config.sessionMaxRuntimeMinutes}m.",
-                    {"symbol": self.config.symbol},
+                    dict(self._alert_ctx),
                 )
                 return False
 
@@ -1761,25 +1852,28 @@ class PerpsService:
             await self.alert_sink.send_alert(
                 "safety_session_trades",
                 f"Trades {self.session_trades} reached session limit {self.config.sessionMaxTrades}.",
-                {"symbol": self.config.symbol},
+                dict(self._alert_ctx),
             )
             return False
 
         return True
 
-    async def _check_position_pnl(self) -> None:
+    async def _check_position_pnl(self, now: Optional[datetime] = None) -> None:
         if not self.exchange:
             return
 
-        now = datetime.now(timezone.utc)
+        checked_at = time.monotonic()
         if (
-            self.last_position_check_time
-            and (now - self.last_position_check_time).total_seconds() < 300
+            self.last_position_check_monotonic is not None
+            and checked_at - self.last_position_check_monotonic < 300
         ):
             return
 
+        if now is None:
+            now = datetime.now(timezone.utc)
         try:
-            start_time = int((now - timedelta(hours=24)).timestamp() * 1000)
+            window_start = int((now - timedelta(hours=24)).timestamp() * 1000)
+            start_time = max(self._closed_pnl_cursor_ms or 0, window_start)
             closed_pnl_data = await self.exchange.get_closed_pnl(
                 symbol=self.config.symbol,
                 start_time=start_time,
@@ -1790,6 +1884,7 @@ class PerpsService:
             if isinstance(trades, dict):
                 trades = trades.get("list") or []
 
+            newest_trade_time: Optional[datetime] = None
             for trade in trades:
                 pnl = (
                     self._safe_float(
@@ -1809,12 +1904,10 @@ class PerpsService:
                         "Skipping closed PnL row with missing timestamp: %s", trade
                     )
                     continue
+                if newest_trade_time is None or trade_time > newest_trade_time:
+                    newest_trade_time = trade_time
 
-                already_recorded = any(
-                    t["timestamp"] == trade_time for t in self.pnl_tracker.trade_history
-                )
-
-                if not already_recorded:
+                if not self.pnl_tracker.has_trade(trade_time):
                     self.pnl_tracker.record_trade(pnl, trade_time)
                     if self.risk_manager:
                         self.risk_manager.register_close_position(
@@ -1829,12 +1922,20 @@ class PerpsService:
                         self.last_entry_qty = None
                         self.entry_equity = None
                         self.last_risk_blocked = None
-                    self._persist_state()
+                    self._schedule_persist()
+
+            if newest_trade_time is not None:
+                # Keep a small overlap for late/out-of-order rows; has_trade()
+                # dedups anything fetched twice.
+                self._closed_pnl_cursor_ms = (
+                    int(newest_trade_time.timestamp() * 1000)
+                    - CLOSED_PNL_OVERLAP_MS
+                )
 
             if self.pnl_tracker.update_peak_equity(self.equity_usdt):
-                self._persist_state()
+                self._schedule_persist()
 
         except Exception as e:
             logger.error("Failed to check position PnL: %s", e)
         finally:
-            self.last_position_check_time = now
+            self.last_position_check_monotonic = checked_at
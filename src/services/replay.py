@@ -9,10 +9,12 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from fastapi import Body, FastAPI, HTTPException
 from nats.aio.msg import Msg
@@ -20,11 +22,19 @@ from nats.aio.subscription import Subscription
 
 from ..config import TradingBotConfig, load_config
 from ..messaging import MessagingClient
+from ..utils import json_codec
 from .base import BaseService, create_app
 
 logger = logging.getLogger(__name__)
 
 
+async def _skip_flush() -> None:
+    return None
+
+
+_SIDE_LABELS = np.array(["sell", "buy"], dtype=object)
+
+
 class ReplayService(BaseService):
     """FastAPI wrapper around the paper trading replay stream."""
 
@@ -35,10 +45,14 @@ class ReplayService(BaseService):
         self._loop_task: Optional[asyncio.Task[None]] = None
         self._control_sub: Optional[Subscription] = None
         self._running = asyncio.Event()
-        self._dataset: List[Dict[str, float | str]] = []
+        # Structure-of-arrays: one contiguous column per snapshot field.
+        self._dataset_cols: Dict[str, np.ndarray] = {}
+        self._dataset_size = 0
         self._interval = 0.5
         self._last_control: Optional[str] = None
         self._last_control_at: Optional[datetime] = None
+        self._status_template: Dict[str, Any] = {}
+        self._refresh_status_template()
 
     async def on_startup(self) -> None:
         self.config = load_config()
@@ -48,11 +62,12 @@ class ReplayService(BaseService):
         await self.messaging.connect()
 
         try:
-            self._dataset = self._load_dataset()
+            self._set_dataset(self._load_dataset())
         except FileNotFoundError:
             logger.warning("Replay dataset file not found — service will idle until data is available")
-            self._dataset = []
-        if not self._dataset:
+            self._set_dataset({})
+        self._refresh_status_template()
+        if not self._dataset_size:
             logger.warning("Replay dataset is empty; service idle — upload data via API or place files in sample_data/")
             # Register control sub so data can be loaded later, but don't start loop
             control_subject = self.config.messaging.subjects.get(
@@ -64,6 +79,7 @@ class ReplayService(BaseService):
             return
 
         self._interval = self._derive_interval()
+        self._refresh_status_template()
         self._running.set()
 
         control_subject = self.config.messaging.subjects.get(
@@ -91,7 +107,8 @@ class ReplayService(BaseService):
             await self.messaging.close()
             self.messaging = None
 
-        self._dataset = []
+        self._set_dataset({})
+        self._refresh_status_template()
 
     async def _run_loop(self) -> None:
         config = self.config
@@ -100,12 +117,44 @@ class ReplayService(BaseService):
             raise RuntimeError("ReplayService started before initialisation")
 
         subject = config.messaging.subjects["market_data"]
+        # Publish ``batch_size`` snapshots per flush and sleep once per batch;
+        # the average tick rate is unchanged but wakeups/flushes drop K-fold.
+        # A batch of one publishes unflushed, as the NATS client does anyway.
+        batch_size = max(int(getattr(config.replay, "batch_size", 64)), 1)
+        interval = self._interval
+        batch_pause = interval * batch_size
+
+        # Bind per-tick lookups to locals once; the loop body then runs on
+        # LOAD_FAST instead of repeated attribute/global resolution.
+        publish = messaging.publish
+        flush: Callable[[], Awaitable[None]] = _skip_flush
+        if batch_size > 1:
+            flush = messaging.flush
+        sleep = asyncio.sleep
+        encode = json_codec.dumps
+        snapshot_at = self._snapshot_at
+        is_running = self._running.is_set
+        wait_running = self._running.wait
 
         while True:
-            for snapshot in self._dataset:
-                await self._running.wait()
-                await messaging.publish(subject, snapshot)
-                await asyncio.sleep(self._interval)
+            pending = 0
+            for index in range(self._dataset_size):
+                # is_set() is a plain attribute read; only fall back to the
+                # awaitable wait() (an event-loop round trip) while paused.
+                if not is_running():
+                    if pending:
+                        await flush()
+                        pending = 0
+                    await wait_running()
+                await publish(subject, encode(snapshot_at(index)))
+                pending += 1
+                if pending >= batch_size:
+                    await flush()
+                    pending = 0
+                    await sleep(batch_pause)
+            if pending:
+                await flush()
+                await sleep(interval * pending)
 
     async def _handle_control(self, msg: Msg) -> None:
         try:
@@ -128,7 +177,15 @@ class ReplayService(BaseService):
         base_interval = 1.0  # seconds between ticks before speedup
         return max(base_interval / multiplier, 0.05)
 
-    def _load_dataset(self) -> List[Dict[str, float | str]]:
+    def _set_dataset(self, columns: Dict[str, np.ndarray]) -> None:
+        self._dataset_cols = columns
+        self._dataset_size = len(next(iter(columns.values()))) if columns else 0
+
+    def _snapshot_at(self, index: int) -> Dict[str, Any]:
+        """Render the snapshot for row ``index`` from the column arrays."""
+        return {field: column[index] for field, column in self._dataset_cols.items()}
+
+    def _load_dataset(self) -> Dict[str, np.ndarray]:
         config = self.config
         if config is None:
             raise RuntimeError("ReplayService started before initialisation")
@@ -150,29 +207,48 @@ class ReplayService(BaseService):
             )
 
         if df.empty:
-            return []
+            return {}
 
         if "timestamp" not in df.columns:
             raise ValueError("Replay dataset must include a 'timestamp' column")
 
-        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+        # Parse the whole column at once; unparseable rows become NaT and are
+        # dropped rather than failing the load.
+        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True, errors="coerce")
+        invalid = df["timestamp"].isna()
+        if invalid.any():
+            logger.warning(
+                "Dropping %d replay rows with unparseable timestamps",
+                int(invalid.sum()),
+            )
+            df = df[~invalid]
         df = df.sort_values("timestamp")
 
-        dataset: List[Dict[str, float | str]] = []
-        for _, row in df.iterrows():
-            ts = self._coerce_timestamp(row["timestamp"])
-            symbol = row.get("symbol", config.trading.symbols[0])
-            open_price = float(row.get("open", row.get("close", 0)))
-            high = float(row.get("high", open_price))
-            low = float(row.get("low", open_price))
-            close = float(row.get("close", open_price))
-            volume = float(row.get("volume", 1))
-            snapshot = self._build_snapshot(
-                symbol, ts, open_price, high, low, close, volume
-            )
-            dataset.append(snapshot)
+        df = self._normalise_columns(df, config.trading.symbols[0])
+        df["timestamp"] = self._format_timestamps(df["timestamp"])
+        return self._build_columns(df)
 
-        return dataset
+    @staticmethod
+    def _normalise_columns(df: pd.DataFrame, default_symbol: str) -> pd.DataFrame:
+        """Materialise missing replay columns once and cast prices to float64.
+
+        Defaults mirror the per-row fallbacks: ``open`` falls back to
+        ``close``, ``high``/``low``/``close`` fall back to ``open`` and
+        ``volume`` to 1.
+        """
+        columns = df.columns
+        if "symbol" not in columns:
+            df["symbol"] = default_symbol
+        if "open" not in columns:
+            df["open"] = df["close"] if "close" in columns else 0.0
+        for column in ("high", "low", "close"):
+            if column not in columns:
+                df[column] = df["open"]
+        if "volume" not in columns:
+            df["volume"] = 1.0
+        return df.astype(
+            {column: "float64" for column in ("open", "high", "low", "close", "volume")}
+        )
 
     @staticmethod
     def _load_directory(path: Path, scheme: str) -> pd.DataFrame:
@@ -196,6 +272,21 @@ class ReplayService(BaseService):
             return pd.DataFrame()
         return pd.concat(frames, ignore_index=True)
 
+    @staticmethod
+    def _format_timestamps(timestamps: pd.Series) -> pd.Series:
+        """Render UTC timestamps as ISO-8601 strings in one vectorised pass.
+
+        Output matches ``Timestamp.isoformat()`` for whole-second and
+        microsecond-resolution values.
+        """
+        rendered = timestamps.dt.strftime("%Y-%m-%dT%H:%M:%S")
+        fractional = timestamps.dt.microsecond != 0
+        if fractional.any():
+            rendered = rendered.where(
+                ~fractional, timestamps.dt.strftime("%Y-%m-%dT%H:%M:%S.%f")
+            )
+        return rendered + "+00:00"
+
     @staticmethod
     def _coerce_timestamp(value) -> datetime:
         if isinstance(value, datetime):
@@ -216,28 +307,31 @@ class ReplayService(BaseService):
         return "", Path(source).expanduser().resolve()
 
     @staticmethod
-    def _build_snapshot(
-        symbol: str,
-        timestamp: datetime,
-        open_price: float,
-        high: float,
-        low: float,
-        close: float,
-        volume: float,
-    ) -> Dict[str, float | str]:
-        spread = max((high - low) * 0.2, max(close * 0.0004, 0.5))
-        best_bid = close - spread / 2
-        best_ask = close + spread / 2
-        bid_size = max(volume * 0.25, 1)
-        ask_size = max(volume * 0.25, 1)
-        side = "buy" if close >= open_price else "sell"
-        last_size = max(volume * 0.1, 1)
-        ofi = (bid_size - ask_size) * spread
+    def _build_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Derive every snapshot field as a column array, keyed in payload order.
+
+        ``df`` must already be normalised and carry ISO-string timestamps.
+        Aliased fields (``last_price``/``price``/``close``) share one array.
+        """
+        open_price = df["open"].to_numpy(dtype=np.float64)
+        high = df["high"].to_numpy(dtype=np.float64)
+        low = df["low"].to_numpy(dtype=np.float64)
+        close = df["close"].to_numpy(dtype=np.float64)
+        volume = df["volume"].to_numpy(dtype=np.float64)
+
+        spread = np.maximum((high - low) * 0.2, np.maximum(close * 0.0004, 0.5))
+        bid_size = np.maximum(volume * 0.25, 1.0)
+        ask_size = np.maximum(volume * 0.25, 1.0)
+        # Gather from tiny lookup tables so every row references one shared
+        # str object per distinct symbol/side instead of its own copy.
+        side = _SIDE_LABELS[(close >= open_price).astype(np.intp)]
+        codes, symbols = pd.factorize(df["symbol"])
+        symbol_table = np.array([sys.intern(str(sym)) for sym in symbols], dtype=object)
 
         return {
-            "symbol": symbol,
-            "best_bid": best_bid,
-            "best_ask": best_ask,
+            "symbol": symbol_table[codes],
+            "best_bid": close - spread / 2,
+            "best_ask": close + spread / 2,
             "bid_size": bid_size,
             "ask_size": ask_size,
             "last_price": close,
@@ -248,10 +342,10 @@ class ReplayService(BaseService):
             "close": close,
             "volume": volume,
             "last_side": side,
-            "last_size": last_size,
-            "funding_rate": 0.0,
-            "timestamp": timestamp.isoformat(),
-            "order_flow_imbalance": ofi,
+            "last_size": np.maximum(volume * 0.1, 1.0),
+            "funding_rate": np.zeros_like(close),
+            "timestamp": df["timestamp"].to_numpy(dtype=object),
+            "order_flow_imbalance": (bid_size - ask_size) * spread,
         }
 
     @property
@@ -264,7 +358,7 @@ class ReplayService(BaseService):
 
     @property
     def dataset_size(self) -> int:
-        return len(self._dataset)
+        return self._dataset_size
 
     @property
     def last_control(self) -> Optional[str]:
@@ -287,14 +381,18 @@ class ReplayService(BaseService):
         self._last_control = normalized
         self._last_control_at = datetime.now(timezone.utc)
 
+    def _refresh_status_template(self) -> None:
+        """Snapshot the status fields that only change on startup/shutdown."""
+        self._status_template = {
+            "interval": self._interval,
+            "dataset_size": self.dataset_size,
+            "speed": self.config.replay.speed if self.config else None,
+        }
+
     def status_payload(self) -> Dict[str, Any]:
         return {
             "state": self.state,
-            "interval": self._interval,
-            "dataset_size": self.dataset_size,
-            "speed": (
-                getattr(self.config.replay, "speed", None) if self.config else None
-            ),
+            **self._status_template,
             "last_control": self._last_control,
             "last_control_at": self.last_control_at,
         }
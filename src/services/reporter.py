@@ -8,7 +8,7 @@ summary reports for downstream monitoring dashboards.
 from __future__ import annotations
 
 import asyncio
-import json
+import time
 from datetime import datetime, timezone
 from typing import Optional
 
@@ -18,8 +18,11 @@ from nats.aio.subscription import Subscription
 
 from ..config import TradingBotConfig, load_config
 from ..messaging import MessagingClient
+from ..utils import json_codec
 from .base import BaseService, create_app
 
+SUMMARY_INTERVAL_SECONDS = 60.0
+
 
 class ReporterService(BaseService):
     """Performance metrics aggregator."""
@@ -31,6 +34,9 @@ class ReporterService(BaseService):
         self._summary_task: Optional[asyncio.Task[None]] = None
         self._subscription: Optional[Subscription] = None
         self._latest_metrics: Optional[dict] = None
+        # Reused across publishes; encoded to bytes before each await so the
+        # buffer can be refilled safely on the next tick.
+        self._summary_buffer: dict = {}
 
     async def on_startup(self) -> None:
         self.config = load_config()
@@ -66,8 +72,8 @@ class ReporterService(BaseService):
 
     async def _handle_metrics(self, msg: Msg) -> None:
         try:
-            self._latest_metrics = json.loads(msg.data.decode("utf-8"))
-        except json.JSONDecodeError:
+            self._latest_metrics = json_codec.loads(msg.data)
+        except json_codec.JSONDecodeError:
             self._latest_metrics = None
 
     async def _publish_summary_loop(self) -> None:
@@ -75,12 +81,22 @@ class ReporterService(BaseService):
             raise RuntimeError("ReporterService started before initialisation")
         subject = self.config.messaging.subjects.get("reports", "reports.performance")
 
+        # Sleep until a monotonic deadline rather than a fixed 60s after the
+        # work, so publish time doesn't accumulate into cadence drift.
+        deadline = time.monotonic()
         while True:
             if self._latest_metrics:
-                summary = dict(self._latest_metrics)
+                summary = self._summary_buffer
+                summary.clear()
+                summary.update(self._latest_metrics)
                 summary.setdefault("timestamp", datetime.now(timezone.utc).isoformat())
-                await self.messaging.publish(subject, summary)
-            await asyncio.sleep(60.0)
+                await self.messaging.publish(subject, json_codec.dumps(summary))
+            deadline += SUMMARY_INTERVAL_SECONDS
+            now = time.monotonic()
+            if deadline < now - SUMMARY_INTERVAL_SECONDS:
+                # More than a full period behind: resync instead of bursting.
+                deadline = now
+            await asyncio.sleep(max(0.0, deadline - now))
 
 
 service = ReporterService()
@@ -10,7 +10,7 @@ from __future__ import annotations
 import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from fastapi import FastAPI
 
@@ -18,6 +18,7 @@ from ..config import TradingBotConfig, load_config
 from ..database import DatabaseManager
 from ..messaging import MessagingClient
 from ..metrics import CIRCUIT_BREAKERS
+from ..utils import json_codec
 from .base import BaseService, create_app
 
 logger = logging.getLogger(__name__)
@@ -36,6 +37,15 @@ class RiskService(BaseService):
         self._peak_equity: float = 0.0
         self._consecutive_losses: int = 0
         self._crisis: bool = False
+        # Reused across ticks; encoded to bytes before each publish.
+        self._payload: Dict[str, Any] = {
+            "crisis_mode": False,
+            "consecutive_losses": 0,
+            "drawdown": 0.0,
+            "volatility": 0.0,  # Populated by downstream market data consumers
+            "position_size_factor": 1.0,
+            "timestamp": "",
+        }
 
     async def on_startup(self) -> None:
         self.config = load_config()
@@ -74,6 +84,27 @@ class RiskService(BaseService):
             raise RuntimeError("RiskService started before initialisation")
         subject = self.config.messaging.subjects["risk"]
         mode = self.config.app_mode
+        run_id = self._run_id
+
+        # Bind per-tick lookups once; none of these change while running.
+        database = self.database
+        get_pnl_history = database.get_pnl_history
+        get_positions = database.get_positions
+        record_snapshot = (
+            getattr(database, "record_risk_snapshot", None) if run_id else None
+        )
+        publish = self.messaging.publish
+        encode = json_codec.dumps
+        breaker_inc = CIRCUIT_BREAKERS.labels(mode=mode).inc
+        payload = self._payload
+        sleep = asyncio.sleep
+        risk_config = getattr(self.config, "risk", None)
+        crisis_threshold = (
+            risk_config.get("crisis_drawdown", 0.10)
+            if isinstance(risk_config, dict)
+            else 0.10
+        )
+        loss_threshold = 5
 
         while True:
             # --- Compute real metrics from DB ---
@@ -82,7 +113,7 @@ class RiskService(BaseService):
 
             # Get recent PnL to compute drawdown and consecutive losses
             try:
-                pnl_history = await self.database.get_pnl_history(days=30)
+                pnl_history = await get_pnl_history(days=30)
                 if pnl_history:
                     # Track peak equity from balance column
                     latest_balance = pnl_history[0].balance if pnl_history else 0.0
@@ -106,7 +137,7 @@ class RiskService(BaseService):
 
             # Get open positions to compute exposure-based position factor
             try:
-                positions = await self.database.get_positions(mode=mode, run_id=self._run_id)
+                positions = await get_positions(mode=mode, run_id=run_id)
                 if positions and self._peak_equity > 0:
                     total_exposure = sum(abs(p.size * p.mark_price) for p in positions)
                     exposure_ratio = total_exposure / self._peak_equity
@@ -117,41 +148,33 @@ class RiskService(BaseService):
 
             # Crisis mode: triggered by excessive drawdown or consecutive losses
             previous_crisis = self._crisis
-            crisis_threshold = self.config.risk.get("crisis_drawdown", 0.10) if hasattr(self.config, "risk") and isinstance(getattr(self.config, "risk", None), dict) else 0.10
-            loss_threshold = 5
-
             if drawdown >= crisis_threshold or self._consecutive_losses >= loss_threshold:
                 self._crisis = True
             elif drawdown < crisis_threshold * 0.5 and self._consecutive_losses < loss_threshold // 2:
                 self._crisis = False
 
             if self._crisis and not previous_crisis:
-                CIRCUIT_BREAKERS.labels(mode=mode).inc()
+                breaker_inc()
                 logger.warning("Crisis mode ACTIVATED: drawdown=%.2f%%, consecutive_losses=%d",
                                drawdown * 100, self._consecutive_losses)
             elif not self._crisis and previous_crisis:
                 logger.info("Crisis mode deactivated")
 
-            payload = {
-                "crisis_mode": self._crisis,
-                "consecutive_losses": self._consecutive_losses,
-                "drawdown": round(drawdown, 6),
-                "volatility": 0.0,  # Populated by downstream market data consumers
-                "position_size_factor": round(position_factor, 4),
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            }
+            payload["crisis_mode"] = self._crisis
+            payload["consecutive_losses"] = self._consecutive_losses
+            payload["drawdown"] = round(drawdown, 6)
+            payload["position_size_factor"] = round(position_factor, 4)
+            payload["timestamp"] = datetime.now(timezone.utc).isoformat()
 
-            await self.messaging.publish(subject, payload)
+            await publish(subject, encode(payload))
 
-            if self._run_id and hasattr(self.database, "record_risk_snapshot"):
+            if record_snapshot is not None:
                 try:
-                    await self.database.record_risk_snapshot(
-                        payload, mode=mode, run_id=self._run_id
-                    )
+                    await record_snapshot(payload, mode=mode, run_id=run_id)
                 except Exception as exc:
                     logger.error("Failed to persist risk snapshot: %s", exc)
 
-            await asyncio.sleep(5.0)
+            await sleep(5.0)
 
 
 service = RiskService()
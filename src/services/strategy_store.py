@@ -25,20 +25,9 @@ class StrategyService:
             config=config,
             is_active=False,  # Default to inactive
         )
-        # Check if exists to update? DatabaseManager.create_strategy inserts.
-        # DatabaseManager.update_strategy updates.
-        # We should probably check if it exists or use upsert logic if we want to overwrite by name.
-        # The current create_strategy does INSERT.
-        # The current update_strategy does UPDATE.
-
-        existing = await self.database.get_strategy_by_name(name)
-        if existing:
-            strategy.id = existing.id
-            strategy.is_active = existing.is_active
-            success = await self.database.update_strategy(strategy)
-            return existing.id if success else None
-        else:
-            return await self.database.create_strategy(strategy)
+        # Single upsert keyed on name: an existing strategy keeps its id and
+        # active flag and only has its config replaced.
+        return await self.database.upsert_strategy(strategy)
 
     async def get_strategy(self, name: str) -> Optional[Dict[str, Any]]:
         """Get a strategy by name."""
@@ -1,14 +1,155 @@
+import functools
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
 
 import pandas as pd
 
 from src.config import StrategyConfig
-from src.indicators import TechnicalIndicators
+from src.indicators import IncrementalIndicators, TechnicalIndicators
 from src.models import MarketRegime, TradingSetup, TradingSignal
 
 logger = logging.getLogger(__name__)
 
+# Signal directions each market regime lets through ``filter_signals``.
+_REGIME_DIRECTIONS: Dict[str, frozenset] = {
+    "bullish": frozenset({"long"}),
+    "bearish": frozenset({"short"}),
+    "neutral": frozenset({"long", "short"}),
+}
+
+
+class _Last(NamedTuple):
+    """Latest-bar scalars consumed by ``generate_signals``."""
+
+    price: float
+    ema21: float
+    rsi: float
+    high: float
+    low: float
+    bb_upper: float
+    bb_middle: float
+    bb_lower: float
+
+
+def _last(series: pd.Series) -> float:
+    """Return the final value of ``series`` via its backing ndarray."""
+    return float(series.to_numpy(copy=False)[-1])
+
+
+class _Template(NamedTuple):
+    """Constant fields of a signal; stop/target default to entry multiples."""
+
+    signal_type: str
+    direction: str
+    strength: float
+    confidence: float
+    sl_mult: float
+    tp_mult: float
+
+
+_PULLBACK_LONG = _Template("pullback", "long", 0.8, 0.7, 0.98, 1.04)
+_PULLBACK_SHORT = _Template("pullback", "short", 0.8, 0.7, 1.02, 0.96)
+_BREAKOUT_LONG = _Template("breakout", "long", 0.9, 0.8, 0.0, 0.0)
+_BREAKOUT_SHORT = _Template("breakout", "short", 0.9, 0.8, 0.0, 0.0)
+_MEAN_REVERSION_LONG = _Template("mean_reversion", "long", 0.7, 0.6, 0.98, 0.0)
+_MEAN_REVERSION_SHORT = _Template("mean_reversion", "short", 0.7, 0.6, 1.02, 0.0)
+_DIVERGENCE_LONG = _Template("divergence", "long", 0.85, 0.75, 0.98, 1.05)
+_DIVERGENCE_SHORT = _Template("divergence", "short", 0.85, 0.75, 1.02, 0.95)
+
+
+def _emit(
+    out: List[TradingSignal],
+    template: _Template,
+    price: float,
+    timestamp: Any,
+    *,
+    stop_loss: Optional[float] = None,
+    take_profit: Optional[float] = None,
+) -> None:
+    """Append a signal built from ``template`` at ``price``."""
+    out.append(
+        TradingSignal(
+            signal_type=template.signal_type,
+            direction=template.direction,
+            strength=template.strength,
+            confidence=template.confidence,
+            entry_price=price,
+            stop_loss=price * template.sl_mult if stop_loss is None else stop_loss,
+            take_profit=(
+                price * template.tp_mult if take_profit is None else take_profit
+            ),
+            timestamp=timestamp,
+        )
+    )
+
+
+# Entry rules evaluated by ``generate_signals``. Thresholds that are fixed for
+# a given config are substituted as literals and the source compiled once per
+# distinct threshold set (see ``_compile_rules``).
+_RULES_SOURCE = """
+def _rules(last, divergence, signal_time, out):
+    price = last.price
+
+    # 1. Pullback Signals
+    near_ema = last.ema21 * 0.995 <= price <= last.ema21 * 1.005
+    if near_ema and last.rsi < {rsi_oversold}:
+        _emit(out, _PULLBACK_LONG, price, signal_time)
+    elif near_ema and last.rsi > {rsi_overbought}:
+        _emit(out, _PULLBACK_SHORT, price, signal_time)
+
+    # 2. Breakout Signals
+    if price > last.high:
+        _emit(
+            out,
+            _BREAKOUT_LONG,
+            price,
+            signal_time,
+            stop_loss=last.low,
+            take_profit=price + 2 * (price - last.low),
+        )
+    elif price < last.low:
+        _emit(
+            out,
+            _BREAKOUT_SHORT,
+            price,
+            signal_time,
+            stop_loss=last.high,
+            take_profit=price - 2 * (last.high - price),
+        )
+
+    # 3. Mean Reversion (Bollinger Bands)
+    if price <= last.bb_lower:
+        _emit(
+            out, _MEAN_REVERSION_LONG, price, signal_time, take_profit=last.bb_middle
+        )
+    elif price >= last.bb_upper:
+        _emit(
+            out, _MEAN_REVERSION_SHORT, price, signal_time, take_profit=last.bb_middle
+        )
+
+    # 4. Divergence Signals
+    if divergence.get("bullish"):
+        _emit(out, _DIVERGENCE_LONG, price, signal_time)
+    elif divergence.get("bearish"):
+        _emit(out, _DIVERGENCE_SHORT, price, signal_time)
+"""
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_rules(
+    rsi_oversold: float, rsi_overbought: float
+) -> Callable[[_Last, Dict[str, bool], Any, List[TradingSignal]], None]:
+    """Compile the entry rules with the RSI thresholds baked in as constants."""
+    source = _RULES_SOURCE.format(
+        rsi_oversold=repr(float(rsi_oversold)),
+        rsi_overbought=repr(float(rsi_overbought)),
+    )
+    namespace: Dict[str, Any] = {
+        name: value for name, value in globals().items() if name.startswith("_")
+    }
+    exec(compile(source, "<signal_rules>", "exec"), namespace)
+    return namespace["_rules"]
+
 
 class SignalGenerator:
     """
@@ -18,27 +159,50 @@ class SignalGenerator:
 
     def __init__(self, indicators: Optional[TechnicalIndicators] = None):
         self.indicators = indicators or TechnicalIndicators()
+        # Per-(stream, parameters) incremental state; see IncrementalIndicators.
+        self._streams: Dict[Tuple[Hashable, ...], IncrementalIndicators] = {}
+
+    def bind(self, config: StrategyConfig) -> None:
+        """Compile the entry rules for ``config`` ahead of the first bar."""
+        _compile_rules(config.signals.rsi_oversold, config.signals.rsi_overbought)
 
-    def detect_regime(self, data: pd.DataFrame, config: StrategyConfig) -> MarketRegime:
+    def _advance(
+        self,
+        key: Tuple[Hashable, ...],
+        factory: Callable[[], IncrementalIndicators],
+        data: pd.DataFrame,
+    ) -> IncrementalIndicators:
+        stream = self._streams.get(key)
+        if stream is None:
+            stream = self._streams[key] = factory()
+        stream.advance(data)
+        return stream
+
+    def detect_regime(
+        self,
+        data: pd.DataFrame,
+        config: StrategyConfig,
+        stream_id: Optional[Hashable] = None,
+    ) -> MarketRegime:
         """Detect market regime using daily timeframe."""
         try:
             # Calculate indicators
-            ema_200 = self.indicators.ema(data["close"], config.regime.ema_period)
-            macd_line, _, _ = self.indicators.macd(
-                data["close"],
-                config.regime.macd_fast,
-                config.regime.macd_slow,
-                config.regime.macd_signal,
-            )
-
-            if ema_200.empty or macd_line.empty:
+            ema_period = config.regime.ema_period
+            macd = (config.regime.macd_fast, config.regime.macd_slow)
+            values = self._advance(
+                ("regime", stream_id, ema_period, macd),
+                lambda: IncrementalIndicators(emas=(ema_period,), macd=macd),
+                data,
+            ).values
+
+            if not values:
                 logger.warning("Insufficient data for regime detection")
                 return MarketRegime(regime="neutral", strength=0.0, confidence=0.0)
 
             # Current values
-            current_price = data["close"].iloc[-1]
-            current_ema = ema_200.iloc[-1]
-            current_macd = macd_line.iloc[-1]
+            current_price = _last(data["close"])
+            current_ema = values[f"ema_{ema_period}"]
+            current_macd = values["macd"]
 
             # Determine regime
             if current_price > current_ema and current_macd > 0:
@@ -63,28 +227,37 @@ class SignalGenerator:
             logger.error(f"Error detecting regime: {e}")
             return MarketRegime(regime="neutral", strength=0.5, confidence=0.5)
 
-    def detect_setup(self, data: pd.DataFrame, config: StrategyConfig) -> TradingSetup:
+    def detect_setup(
+        self,
+        data: pd.DataFrame,
+        config: StrategyConfig,
+        stream_id: Optional[Hashable] = None,
+    ) -> TradingSetup:
         """Detect trading setup using 4-hour timeframe."""
         try:
-            # Calculate EMAs
-            ema_8 = self.indicators.ema(data["close"], config.setup.ema_fast)
-            ema_21 = self.indicators.ema(data["close"], config.setup.ema_medium)
-            ema_55 = self.indicators.ema(data["close"], config.setup.ema_slow)
-
-            # Calculate ADX and ATR
-            adx = self.indicators.adx(data, config.setup.adx_period)
-            atr = self.indicators.atr(data, config.setup.atr_period)
-
-            if ema_55.empty or adx.empty or atr.empty:
+            # Calculate EMAs, ADX and ATR
+            setup = config.setup
+            emas = (setup.ema_fast, setup.ema_medium, setup.ema_slow)
+            values = self._advance(
+                ("setup", stream_id, emas, setup.adx_period, setup.atr_period),
+                lambda: IncrementalIndicators(
+                    emas=emas,
+                    adx_period=setup.adx_period,
+                    atr_period=setup.atr_period,
+                ),
+                data,
+            ).values
+
+            if not values:
                 return TradingSetup(direction="none", quality=0.0, strength=0.0)
 
             # Current values
-            current_price = data["close"].iloc[-1]
-            current_ema8 = ema_8.iloc[-1]
-            current_ema21 = ema_21.iloc[-1]
-            current_ema55 = ema_55.iloc[-1]
-            current_adx = adx.iloc[-1]
-            current_atr = atr.iloc[-1]
+            current_price = _last(data["close"])
+            current_ema8 = values[f"ema_{setup.ema_fast}"]
+            current_ema21 = values[f"ema_{setup.ema_medium}"]
+            current_ema55 = values[f"ema_{setup.ema_slow}"]
+            current_adx = values["adx"]
+            current_atr = values["atr"]
 
             # Check EMA stack alignment
             bullish_stack = current_ema8 > current_ema21 > current_ema55
@@ -123,32 +296,42 @@ class SignalGenerator:
             return TradingSetup(direction="none", quality=0.0, strength=0.0)
 
     def generate_signals(
-        self, data: pd.DataFrame, config: StrategyConfig
+        self,
+        data: pd.DataFrame,
+        config: StrategyConfig,
+        stream_id: Optional[Hashable] = None,
     ) -> List[TradingSignal]:
         """Generate trading signals using 1-hour timeframe."""
-        signals = []
+        signals: List[TradingSignal] = []
 
         try:
             # Calculate indicators
-            ema_21 = self.indicators.ema(data["close"], 21)
-            rsi = self.indicators.rsi(data["close"], config.signals.rsi_period)
-            donchian_high, donchian_low = self.indicators.donchian_channels(
-                data, config.signals.donchian_period
-            )
-            bb_upper, bb_middle, bb_lower = self.indicators.bollinger_bands(
-                data["close"],
-                config.signals.bollinger_period,
-                config.signals.bollinger_std_dev,
-            )
-            divergence = self.indicators.detect_divergence(
-                data["close"],
-                rsi,
-                config.signals.divergence_lookback,
+            cfg = config.signals
+            bollinger = (cfg.bollinger_period, cfg.bollinger_std_dev)
+            stream = self._advance(
+                ("signals", stream_id, cfg.rsi_period, cfg.donchian_period, bollinger),
+                lambda: IncrementalIndicators(
+                    emas=(21,),
+                    rsi_period=cfg.rsi_period,
+                    donchian_period=cfg.donchian_period,
+                    bollinger=bollinger,
+                    keep_history=True,
+                ),
+                data,
             )
+            values = stream.values
 
-            if ema_21.empty or rsi.empty:
+            if not values:
                 return []
 
+            divergence: Dict[str, bool] = {}
+            if cfg.divergence_enabled:
+                divergence = self.indicators.detect_divergence(
+                    pd.Series(stream.closes, dtype="float64"),
+                    pd.Series(stream.rsi_values, dtype="float64"),
+                    cfg.divergence_lookback,
+                )
+
             if "timestamp" in data.columns:
                 signal_time = pd.to_datetime(data["timestamp"].iloc[-1], utc=True)
             else:
@@ -156,136 +339,19 @@ class SignalGenerator:
             signal_time = signal_time.to_pydatetime()
 
             # Current values
-            current_price = float(data["close"].iloc[-1])
-            current_ema21 = float(ema_21.iloc[-1])
-            current_rsi = float(rsi.iloc[-1])
-            current_high = float(donchian_high.iloc[-1])
-            current_low = float(donchian_low.iloc[-1])
-            current_bb_upper = float(bb_upper.iloc[-1])
-            current_bb_middle = float(bb_middle.iloc[-1])
-            current_bb_lower = float(bb_lower.iloc[-1])
-
-            # 1. Pullback Signals
-            if (
-                current_price <= current_ema21 * 1.005
-                and current_price >= current_ema21 * 0.995
-                and current_rsi < config.signals.rsi_oversold
-            ):
-                signals.append(
-                    TradingSignal(
-                        signal_type="pullback",
-                        direction="long",
-                        strength=0.8,
-                        confidence=0.7,
-                        entry_price=current_price,
-                        stop_loss=current_price * 0.98,
-                        take_profit=current_price * 1.04,
-                        timestamp=signal_time,
-                    )
-                )
-
-            elif (
-                current_price <= current_ema21 * 1.005
-                and current_price >= current_ema21 * 0.995
-                and current_rsi > config.signals.rsi_overbought
-            ):
-                signals.append(
-                    TradingSignal(
-                        signal_type="pullback",
-                        direction="short",
-                        strength=0.8,
-                        confidence=0.7,
-                        entry_price=current_price,
-                        stop_loss=current_price * 1.02,
-                        take_profit=current_price * 0.96,
-                        timestamp=signal_time,
-                    )
-                )
-
-            # 2. Breakout Signals
-            if current_price > current_high:
-                signals.append(
-                    TradingSignal(
-                        signal_type="breakout",
-                        direction="long",
-                        strength=0.9,
-                        confidence=0.8,
-                        entry_price=current_price,
-                        stop_loss=current_low,
-                        take_profit=current_price + 2 * (current_price - current_low),
-                        timestamp=signal_time,
-                    )
-                )
-
-            elif current_price < current_low:
-                signals.append(
-                    TradingSignal(
-                        signal_type="breakout",
-                        direction="short",
-                        strength=0.9,
-                        confidence=0.8,
-                        entry_price=current_price,
-                        stop_loss=current_high,
-                        take_profit=current_price - 2 * (current_high - current_price),
-                        timestamp=signal_time,
-                    )
-                )
-
-            # 3. Mean Reversion (Bollinger Bands)
-            if current_price <= current_bb_lower:
-                signals.append(
-                    TradingSignal(
-                        signal_type="mean_reversion",
-                        direction="long",
-                        strength=0.7,
-                        confidence=0.6,
-                        entry_price=current_price,
-                        stop_loss=current_price * 0.98,
-                        take_profit=current_bb_middle,
-                        timestamp=signal_time,
-                    )
-                )
-            elif current_price >= current_bb_upper:
-                signals.append(
-                    TradingSignal(
-                        signal_type="mean_reversion",
-                        direction="short",
-                        strength=0.7,
-                        confidence=0.6,
-                        entry_price=current_price,
-                        stop_loss=current_price * 1.02,
-                        take_profit=current_bb_middle,
-                        timestamp=signal_time,
-                    )
-                )
-
-            # 4. Divergence Signals
-            if divergence.get("bullish"):
-                signals.append(
-                    TradingSignal(
-                        signal_type="divergence",
-                        direction="long",
-                        strength=0.85,
-                        confidence=0.75,
-                        entry_price=current_price,
-                        stop_loss=current_price * 0.98,
-                        take_profit=current_price * 1.05,
-                        timestamp=signal_time,
-                    )
-                )
-            elif divergence.get("bearish"):
-                signals.append(
-                    TradingSignal(
-                        signal_type="divergence",
-                        direction="short",
-                        strength=0.85,
-                        confidence=0.75,
-                        entry_price=current_price,
-                        stop_loss=current_price * 1.02,
-                        take_profit=current_price * 0.95,
-                        timestamp=signal_time,
-                    )
-                )
+            last = _Last(
+                _last(data["close"]),
+                values["ema_21"],
+                values["rsi"],
+                values["donchian_high"],
+                values["donchian_low"],
+                values["bb_upper"],
+                values["bb_middle"],
+                values["bb_lower"],
+            )
+            _compile_rules(cfg.rsi_oversold, cfg.rsi_overbought)(
+                last, divergence, signal_time, signals
+            )
 
         except Exception as e:
             logger.error(f"Error generating signals: {e}")
@@ -299,25 +365,16 @@ class SignalGenerator:
         if not signals:
             return []
 
-        valid_signals = []
-        for signal in signals:
-            # Check regime alignment
-            regime_aligned = (
-                signal.direction == "long" and regime.regime in ["bullish", "neutral"]
-            ) or (
-                signal.direction == "short" and regime.regime in ["bearish", "neutral"]
-            )
-
-            # Check setup alignment
-            setup_aligned = (
-                setup.direction == "none"  # No setup bias
-                or signal.direction == setup.direction
-            )
-
-            if regime_aligned and setup_aligned:
-                valid_signals.append(signal)
-
-        return valid_signals
+        # Regime alignment: directions the current regime allows
+        allowed = _REGIME_DIRECTIONS.get(regime.regime, frozenset())
+        # Setup alignment: "none" means no setup bias
+        setup_dir = setup.direction
+        return [
+            signal
+            for signal in signals
+            if signal.direction in allowed
+            and (setup_dir == "none" or signal.direction == setup_dir)
+        ]
 
     def apply_microstructure_filters(
         self,
@@ -330,53 +387,80 @@ class SignalGenerator:
         if not signals:
             return []
 
-        filtered_signals = []
-
-        for signal in signals:
-            keep = True
-
-            # VWAP Filter
-            if config.vwap.enabled and vwap_val is not None:
-                if (
-                    signal.direction == "long"
-                    and config.vwap.require_price_above_vwap_for_longs
-                ):
-                    if signal.entry_price < vwap_val:
-                        keep = False
-                        logger.debug(
-                            f"Signal filtered by VWAP: "
-                            f"{signal.entry_price:.2f} < {vwap_val:.2f}"
-                        )
-                elif (
-                    signal.direction == "short"
-                    and config.vwap.require_price_below_vwap_for_shorts
-                ):
-                    if signal.entry_price > vwap_val:
-                        keep = False
-                        logger.debug(
-                            f"Signal filtered by VWAP: "
-                            f"{signal.entry_price:.2f} > {vwap_val:.2f}"
-                        )
-
-            # Order Book Filter
-            if config.orderbook.enabled and config.orderbook.use_for_entry:
-                imbalance = ob_metrics.get("imbalance", 0.0)
-                threshold = config.orderbook.imbalance_threshold
-
-                if signal.direction == "long":
-                    if imbalance < threshold:
-                        keep = False
-                        logger.debug(
-                            f"Signal filtered by OBI: {imbalance:.2f} < {threshold}"
-                        )
-                elif signal.direction == "short":
-                    if imbalance > -threshold:
-                        keep = False
-                        logger.debug(
-                            f"Signal filtered by OBI: {imbalance:.2f} > {-threshold}"
-                        )
-
-            if keep:
-                filtered_signals.append(signal)
-
-        return filtered_signals
+        vwap_cfg = config.vwap
+        vwap_active = vwap_cfg.enabled and vwap_val is not None
+        long_needs_above = vwap_active and vwap_cfg.require_price_above_vwap_for_longs
+        short_needs_below = vwap_active and vwap_cfg.require_price_below_vwap_for_shorts
+
+        ob_cfg = config.orderbook
+        ob_active = ob_cfg.enabled and ob_cfg.use_for_entry
+        imbalance = ob_metrics.get("imbalance", 0.0) if ob_active else 0.0
+        threshold = ob_cfg.imbalance_threshold
+
+        return [
+            signal
+            for signal in signals
+            if self._passes_microstructure(
+                signal,
+                vwap_val,
+                long_needs_above,
+                short_needs_below,
+                ob_active,
+                imbalance,
+                threshold,
+            )
+        ]
+
+    @staticmethod
+    def _passes_microstructure(
+        signal: TradingSignal,
+        vwap_val: Optional[float],
+        long_needs_above: bool,
+        short_needs_below: bool,
+        ob_active: bool,
+        imbalance: float,
+        threshold: float,
+    ) -> bool:
+        direction = signal.direction
+        keep = True
+
+        # VWAP Filter
+        if direction == "long":
+            if (
+                long_needs_above
+                and vwap_val is not None
+                and signal.entry_price < vwap_val
+            ):
+                keep = False
+                logger.debug(
+                    f"Signal filtered by VWAP: "
+                    f"{signal.entry_price:.2f} < {vwap_val:.2f}"
+                )
+        elif direction == "short":
+            if (
+                short_needs_below
+                and vwap_val is not None
+                and signal.entry_price > vwap_val
+            ):
+                keep = False
+                logger.debug(
+                    f"Signal filtered by VWAP: "
+                    f"{signal.entry_price:.2f} > {vwap_val:.2f}"
+                )
+
+        # Order Book Filter
+        if ob_active:
+            if direction == "long":
+                if imbalance < threshold:
+                    keep = False
+                    logger.debug(
+                        f"Signal filtered by OBI: {imbalance:.2f} < {threshold}"
+                    )
+            elif direction == "short":
+                if imbalance > -threshold:
+                    keep = False
+                    logger.debug(
+                        f"Signal filtered by OBI: {imbalance:.2f} > {-threshold}"
+                    )
+
+        return keep
@@ -1,59 +1,140 @@
 from __future__ import annotations
 
-import json
+import atexit
 import os
+import threading
+import time
+import weakref
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
+
+from src.utils import json_codec
+
+# Open stores, flushed once at interpreter exit without keeping them alive.
+_OPEN_STORES: "weakref.WeakValueDictionary[int, DailyPnlStore]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _flush_open_stores() -> None:
+    for store in list(_OPEN_STORES.values()):
+        store.flush()
+
+
+atexit.register(_flush_open_stores)
 
 
 @dataclass
 class DailyPnlStore:
-    """JSON-backed store tracking per-account daily realized PnL."""
+    """JSON-backed store tracking per-account daily realized PnL.
+
+    Losses are written through immediately since they back the daily loss
+    limit. Other updates are coalesced: written at most once per
+    ``flush_interval_s``, with a timer flushing whatever is still pending
+    when the interval ends. ``flush()`` persists pending updates now and
+    ``close()`` also stops the timer; open stores are flushed at exit.
+    """
 
     path: str
+    flush_interval_s: float = 1.0
     _data: Dict[str, Any] = field(default_factory=dict, init=False)
+    # Flat (account_id, date_key) -> PnL view; folded back into _data on save.
+    _totals: Dict[Tuple[str, str], float] = field(default_factory=dict, init=False)
+    _dirty: bool = field(default=False, init=False)
+    _last_save: float = field(default=float("-inf"), init=False)
+    _timer: Optional[threading.Timer] = field(default=None, init=False, repr=False)
+    _lock: threading.RLock = field(
+        default_factory=threading.RLock, init=False, repr=False
+    )
 
     def __post_init__(self) -> None:
         self.path = str(self.path)
         self._data = self._load()
+        self._totals = self._index(self._data)
+        _OPEN_STORES[id(self)] = self
 
     def _load(self) -> Dict[str, Any]:
         store_path = Path(self.path)
         if not store_path.exists():
             return {"accounts": {}}
         try:
-            payload = json.loads(store_path.read_text())
+            payload = json_codec.loads(store_path.read_bytes())
             if not isinstance(payload, dict):
                 return {"accounts": {}}
             if "accounts" not in payload or not isinstance(payload["accounts"], dict):
                 payload["accounts"] = {}
             return payload
-        except (OSError, json.JSONDecodeError):  # pragma: no cover - defensive
+        except (OSError, json_codec.JSONDecodeError):  # pragma: no cover - defensive
             return {"accounts": {}}
 
+    @staticmethod
+    def _index(data: Dict[str, Any]) -> Dict[Tuple[str, str], float]:
+        totals: Dict[Tuple[str, str], float] = {}
+        for account_id, account_entry in data["accounts"].items():
+            if not isinstance(account_entry, dict):
+                continue
+            for date_key, day_entry in account_entry.items():
+                try:
+                    totals[(account_id, date_key)] = float(
+                        day_entry.get("realized_pnl_usd", 0.0)
+                    )
+                except (AttributeError, TypeError, ValueError):
+                    continue
+        return totals
+
     def save(self) -> None:
-        store_path = Path(self.path)
-        store_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = store_path.with_suffix(store_path.suffix + ".tmp")
-        tmp_path.write_text(json.dumps(self._data, indent=2))
-        os.replace(tmp_path, store_path)
+        with self._lock:
+            accounts = self._data.setdefault("accounts", {})
+            for (account_id, date_key), pnl in self._totals.items():
+                day_entry = accounts.setdefault(account_id, {}).setdefault(date_key, {})
+                day_entry["realized_pnl_usd"] = pnl
+            store_path = Path(self.path)
+            store_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = store_path.with_suffix(store_path.suffix + ".tmp")
+            tmp_path.write_bytes(json_codec.dumps(self._data, pretty=True))
+            os.replace(tmp_path, store_path)
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+    def flush(self) -> None:
+        """Persist pending updates, if any."""
+        with self._lock:
+            if self._dirty:
+                self.save()
+
+    def close(self) -> None:
+        """Flush pending updates and stop the deferred-flush timer."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self.flush()
+        _OPEN_STORES.pop(id(self), None)
+
+    def _deferred_flush(self) -> None:
+        with self._lock:
+            self._timer = None
+            self.flush()
+
+    def _schedule_flush(self, delay: float) -> None:
+        if self._timer is None:
+            self._timer = threading.Timer(delay, self._deferred_flush)
+            self._timer.daemon = True
+            self._timer.start()
 
     def update_pnl(self, account_id: str, date_key: str, delta_pnl: float) -> float:
-        accounts = self._data.setdefault("accounts", {})
-        account_entry = accounts.setdefault(account_id, {})
-        day_entry = account_entry.setdefault(date_key, {"realized_pnl_usd": 0.0})
-        day_entry["realized_pnl_usd"] = float(
-            day_entry.get("realized_pnl_usd", 0.0)
-        ) + float(delta_pnl)
-        self.save()
-        return day_entry["realized_pnl_usd"]
+        key = (account_id, date_key)
+        with self._lock:
+            total = self._totals.get(key, 0.0) + float(delta_pnl)
+            self._totals[key] = total
+            self._dirty = True
+            elapsed = time.monotonic() - self._last_save
+            if delta_pnl < 0 or elapsed >= self.flush_interval_s:
+                self.save()
+            else:
+                self._schedule_flush(self.flush_interval_s - elapsed)
+        return total
 
     def get_pnl(self, account_id: str, date_key: str) -> float:
-        accounts = self._data.get("accounts", {})
-        account_entry = accounts.get(account_id, {})
-        day_entry = account_entry.get(date_key, {})
-        try:
-            return float(day_entry.get("realized_pnl_usd", 0.0))
-        except (TypeError, ValueError):
-            return 0.0
+        return self._totals.get((account_id, date_key), 0.0)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-import json
 import logging
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Optional
 
+from src.utils import json_codec
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,7 +24,7 @@ def load_perps_state(path: Path | str) -> Optional[PerpsState]:
     if not file_path.exists():
         return None
     try:
-        data = json.loads(file_path.read_text(encoding="utf-8"))
+        data = json_codec.loads(file_path.read_bytes())
         version = data.get("version")
         if version != 1:
             logger.warning(
@@ -53,6 +55,6 @@ def save_perps_state(path: Path | str, state: PerpsState) -> None:
         "daily_pnl_by_date": state.daily_pnl_by_date,
         "consecutive_losses": state.consecutive_losses,
     }
-    file_path.write_text(
-        json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8"
-    )
+    tmp_path = file_path.with_suffix(file_path.suffix + ".tmp")
+    tmp_path.write_bytes(json_codec.dumps(payload, pretty=True))
+    os.replace(tmp_path, file_path)
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import json
 import logging
 import os
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+from src.utils import json_codec
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,7 +20,7 @@ def load_run_id(path: Path | str) -> Optional[str]:
         if not raw:
             return None
         if raw.startswith("{"):
-            payload = json.loads(raw)
+            payload = json_codec.loads(raw)
             return str(payload.get("run_id") or "").strip() or None
         return raw
     except Exception as exc:
@@ -34,7 +35,7 @@ def store_run_id(path: Path | str, run_id: str) -> None:
         "run_id": run_id,
         "created_at": datetime.now(timezone.utc).isoformat(),
     }
-    file_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    file_path.write_bytes(json_codec.dumps(payload, pretty=True))
 
 
 def resolve_run_id(
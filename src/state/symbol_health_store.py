@@ -1,20 +1,69 @@
 from __future__ import annotations
 
-import json
+import atexit
+import functools
 import os
+import sys
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+from src.utils import json_codec
+
+try:
+    import ciso8601
+except ImportError:  # pragma: no cover - optional dependency
+    ciso8601 = None  # type: ignore[assignment]
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
 
 
 def _format_iso(dt: datetime) -> str:
-    return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+    if dt.tzinfo is not timezone.utc:
+        dt = dt.astimezone(timezone.utc)
+    base = (
+        f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+        f"T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+    )
+    if dt.microsecond:
+        return f"{base}.{dt.microsecond:06d}Z"
+    return f"{base}Z"
+
+
+def _utc_now_iso() -> str:
+    """``_format_iso(datetime.now(timezone.utc))`` without the tz round-trip."""
+    dt = datetime.now(timezone.utc)
+    return f"{dt:%Y-%m-%dT%H:%M:%S}.{dt.microsecond:06d}Z"
 
 
 def _parse_iso(timestamp: Optional[str]) -> Optional[datetime]:
     if not timestamp:
         return None
+    if ciso8601 is not None:
+        # Faster than the pure-Python slicing path below.
+        try:
+            return ciso8601.parse_datetime(timestamp)
+        except (TypeError, ValueError):
+            return None
     try:
+        if _is_own_format(timestamp):
+            # Fixed-width output of ``_format_iso``: slice fields directly.
+            return datetime(
+                int(timestamp[0:4]),
+                int(timestamp[5:7]),
+                int(timestamp[8:10]),
+                int(timestamp[11:13]),
+                int(timestamp[14:16]),
+                int(timestamp[17:19]),
+                int(timestamp[20:26]) if len(timestamp) == 27 else 0,
+                tzinfo=timezone.utc,
+            )
         if timestamp.endswith("Z"):
             timestamp = timestamp.replace("Z", "+00:00")
         return datetime.fromisoformat(timestamp)
@@ -22,49 +71,259 @@ def _parse_iso(timestamp: Optional[str]) -> Optional[datetime]:
         return None
 
 
+def _is_own_format(timestamp: str) -> bool:
+    """``YYYY-MM-DDTHH:MM:SS[.ffffff]Z`` as produced by ``_format_iso``."""
+    size = len(timestamp)
+    return (
+        (size == 20 or (size == 27 and timestamp[19] == "."))
+        and timestamp[-1] == "Z"
+        and timestamp[4] == timestamp[7] == "-"
+        and timestamp[10] == "T"
+        and timestamp[13] == timestamp[16] == ":"
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _norm(symbol: str) -> str:
+    """Upper-cased, interned symbol key."""
+    return sys.intern(symbol.upper())
+
+
+def _epoch(timestamp: Optional[str]) -> Optional[float]:
+    parsed = _parse_iso(timestamp)
+    return parsed.timestamp() if parsed is not None else None
+
+
+_STATE_KEYS = ("last_status", "last_evaluated_at", "blocked_until", "last_reasons")
+
+
+@dataclass(slots=True, eq=False)
+class SymbolEntry(Mapping):
+    """Health state of one symbol, readable as a mapping of the stored keys."""
+
+    last_status: Optional[str] = None
+    last_evaluated_at: Optional[str] = None
+    blocked_until: Optional[str] = None
+    last_reasons: List[str] = field(default_factory=list)
+    # ``blocked_until`` as epoch seconds; derived, never serialized.
+    blocked_until_ts: Optional[float] = field(
+        default=None, init=False, compare=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        self.blocked_until_ts = _epoch(self.blocked_until)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _STATE_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_STATE_KEYS)
+
+    def __len__(self) -> int:
+        return len(_STATE_KEYS)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SymbolEntry":
+        status = data.get("last_status")
+        return cls(
+            last_status=status.upper() if isinstance(status, str) else status,
+            last_evaluated_at=data.get("last_evaluated_at"),
+            blocked_until=data.get("blocked_until"),
+            last_reasons=list(data.get("last_reasons") or []),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {key: getattr(self, key) for key in _STATE_KEYS}
+        data["last_reasons"] = list(self.last_reasons)
+        return data
+
+
+def _same_state(entry: SymbolEntry, record: Dict[str, Any]) -> bool:
+    """Whether ``record`` would change nothing in ``entry`` but the eval time."""
+    return (
+        entry.last_status == record["status"]
+        and entry.blocked_until == record["blocked_until"]
+        and entry.last_reasons == list(record["reasons"])
+    )
+
+
 class SymbolHealthStore:
-    """JSON-backed store tracking runtime symbol health status."""
+    """Snapshot-plus-journal store tracking runtime symbol health status.
+
+    With msgpack installed the snapshot is stored next to ``path`` with an
+    ``.mpk`` suffix; a JSON snapshot found at ``path`` is loaded once and
+    removed after the first ``.mpk`` snapshot is written. Without msgpack the
+    snapshot is the JSON file at ``path``. ``export_json()`` writes a
+    human-readable copy on demand.
+    Updates are appended to a ``<path>.log`` journal and folded into the
+    snapshot every ``compact_every`` updates and at interpreter exit; loading
+    replays any journal records on top of the snapshot. Journal writes are
+    flushed to disk at most once per ``flush_interval_s``; call ``flush()`` to
+    push buffered records out immediately.
+    """
 
-    def __init__(self, path: str):
+    def __init__(
+        self, path: str, compact_every: int = 100, flush_interval_s: float = 1.0
+    ):
         self.path = str(path)
+        self._store_path = Path(self.path)
+        self._snapshot_path = (
+            self._store_path.with_suffix(".mpk")
+            if msgpack is not None
+            else self._store_path
+        )
+        self._tmp_path = self._snapshot_path.with_suffix(
+            self._snapshot_path.suffix + ".tmp"
+        )
+        self._store_path.parent.mkdir(parents=True, exist_ok=True)
+        self.compact_every = compact_every
+        self.flush_interval_s = flush_interval_s
+        self._journal_path = Path(self.path + ".log")
+        self._journal: Optional[BinaryIO] = None
+        self._pending = 0
+        # Set when only ``last_evaluated_at`` moved, which is not journaled.
+        self._stale_evaluations = False
+        self._dirty = False
+        self._last_flush = float("-inf")
+        # Set when the snapshot was read from a legacy JSON file at ``path``.
+        self._migrating = False
         self._data = self._load()
-
-    @staticmethod
-    def _default_state() -> Dict[str, Any]:
-        return {
-            "last_status": None,
-            "last_evaluated_at": None,
-            "blocked_until": None,
-            "last_reasons": [],
-        }
+        atexit.register(self.close)
 
     def _load(self) -> Dict[str, Any]:
-        store_path = Path(self.path)
-        if not store_path.exists():
-            return {"symbols": {}}
+        self._data = self._load_snapshot()
+        # ``_load_snapshot`` always provides "symbols"; the dict is never rebound.
+        self._symbols: Dict[str, SymbolEntry] = self._data["symbols"]
+        self._replay_journal()
+        return self._data
+
+    def _read_snapshot(self) -> Any:
+        if msgpack is not None and self._snapshot_path.exists():
+            return msgpack.unpackb(self._snapshot_path.read_bytes(), raw=False)
+        if self._store_path.exists():
+            self._migrating = self._snapshot_path != self._store_path
+            return json_codec.loads(self._store_path.read_bytes())
+        return None
+
+    def _load_snapshot(self) -> Dict[str, Any]:
         try:
-            payload = json.loads(store_path.read_text())
+            payload = self._read_snapshot()
             if not isinstance(payload, dict):
                 return {"symbols": {}}
-            if "symbols" not in payload or not isinstance(payload["symbols"], dict):
-                payload["symbols"] = {}
+            symbols = payload.get("symbols")
+            if not isinstance(symbols, dict):
+                symbols = {}
+            payload["symbols"] = {
+                symbol_key: SymbolEntry.from_dict(entry)
+                for symbol_key, entry in symbols.items()
+                if isinstance(entry, dict)
+            }
             return payload
-        except (OSError, json.JSONDecodeError):  # pragma: no cover - defensive
+        except (OSError, ValueError):  # pragma: no cover - defensive
             return {"symbols": {}}
 
+    def _replay_journal(self) -> None:
+        try:
+            lines = self._journal_path.read_bytes().splitlines()
+        except OSError:
+            return
+        for line in lines:
+            try:
+                record = json_codec.loads(line)
+            except json_codec.JSONDecodeError:
+                # A torn final write from a crash; everything before it applied.
+                continue
+            if isinstance(record, dict) and record.get("symbol"):
+                self._apply(record)
+                self._pending += 1
+
+    def _serializable(self) -> Dict[str, Any]:
+        data = dict(self._data)
+        data["symbols"] = {
+            symbol_key: entry.to_dict() for symbol_key, entry in self._symbols.items()
+        }
+        return data
+
     def _save(self) -> None:
-        store_path = Path(self.path)
-        store_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = store_path.with_suffix(store_path.suffix + ".tmp")
-        tmp_path.write_text(json.dumps(self._data, indent=2))
-        os.replace(tmp_path, store_path)
+        if msgpack is not None:
+            data = msgpack.packb(self._serializable(), use_bin_type=True)
+        else:
+            data = json_codec.dumps(self._serializable())
+        fd = os.open(self._tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(self._tmp_path, self._snapshot_path)
+        self._fsync_dir()
+        if self._migrating:
+            # The .mpk snapshot supersedes the JSON file; leaving it would
+            # present stale state to anything still reading ``path``.
+            self._store_path.unlink(missing_ok=True)
+            self._migrating = False
+
+    def export_json(self, path: Optional[str] = None) -> None:
+        """Write the current state as indented JSON to ``path`` (default: ``path``)."""
+        target = Path(path) if path is not None else self._store_path
+        target.write_bytes(json_codec.dumps(self._serializable(), pretty=True))
+
+    def _fsync_dir(self) -> None:
+        """Make the rename itself durable (best effort, POSIX only)."""
+        try:
+            fd = os.open(self._store_path.parent, os.O_RDONLY)
+        except OSError:  # pragma: no cover - e.g. Windows
+            return
+        try:
+            os.fsync(fd)
+        except OSError:  # pragma: no cover - filesystem without dir fsync
+            pass
+        finally:
+            os.close(fd)
+
+    def _compact(self) -> None:
+        """Write the snapshot and drop the journal records it now covers."""
+        self._save()
+        if self._journal is not None:
+            self.flush()
+            self._journal.truncate(0)
+        elif self._journal_path.exists():
+            self._journal_path.unlink()
+        self._pending = 0
+        self._stale_evaluations = False
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        if self._journal is None:
+            self._journal = open(self._journal_path, "ab")
+        self._journal.write(json_codec.dumps(record) + b"\n")
+        self._dirty = True
+        if time.monotonic() - self._last_flush >= self.flush_interval_s:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered journal records through to the file."""
+        if self._dirty and self._journal is not None:
+            self._journal.flush()
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Flush the journal and compact pending records into the snapshot."""
+        self.flush()
+        if self._pending or self._stale_evaluations:
+            self._compact()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
 
     def get_symbol_state(self, symbol: str) -> Dict[str, Any]:
-        symbols = self._data.setdefault("symbols", {})
-        state = symbols.get(symbol.upper(), {})
-        merged = self._default_state()
-        merged.update(state if isinstance(state, dict) else {})
-        return merged
+        """Return a copy of the stored state for ``symbol``."""
+        entry = self._symbols.get(_norm(symbol))
+        return (entry if entry is not None else SymbolEntry()).to_dict()
 
     def update_symbol_state(
         self,
@@ -74,34 +333,54 @@ class SymbolHealthStore:
         blocked_until: Optional[str],
         evaluated_at: Optional[str] = None,
     ) -> None:
-        symbol_key = symbol.upper()
-        payload = self._data.setdefault("symbols", {})
-        entry = self._default_state()
-        entry.update(payload.get(symbol_key, {}))
-
-        entry["last_status"] = status
-        entry["last_reasons"] = reasons or []
-        entry["blocked_until"] = blocked_until
-        entry["last_evaluated_at"] = evaluated_at or _format_iso(
-            datetime.now(timezone.utc)
+        evaluated_at = evaluated_at or _utc_now_iso()
+        key = _norm(symbol)
+        record = {
+            "symbol": key,
+            "status": status.upper() if status else None,
+            "reasons": reasons or [],
+            "blocked_until": blocked_until,
+            "evaluated_at": evaluated_at,
+        }
+        existing = self._symbols.get(key)
+        if existing is not None and _same_state(existing, record):
+            existing.last_evaluated_at = evaluated_at
+            self._stale_evaluations = True
+            return
+        self._apply(record)
+        self._append(record)
+        self._pending += 1
+        if self._pending >= self.compact_every:
+            self._compact()
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        self._symbols[record["symbol"]] = SymbolEntry(
+            last_status=record.get("status"),
+            last_evaluated_at=record.get("evaluated_at"),
+            blocked_until=record.get("blocked_until"),
+            last_reasons=list(record.get("reasons") or []),
         )
 
-        payload[symbol_key] = entry
-        self._save()
+    def _get_status(self, symbol: str) -> Optional[str]:
+        entry = self._symbols.get(_norm(symbol))
+        return entry.last_status if entry is not None else None
 
     def is_blocked(self, symbol: str, now: Optional[datetime] = None) -> bool:
-        state = self.get_symbol_state(symbol)
-        blocked_until = _parse_iso(state.get("blocked_until"))
-        now_ts = now or datetime.now(timezone.utc)
-        return bool(blocked_until and blocked_until > now_ts)
+        entry = self._symbols.get(_norm(symbol))
+        if entry is None:
+            return False
+        blocked_until = entry.blocked_until_ts
+        if blocked_until is None:
+            return False
+        return blocked_until > (now.timestamp() if now else time.time())
 
     def get_effective_size_multiplier(
         self, symbol: str, warning_size_multiplier: float = 1.0
     ) -> float:
-        state = self.get_symbol_state(symbol)
-        status = str(state.get("last_status") or "").upper()
-        if status == "WARNING":
-            return warning_size_multiplier
+        # Statuses are upper-cased on write and on load.
+        status = self._get_status(symbol)
         if status == "FAILING":
             return 0.0
+        if status == "WARNING":
+            return warning_size_multiplier
         return 1.0
@@ -1,24 +1,74 @@
+import asyncio
+import functools
 import logging
-from copy import deepcopy
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import ccxt.async_support as ccxt
 import numpy as np
 import polars as pl
 
+from src import _indicators_nb as _nb
+
 logger = logging.getLogger(__name__)
 
+# Worker threads evaluating walk-forward parameter combinations.
+WALK_FORWARD_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+_TIMEFRAME_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
 
+@functools.lru_cache(maxsize=64)
 def _timeframe_to_seconds(tf: str) -> int:
-    units = {"m": 60, "h": 3600, "d": 86400}
     tf = tf.strip().lower()
-    for suffix, mult in units.items():
+    for suffix, mult in _TIMEFRAME_UNITS.items():
         if tf.endswith(suffix):
             return int(float(tf[:-1]) * mult)
     raise ValueError(f"Unsupported timeframe {tf}")
 
 
+def _freeze(value: Any) -> Any:
+    """Hashable form of a JSON-like trigger parameter value."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _pivots(arr: np.ndarray, lookback: int, is_high: bool) -> np.ndarray:
+    """Indices equal to the max (or min) of their centred ``2*lookback+1`` window."""
+    window = 2 * lookback + 1
+    if len(arr) < window:
+        return np.empty(0, dtype=np.intp)
+    windows = np.lib.stride_tricks.sliding_window_view(arr, window)
+    extreme = windows.max(axis=1) if is_high else windows.min(axis=1)
+    centre = arr[lookback : len(arr) - lookback]
+    return np.flatnonzero(centre == extreme) + lookback
+
+
+# ccxt OHLCV row layout.
+_OHLCV_SCHEMA = (
+    ("timestamp", pl.Int64),
+    ("open", pl.Float64),
+    ("high", pl.Float64),
+    ("low", pl.Float64),
+    ("close", pl.Float64),
+    ("volume", pl.Float64),
+)
+
+# Labels for the 0/1/2 codes returned by ``_nb.wavetrend``.
+_DOT_LABELS = pl.Series(["NONE", "GREEN", "RED"])
+# Labels for the state codes built by ``IndicatorLibrary.divergence``.
+_DIVERGENCE_LABELS = pl.Series(["none", "bearish", "bullish"])
+_BEARISH, _BULLISH = 1, 2
+# Labels for the ema_ribbon state codes built in ``_indicator_frame``.
+_RIBBON_LABELS = pl.Series(["neutral", "above", "below"])
+_RIBBON_ABOVE, _RIBBON_BELOW = 1, 2
+
+
 class IndicatorLibrary:
     """Polars/NumPy indicator set including Market Cipher B."""
 
@@ -26,25 +76,11 @@ class IndicatorLibrary:
     def _ema(arr: np.ndarray, period: int) -> np.ndarray:
         if len(arr) == 0:
             return arr
-        alpha = 2 / (period + 1)
-        ema = np.zeros_like(arr, dtype=float)
-        ema[0] = arr[0]
-        for i in range(1, len(arr)):
-            ema[i] = alpha * arr[i] + (1 - alpha) * ema[i - 1]
-        return ema
+        return _nb.ema_recursive(np.ascontiguousarray(arr, dtype=np.float64), period)
 
     def rsi(self, series: pl.Series, period: int = 14) -> pl.Series:
-        arr = series.to_numpy()
-        delta = np.diff(arr, prepend=arr[0]).astype(float)
-        gain = np.where(delta > 0, delta, 0.0)
-        loss = np.where(delta < 0, -delta, 0.0)
-        avg_gain = self._ema(gain, period)
-        avg_loss = self._ema(loss, period)
-        rs = np.divide(
-            avg_gain, avg_loss, out=np.zeros_like(avg_gain), where=avg_loss != 0
-        )
-        rsi = 100 - (100 / (1 + rs))
-        return pl.Series(rsi)
+        arr = np.ascontiguousarray(series.to_numpy(), dtype=np.float64)
+        return pl.Series(_nb.rsi_ema(arr, period))
 
     def ema(self, series: pl.Series, period: int) -> pl.Series:
         return pl.Series(self._ema(series.to_numpy(), period))
@@ -89,24 +125,10 @@ class IndicatorLibrary:
         Returns wt1, wt2, money_flow (vwap approx) and dot colors.
         """
         ap = ((df["high"] + df["low"] + df["close"]) / 3).to_numpy()
-        esa = self._ema(ap, n1)
-        d = self._ema(np.abs(ap - esa), n1)
-        ci = (ap - esa) / (0.015 * d + 1e-9)
-        tci = self._ema(ci, n2)
-        wt1 = tci
-        wt2 = (
-            pl.Series(wt1)
-            .rolling_mean(window_size=4)
-            .fill_null(strategy="backward")
-            .to_numpy()
+        wt1, wt2, diff, dot_code = _nb.wavetrend(
+            np.ascontiguousarray(ap, dtype=np.float64), n1, n2
         )
-        diff = wt1 - wt2
-
-        green = (np.roll(diff, 1) < 0) & (diff >= 0) & (wt1 < -60)
-        red = (np.roll(diff, 1) > 0) & (diff <= 0) & (wt1 > 60)
-        dot = np.full_like(diff, "NONE", dtype=object)
-        dot[green] = "GREEN"
-        dot[red] = "RED"
+        dot = _DOT_LABELS[dot_code]
 
         money_flow = self.vwap(df).to_numpy()
 
@@ -114,7 +136,7 @@ class IndicatorLibrary:
             "wt1": pl.Series(wt1),
             "wt2": pl.Series(wt2),
             "diff": pl.Series(diff),
-            "dot": pl.Series(dot),
+            "dot": dot,
             "money_flow": pl.Series(money_flow),
         }
 
@@ -127,37 +149,27 @@ class IndicatorLibrary:
         """
         price_arr = price.to_numpy()
         ind_arr = indicator.to_numpy()
-        states = np.array(["none"] * len(price_arr), dtype=object)
-
-        def pivots(arr: np.ndarray, is_high: bool) -> List[int]:
-            idxs: List[int] = []
-            for i in range(lookback, len(arr) - lookback):
-                window = arr[i - lookback : i + lookback + 1]
-                if is_high and arr[i] == window.max():
-                    idxs.append(i)
-                if not is_high and arr[i] == window.min():
-                    idxs.append(i)
-            return idxs
-
-        highs = pivots(price_arr, True)
-        lows = pivots(price_arr, False)
-        ind_highs = pivots(ind_arr, True)
-        ind_lows = pivots(ind_arr, False)
+        states = np.zeros(len(price_arr), dtype=np.int8)
+
+        highs = _pivots(price_arr, lookback, True)
+        lows = _pivots(price_arr, lookback, False)
+        ind_highs = _pivots(ind_arr, lookback, True)
+        ind_lows = _pivots(ind_arr, lookback, False)
 
         if len(highs) >= 2 and len(ind_highs) >= 2:
             if (
                 price_arr[highs[-1]] > price_arr[highs[-2]]
                 and ind_arr[ind_highs[-1]] < ind_arr[ind_highs[-2]]
             ):
-                states[highs[-1]] = "bearish"
+                states[highs[-1]] = _BEARISH
         if len(lows) >= 2 and len(ind_lows) >= 2:
             if (
                 price_arr[lows[-1]] < price_arr[lows[-2]]
                 and ind_arr[ind_lows[-1]] > ind_arr[ind_lows[-2]]
             ):
-                states[lows[-1]] = "bullish"
+                states[lows[-1]] = _BULLISH
 
-        return pl.Series(states)
+        return _DIVERGENCE_LABELS[states]
 
 
 class DynamicStrategyEngine:
@@ -172,11 +184,21 @@ class DynamicStrategyEngine:
         exchange_id: str = "binance",
         exchange_client: Any = None,
         base_timeframe: str = "1m",
+        warmup: bool = False,
     ):
+        # Services warm the kernels once at startup (warmup_kernels); pass
+        # warmup=True for a standalone engine whose first backtest should not
+        # pay the JIT latency.
+        if warmup and _nb.NUMBA_AVAILABLE:
+            _nb.warmup()
         self.exchange_id = exchange_id
         self.exchange = exchange_client
         self.base_timeframe = base_timeframe
         self.indicators = IndicatorLibrary()
+        # Resampled frames of the most recent base frame, keyed by
+        # (id(base), timeframe); the base is held so its id cannot be reused.
+        self._resample_cache: Dict[Tuple[int, str], pl.DataFrame] = {}
+        self._resample_base: Optional[pl.DataFrame] = None
 
     async def _ensure_exchange(self):
         if self.exchange is None:
@@ -191,32 +213,55 @@ class DynamicStrategyEngine:
         start: datetime,
         end: datetime,
         limit: int = 1000,
+        max_concurrency: int = 4,
     ) -> pl.DataFrame:
         await self._ensure_exchange()
         start_ms = int(start.timestamp() * 1000)
         end_ms = int(end.timestamp() * 1000)
         step = _timeframe_to_seconds(timeframe) * 1000
+        window = step * limit
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch_window(lo: int) -> List[List[Any]]:
+            # Each window spans ``limit`` candles; keep paging inside it in case
+            # the exchange caps the batch below ``limit``.
+            hi = min(lo + window, end_ms + step)
+            rows: List[List[Any]] = []
+            since = lo
+            while since < hi:
+                async with semaphore:
+                    batch = await self.exchange.fetch_ohlcv(
+                        symbol, timeframe, since=since, limit=limit
+                    )
+                if not batch:
+                    break
+                rows.extend(row for row in batch if row[0] < hi)
+                if batch[-1][0] + step <= since:
+                    break
+                since = batch[-1][0] + step
+            return rows
+
+        # Window offsets are known upfront, so fetch them concurrently; ccxt's
+        # enableRateLimit paces the requests that the semaphore lets through.
+        batches = await asyncio.gather(
+            *(fetch_window(lo) for lo in range(start_ms, end_ms, window))
+        )
 
-        all_rows: List[List[float]] = []
-        since = start_ms
-        while since < end_ms:
-            batch = await self.exchange.fetch_ohlcv(
-                symbol, timeframe, since=since, limit=limit
-            )
-            if not batch:
-                break
-            all_rows.extend(batch)
-            since = batch[-1][0] + step
-            if batch[-1][0] >= end_ms or len(batch) < limit:
-                break
-
-        if not all_rows:
+        columns: List[List[Any]] = [[] for _ in _OHLCV_SCHEMA]
+        for batch in batches:
+            if batch:
+                fields = zip(*batch, strict=True)
+                for column, values in zip(columns, fields, strict=False):
+                    column.extend(values)
+
+        if not columns[0]:
             raise RuntimeError("No data returned from exchange for requested window.")
 
         df = pl.DataFrame(
-            all_rows,
-            schema=["timestamp", "open", "high", "low", "close", "volume"],
-            orient="row",
+            [
+                pl.Series(name, values, dtype=dtype)
+                for (name, dtype), values in zip(_OHLCV_SCHEMA, columns, strict=True)
+            ]
         )
         df = df.with_columns(
             pl.from_epoch(pl.col("timestamp"), time_unit="ms").alias("timestamp")
@@ -321,20 +366,16 @@ class DynamicStrategyEngine:
             )
         if name == "ema_ribbon":
             ribbon = self.indicators.ema_ribbon(df["close"], params.get("periods"))
-            above = df["close"] > pl.DataFrame(ribbon).select(pl.all()).min_horizontal()
-            below = df["close"] < pl.DataFrame(ribbon).select(pl.all()).max_horizontal()
+            close = df["close"].to_numpy()
+            emas = np.column_stack([ema.to_numpy() for ema in ribbon.values()])
+            # below takes precedence over above when the close sits inside the ribbon
+            state = np.where(
+                close < emas.max(axis=1),
+                _RIBBON_BELOW,
+                np.where(close > emas.min(axis=1), _RIBBON_ABOVE, 0),
+            ).astype(np.int8)
             return pl.DataFrame(
-                {
-                    "timestamp": df["timestamp"],
-                    "state": above.replace(True, "above").replace(False, "below"),
-                }
-            ).with_columns(  # type: ignore  # noqa: E501
-                pl.when(below)
-                .then("below")
-                .when(above)
-                .then("above")
-                .otherwise("neutral")
-                .alias("state")
+                {"timestamp": df["timestamp"], "state": _RIBBON_LABELS[state]}
             )
         if name in ("wavetrend_dot", "wavetrend_wt1", "wavetrend_wt2"):
             wt = self.indicators.wavetrend_cipher_b(
@@ -347,113 +388,172 @@ class DynamicStrategyEngine:
             return pl.DataFrame({"timestamp": df["timestamp"], "value": wt["wt2"]})
         if name == "divergence":
             rsi = self.indicators.rsi(df["close"], params.get("period", 14))
-            state = self.indicators.divergence(
+            divergence = self.indicators.divergence(
                 df["close"], rsi, params.get("lookback", 5)
             )
-            return pl.DataFrame({"timestamp": df["timestamp"], "state": state})
+            return pl.DataFrame({"timestamp": df["timestamp"], "state": divergence})
 
         # default passthrough close price
         return pl.DataFrame({"timestamp": df["timestamp"], "value": df["close"]})
 
-    def _condition_series(self, df: pl.DataFrame, trigger: Dict[str, Any]) -> pl.Series:
+    def _condition_series(self, df: pl.DataFrame, trigger: Dict[str, Any]) -> pl.Expr:
+        """Boolean expression over ``df``'s columns for a single trigger."""
         operator = trigger.get("operator")
         target = trigger.get("value")
         params = trigger.get("params", {}) or {}
 
         field = params.get("field")
         if field and field in df.columns:
-            series = df[field]
+            column = field
         elif "state" in df.columns:
-            series = df["state"]
+            column = "state"
         else:
-            series = df["value"]
+            column = "value"
+        series = pl.col(column)
 
-        compare_to = params.get("compare_to")
-        rhs_series = df[compare_to] if compare_to and compare_to in df.columns else None
+        compare_to: Optional[str] = params.get("compare_to")
+        if not (isinstance(compare_to, str) and compare_to in df.columns):
+            compare_to = None
+        rhs_series = pl.col(compare_to) if compare_to is not None else None
 
-        def _as_float(value: Any) -> Optional[float]:
+        def _as_threshold(value: Any) -> Optional[Union[float, str]]:
             if value is None:
                 return None
             try:
-                return float(value)
+                number = float(value)
             except (TypeError, ValueError):
                 return None
+            # State columns hold labels; Polars compares them with the number's
+            # string form, so keep that behaviour explicit in the expression.
+            return str(number) if df.schema[column] == pl.Utf8 else number
 
         if operator == "crosses_up":
-            thresh = _as_float(target)
+            thresh = _as_threshold(target)
             if thresh is None:
-                return pl.Series([False] * len(series))
-            prev = series.shift(1)
-            return (prev < thresh) & (series >= thresh)
+                return pl.lit(False)
+            return (
+                pl.when(series.shift(1) < thresh)
+                .then(series >= thresh)
+                .otherwise(False)
+            )
         if operator == "crosses_down":
-            thresh = _as_float(target)
+            thresh = _as_threshold(target)
             if thresh is None:
-                return pl.Series([False] * len(series))
-            prev = series.shift(1)
-            return (prev > thresh) & (series <= thresh)
+                return pl.lit(False)
+            return (
+                pl.when(series.shift(1) > thresh)
+                .then(series <= thresh)
+                .otherwise(False)
+            )
         if operator == "==":
-            return series.cast(str) == (
-                rhs_series.cast(str) if rhs_series is not None else str(target)
+            if df.schema[column].is_numeric():
+                if compare_to is not None and df.schema[compare_to].is_numeric():
+                    return series == pl.col(compare_to)
+                if rhs_series is None:
+                    rhs = _as_threshold(target)
+                    return pl.lit(False) if rhs is None else series == rhs
+            return series.cast(pl.Utf8) == (
+                rhs_series.cast(pl.Utf8) if rhs_series is not None else str(target)
             )
-        if operator == ">":
-            if rhs_series is not None:
+        if operator in (">", "<", ">=", "<="):
+            if rhs_series is None:
+                rhs = _as_threshold(target)
+                if rhs is None:
+                    return pl.lit(False)
+                rhs_series = pl.lit(rhs)
+            if operator == ">":
                 return series > rhs_series
-            rhs = _as_float(target)
-            if rhs is None:
-                return pl.Series([False] * len(series))
-            return series > rhs
-        if operator == "<":
-            if rhs_series is not None:
+            if operator == "<":
                 return series < rhs_series
-            rhs = _as_float(target)
-            if rhs is None:
-                return pl.Series([False] * len(series))
-            return series < rhs
-        if operator == ">=":
-            if rhs_series is not None:
+            if operator == ">=":
                 return series >= rhs_series
-            rhs = _as_float(target)
-            if rhs is None:
-                return pl.Series([False] * len(series))
-            return series >= rhs
-        if operator == "<=":
-            if rhs_series is not None:
-                return series <= rhs_series
-            rhs = _as_float(target)
-            if rhs is None:
-                return pl.Series([False] * len(series))
-            return series <= rhs
-        return pl.Series([False] * len(series))
+            return series <= rhs_series
+        return pl.lit(False)
 
     def _evaluate_triggers(
-        self, base: pl.DataFrame, triggers: List[Dict[str, Any]]
+        self,
+        base: pl.DataFrame,
+        triggers: List[Dict[str, Any]],
+        indicator_cache: Optional[Dict[Tuple[Any, ...], pl.DataFrame]] = None,
+    ) -> pl.DataFrame:
+        """
+        Evaluate each trigger on its timeframe and align the results to ``base``.
+
+        ``indicator_cache`` memoizes indicator frames by (timeframe, indicator,
+        params); pass the same dict across calls on the same ``base`` (e.g. a
+        threshold sweep) to reuse them. Resampled timeframes of the latest
+        ``base`` are cached on the engine.
+        """
+        if indicator_cache is None:
+            indicator_cache = {}
+        self._prepare_indicators(base, triggers, indicator_cache)
+        return self._align_triggers(base, triggers, indicator_cache)
+
+    def _indicator_key(self, trigger: Dict[str, Any]) -> Tuple[Any, ...]:
+        """``indicator_cache`` key: (timeframe, indicator, frozen params)."""
+        tf = trigger.get("timeframe", self.base_timeframe)
+        return (tf, trigger.get("indicator"), _freeze(trigger.get("params") or {}))
+
+    def _prepare_indicators(
+        self,
+        base: pl.DataFrame,
+        triggers: List[Dict[str, Any]],
+        indicator_cache: Dict[Tuple[Any, ...], pl.DataFrame],
+    ) -> None:
+        """Fill ``indicator_cache`` with every indicator frame ``triggers`` use."""
+        if base is not self._resample_base:
+            self._resample_cache = {}
+            self._resample_base = base
+        for trig in triggers:
+            key = self._indicator_key(trig)
+            if key in indicator_cache:
+                continue
+            tf = key[0]
+            if tf == self.base_timeframe:
+                frame = base
+            else:
+                cached = self._resample_cache.get((id(base), tf))
+                if cached is None:
+                    cached = self.resample(base, tf)
+                    self._resample_cache[(id(base), tf)] = cached
+                frame = cached
+            indicator_cache[key] = self._indicator_frame(frame, trig)
+
+    def _align_triggers(
+        self,
+        base: pl.DataFrame,
+        triggers: List[Dict[str, Any]],
+        indicator_cache: Dict[Tuple[Any, ...], pl.DataFrame],
     ) -> pl.DataFrame:
+        """
+        Trigger columns aligned to ``base`` from prepared indicator frames.
+
+        Only reads ``indicator_cache`` and engine settings, so threads can
+        share a cache filled beforehand by ``_prepare_indicators``.
+        """
         if not triggers:
             return base.select(["timestamp"])
 
-        timeframes = {t.get("timeframe", self.base_timeframe) for t in triggers}
-        cached: Dict[str, pl.DataFrame] = {}
-        for tf in timeframes:
-            cached[tf] = base if tf == self.base_timeframe else self.resample(base, tf)
-
-        trigger_frames: List[pl.DataFrame] = []
+        # Build one lazy query over all triggers so Polars can plan the as-of
+        # joins together and materialize the result with a single collect().
+        timestamps = base.lazy().select(["timestamp"])
+        aligned: List[pl.LazyFrame] = []
         for idx, trig in enumerate(triggers):
-            tf = trig.get("timeframe", self.base_timeframe)
-            tf_df = cached[tf]
-            ind_df = self._indicator_frame(tf_df, trig)
+            ind_df = indicator_cache[self._indicator_key(trig)]
+            name = f"trigger_{idx}"
             cond = self._condition_series(ind_df, trig)
-            tf_signals = pl.DataFrame(
-                {"timestamp": ind_df["timestamp"], f"trigger_{idx}": cond}
+            tf_signals = ind_df.lazy().select([pl.col("timestamp"), cond.alias(name)])
+            # join_asof keeps the left frame's rows and order, so every trigger
+            # column is already aligned to ``base`` and can be stitched in one go.
+            aligned.append(
+                timestamps.join_asof(
+                    tf_signals.sort("timestamp"),
+                    on="timestamp",
+                    strategy="backward",
+                ).select([name])
             )
-            aligned = base.join_asof(
-                tf_signals.sort("timestamp"), on="timestamp", strategy="backward"
-            ).select(["timestamp", f"trigger_{idx}"])
-            trigger_frames.append(aligned)
 
-        combined = trigger_frames[0]
-        for frame in trigger_frames[1:]:
-            combined = combined.join(frame, on="timestamp", how="inner")
-        return combined
+        return pl.concat([timestamps, *aligned], how="horizontal").collect()
 
     def _combine_logic(self, trigger_df: pl.DataFrame, logic: str) -> pl.Series:
         cols = [c for c in trigger_df.columns if c.startswith("trigger_")]
@@ -463,15 +563,6 @@ class DynamicStrategyEngine:
             return trigger_df.select(pl.any_horizontal(cols)).to_series()
         return trigger_df.select(pl.all_horizontal(cols)).to_series()
 
-    def _position_size(
-        self, equity: float, risk_pct: float, entry: float, stop: float
-    ) -> float:
-        risk_amount = equity * (risk_pct / 100.0)
-        stop_distance = abs(entry - stop)
-        if stop_distance <= 0:
-            return 0.0
-        return risk_amount / stop_distance
-
     def _simulate(
         self,
         data: pl.DataFrame,
@@ -483,54 +574,25 @@ class DynamicStrategyEngine:
         stop_loss_pct = float(risk.get("stop_loss_pct", 1.0)) / 100.0
         take_profit_pct = float(risk.get("take_profit_pct", 2.0)) / 100.0
 
-        in_position = False
-        qty = 0.0
-        entry_price = 0.0
-        wins = 0
-        losses = 0
-        equity_curve: List[Tuple[datetime, float]] = []
-
-        for row, signal in zip(data.iter_rows(named=True), signals, strict=False):
-            price = float(row["close"])
-            ts = row["timestamp"]
-
-            if in_position:
-                stop_price = entry_price * (1 - stop_loss_pct)
-                target_price = entry_price * (1 + take_profit_pct)
-                low = float(row["low"])
-                high = float(row["high"])
-
-                if low <= stop_price:
-                    equity += qty * (stop_price - entry_price)
-                    losses += 1
-                    in_position = False
-                    qty = 0
-                    entry_price = 0
-                elif high >= target_price:
-                    equity += qty * (target_price - entry_price)
-                    wins += 1
-                    in_position = False
-                    qty = 0
-                    entry_price = 0
-                elif not signal:
-                    equity += qty * (price - entry_price)
-                    if price > entry_price:
-                        wins += 1
-                    else:
-                        losses += 1
-                    in_position = False
-                    qty = 0
-                    entry_price = 0
-            else:
-                if signal:
-                    stop_price = price * (1 - stop_loss_pct)
-                    qty = self._position_size(equity, risk_pct, price, stop_price)
-                    if qty > 0:
-                        entry_price = price
-                        in_position = True
-
-            mtm = equity if not in_position else equity + qty * (price - entry_price)
-            equity_curve.append((ts, mtm))
+        n = min(len(data), len(signals))
+        prices = data.head(n).select(["close", "high", "low"]).cast(pl.Float64)
+        close, high, low = (
+            np.ascontiguousarray(prices[column].to_numpy()) for column in prices.columns
+        )
+        flags = signals.head(n).fill_null(False).cast(pl.Boolean).to_numpy()
+        curve, equity, wins, losses, in_position, qty, entry_price = _nb.simulate_long(
+            close,
+            high,
+            low,
+            np.ascontiguousarray(flags),
+            equity,
+            risk_pct,
+            stop_loss_pct,
+            take_profit_pct,
+        )
+        equity_curve: List[Tuple[datetime, float]] = list(
+            zip(data["timestamp"].head(n).to_list(), curve.tolist(), strict=True)
+        )
 
         if in_position:
             equity += qty * (float(data[-1, "close"]) - entry_price)
@@ -539,14 +601,12 @@ class DynamicStrategyEngine:
             else:
                 losses += 1
             equity_curve.append((data[-1, "timestamp"], equity))
+            curve = np.append(curve, equity)
 
         pnl = equity - float(risk.get("initial_capital", 100_000))
         trades = wins + losses
         win_rate = wins / trades if trades > 0 else 0.0
-        equity_vals = np.array([eq for _, eq in equity_curve], dtype=float)
-        peaks = np.maximum.accumulate(equity_vals)
-        drawdowns = (peaks - equity_vals) / peaks
-        max_dd = float(drawdowns.max()) if len(drawdowns) else 0.0
+        max_dd = float(_nb.max_drawdown(curve))
 
         return {
             "pnl": float(pnl),
@@ -586,10 +646,14 @@ class DynamicStrategyEngine:
             },
         )
 
-        async def evaluate(config: Dict[str, Any]) -> Dict[str, Any]:
-            triggers = config.get("triggers", [])
-            trigger_df = self._evaluate_triggers(base_df, triggers)
-            signals = self._combine_logic(trigger_df, config.get("logic", "AND"))
+        indicator_cache: Dict[Tuple[Any, ...], pl.DataFrame] = {}
+
+        base_triggers = strategy_config.get("triggers", [])
+        logic = strategy_config.get("logic", "AND")
+
+        async def evaluate(triggers: List[Dict[str, Any]]) -> Dict[str, Any]:
+            trigger_df = self._evaluate_triggers(base_df, triggers, indicator_cache)
+            signals = self._combine_logic(trigger_df, logic)
             return self._simulate(base_df, signals, risk_block)
 
         if optimization:
@@ -601,15 +665,17 @@ class DynamicStrategyEngine:
 
             sweep_val = start_val
             while sweep_val <= end_val + 1e-9:
-                candidate = deepcopy(strategy_config)
-                triggers = candidate.get("triggers")
+                # Only the swept trigger is copied; the rest are shared with
+                # the caller's config, which is never mutated.
+                triggers = base_triggers
                 if (
                     isinstance(triggers, list)
                     and 0 <= idx < len(triggers)
                     and isinstance(triggers[idx], dict)
                 ):
-                    triggers[idx]["value"] = sweep_val
-                res = await evaluate(candidate)
+                    triggers = list(triggers)
+                    triggers[idx] = {**triggers[idx], "value": sweep_val}
+                res = await evaluate(triggers)
                 res["sweep_value"] = sweep_val
                 results.append(res)
                 sweep_val += step
@@ -635,7 +701,7 @@ class DynamicStrategyEngine:
                 "equity_curve": best.get("equity_curve", []),
             }
 
-        return await evaluate(strategy_config)
+        return await evaluate(base_triggers)
 
     async def walk_forward_optimization(
         self,
@@ -662,26 +728,50 @@ class DynamicStrategyEngine:
 
         param_names = list(param_ranges.keys())
         combinations = list(itertools.product(*param_ranges.values()))
-        results: List[Dict[str, Any]] = []
-
-        for combo in combinations:
-            strategy = deepcopy(strategy_template)
+        indicator_cache: Dict[Tuple[Any, ...], pl.DataFrame] = {}
+
+        def apply_params(
+            trigger: Dict[str, Any], combo: Tuple[Any, ...]
+        ) -> Dict[str, Any]:
+            """Copy of ``trigger`` with the matching combo values applied."""
+            indicator_name = trigger.get("indicator", "")
+            if not indicator_name:
+                return trigger
+            updated = trigger
             for name, val in zip(param_names, combo, strict=False):
-                for trigger in strategy.get("triggers", []):
-                    indicator_name = trigger.get("indicator", "")
-                    if indicator_name and indicator_name in name:
-                        trigger.setdefault("params", {})
-                        if "period" in name:
-                            trigger["params"]["period"] = val
-                        if "threshold" in name or name.endswith("value"):
-                            trigger["value"] = val
-
-            trig_df = self._evaluate_triggers(base_df, strategy.get("triggers", []))
-            signals = self._combine_logic(trig_df, strategy.get("logic", "AND"))
+                if indicator_name not in name:
+                    continue
+                if updated is trigger:
+                    updated = dict(trigger)
+                if "period" in name:
+                    updated["params"] = {**(updated.get("params") or {}), "period": val}
+                if "threshold" in name or name.endswith("value"):
+                    updated["value"] = val
+            return updated
+
+        combo_triggers = [
+            [
+                apply_params(trigger, combo)
+                for trigger in strategy_template.get("triggers", [])
+            ]
+            for combo in combinations
+        ]
+
+        def prepare() -> None:
+            for triggers in combo_triggers:
+                self._prepare_indicators(base_df, triggers, indicator_cache)
+
+        def evaluate(
+            triggers: List[Dict[str, Any]], combo: Tuple[Any, ...]
+        ) -> Dict[str, Any]:
+            trig_df = self._align_triggers(base_df, triggers, indicator_cache)
+            signals = self._combine_logic(
+                trig_df, strategy_template.get("logic", "AND")
+            )
             res = self._simulate(
                 base_df,
                 signals,
-                strategy.get(
+                strategy_template.get(
                     "risk",
                     {
                         "initial_capital": 100_000,
@@ -692,8 +782,32 @@ class DynamicStrategyEngine:
                 ),
             )
             res["params"] = dict(zip(param_names, combo, strict=False))
-            results.append(res)
-
+            return res
+
+        # Resample and build every indicator frame once, then let worker
+        # threads evaluate the independent combos against the read-only cache
+        # (Polars and the compiled simulation release the GIL). The combos get
+        # their own bounded pool so a large grid can't starve other
+        # ``asyncio.to_thread`` users of the default executor.
+        await asyncio.to_thread(prepare)
+        loop = asyncio.get_running_loop()
+        pool = ThreadPoolExecutor(
+            max_workers=max(1, min(len(combinations), WALK_FORWARD_MAX_WORKERS)),
+            thread_name_prefix="walk-forward",
+        )
+        try:
+            results: List[Dict[str, Any]] = list(
+                await asyncio.gather(
+                    *(
+                        loop.run_in_executor(pool, evaluate, triggers, combo)
+                        for triggers, combo in zip(
+                            combo_triggers, combinations, strict=True
+                        )
+                    )
+                )
+            )
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
         results.sort(key=lambda x: x["pnl"], reverse=True)
         return {
             "best_params": results[0]["params"] if results else {},
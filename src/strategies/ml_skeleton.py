@@ -1,15 +1,19 @@
+import itertools
 import logging
 import uuid
-from collections import deque
-from typing import Deque, List, Optional
+from typing import List, Optional
 
 import numpy as np
 
+from src import _indicators_nb as _nb
 from src.domain.entities import MarketData, Order, OrderType, Side
 from src.domain.interfaces import IStrategy
 
 logger = logging.getLogger(__name__)
 
+# Features only look at the last 10 returns, i.e. the last 11 closes.
+_FEATURE_TAIL = 11
+
 
 class MLStrategy(IStrategy):
     """
@@ -22,13 +26,22 @@ class MLStrategy(IStrategy):
         self.model = None  # Integrate XGBoost/LSTM model here
         self.lookback = lookback
         self.threshold = threshold
-        self.window: Deque[float] = deque(maxlen=lookback)
+        # Ring buffer of the last ``lookback`` closes; ``_pos`` is the next slot.
+        self._closes = np.empty(lookback, dtype=np.float64)
+        self._pos = 0
+        self._count = 0
         self.current_position: Optional[Side] = None
+        # Order ids: a per-instance random prefix plus a counter.
+        self._id_prefix = uuid.uuid4().hex[:8]
+        self._id_ctr = itertools.count()
 
     async def on_tick(self, market_data: MarketData) -> List[Order]:
-        self.window.append(market_data.close)
-        if len(self.window) < self.lookback:
-            return []
+        self._closes[self._pos] = market_data.close
+        self._pos = (self._pos + 1) % self.lookback
+        if self._count < self.lookback:
+            self._count += 1
+            if self._count < self.lookback:
+                return []
 
         features = self._extract_features()
         score = self._predict(features)
@@ -56,8 +69,18 @@ class MLStrategy(IStrategy):
     async def on_order_update(self, order: Order):
         return None
 
+    def _tail(self, size: int) -> np.ndarray:
+        """Last ``size`` closes in arrival order (a view unless it wraps)."""
+        size = min(size, self._count)
+        start = self._pos - size
+        if start >= 0:
+            return self._closes[start : self._pos]
+        return np.concatenate((self._closes[start:], self._closes[: self._pos]))
+
     def _extract_features(self) -> np.ndarray:
-        prices = np.array(self.window, dtype=float)
+        prices = self._tail(_FEATURE_TAIL)
+        if _nb.NUMBA_AVAILABLE:
+            return _nb.momentum_features(np.ascontiguousarray(prices))
         returns = np.diff(prices) / prices[:-1]
         momentum = returns[-5:].sum()
         vol = returns[-10:].std() if returns.size >= 10 else 0.0
@@ -73,7 +96,7 @@ class MLStrategy(IStrategy):
 
     def _order(self, side: Side, market_data: MarketData) -> Order:
         return Order(
-            id=str(uuid.uuid4()),
+            id=f"{self._id_prefix}{next(self._id_ctr):x}",
             symbol=market_data.symbol,
             side=side,
             order_type=OrderType.MARKET,
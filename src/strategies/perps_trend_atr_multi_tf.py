@@ -7,12 +7,132 @@ position sizing, and safety gates live elsewhere.
 
 from __future__ import annotations
 
-from typing import Any, Dict
+import math
+from typing import Any, Dict, Hashable, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from src.config import PerpsConfig
-from src.ta_indicators.ta_core import atr, ema, rsi_ema
+from src.ta_indicators.ta_core import (
+    all_finite,
+    atr,
+    ema,
+    ewm_step,
+    rsi_ema_components,
+    rsi_from_averages,
+    same_bar,
+)
+
+# (index label, high, low, close) of one bar.
+_Bar = Tuple[Hashable, float, float, float]
+
+
+def _bar(df: pd.DataFrame, i: int) -> _Bar:
+    return (
+        df.index[i],
+        float(df["high"].iat[i]),
+        float(df["low"].iat[i]),
+        float(df["close"].iat[i]),
+    )
+
+
+class MultiTfSignalState:
+    """
+    Indicator state carried between ``compute_signals_multi_tf`` calls.
+
+    Like ``IncrementalIndicators.advance``, a frame that extends the
+    previously seen one by a single bar advances the EMAs, Wilder ATR and RSI
+    averages by one recurrence step; anything else (first call, gaps, revised
+    bars, changed periods) re-seeds from the whole frame. EMAs therefore keep
+    their history across a sliding fetch window rather than re-seeding at
+    its first bar.
+    """
+
+    def __init__(self) -> None:
+        self._ltf_bar: Optional[_Bar] = None
+        self._ltf_periods: Optional[Tuple[int, Optional[int]]] = None
+        self._ltf: Dict[str, float] = {}
+        self._htf_bar: Optional[_Bar] = None
+        self._ema200_htf = math.nan
+
+    def ltf_values(self, df: pd.DataFrame, config: PerpsConfig) -> Dict[str, float]:
+        """ema20, prev_ema20, ema50, atr and rsi as of the last bar of ``df``."""
+        periods = (config.atrPeriod, config.rsiPeriod if config.useRsiFilter else None)
+        bar = _bar(df, -1)
+        last = self._ltf_bar
+        if last is not None and periods == self._ltf_periods:
+            if same_bar(last, bar):
+                return self._ltf
+            if same_bar(last, _bar(df, -2)) and self._advance_ltf(last, bar):
+                self._ltf_bar = bar
+                return self._ltf
+        self._seed_ltf(df, config)
+        self._ltf_periods = periods
+        self._ltf_bar = bar
+        return self._ltf
+
+    def htf_ema200(self, df: pd.DataFrame) -> float:
+        """200-period EMA of the HTF closes as of the last bar of ``df``."""
+        bar = _bar(df, -1)
+        last = self._htf_bar
+        if last is not None and same_bar(last, bar):
+            return self._ema200_htf
+        if (
+            last is not None
+            and same_bar(last, _bar(df, -2))
+            and all_finite(self._ema200_htf, bar[3])
+        ):
+            self._ema200_htf = ewm_step(self._ema200_htf, bar[3], 2 / 201)
+        else:
+            closes = df["close"].astype(np.float64, copy=False)
+            self._ema200_htf = float(ema(closes, 200).iat[-1])
+        self._htf_bar = bar
+        return self._ema200_htf
+
+    def _seed_ltf(self, df: pd.DataFrame, config: PerpsConfig) -> None:
+        closes = df["close"].astype(np.float64, copy=False)
+        ema20 = ema(closes, 20)
+        values = {
+            "ema20": float(ema20.iat[-1]),
+            "prev_ema20": float(ema20.iat[-2]),
+            "ema50": float(ema(closes, 50).iat[-1]),
+            "atr": float(atr(df, period=config.atrPeriod).iat[-1]),
+            "rsi": math.nan,
+            "avg_gain": math.nan,
+            "avg_loss": math.nan,
+        }
+        if config.useRsiFilter:
+            avg_gain, avg_loss = rsi_ema_components(closes, n=config.rsiPeriod)
+            values["avg_gain"] = float(avg_gain.iat[-1])
+            values["avg_loss"] = float(avg_loss.iat[-1])
+            values["rsi"] = rsi_from_averages(values["avg_gain"], values["avg_loss"])
+        self._ltf = values
+
+    def _advance_ltf(self, last: _Bar, bar: _Bar) -> bool:
+        values = self._ltf
+        atr_period, rsi_period = self._ltf_periods or (0, None)
+        _, high, low, close = bar
+        prev_close = last[3]
+        state = [values["ema20"], values["ema50"], values["atr"]]
+        if rsi_period is not None:
+            state += [values["avg_gain"], values["avg_loss"]]
+        if not all_finite(high, low, close, prev_close, *state):
+            return False
+
+        tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        values["prev_ema20"] = values["ema20"]
+        values["ema20"] = ewm_step(values["ema20"], close, 2 / 21)
+        values["ema50"] = ewm_step(values["ema50"], close, 2 / 51)
+        values["atr"] = ewm_step(values["atr"], tr, 1 / atr_period)
+        if rsi_period is not None:
+            delta = close - prev_close
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            values["avg_gain"] = ewm_step(values["avg_gain"], gain, 1 / rsi_period)
+            values["avg_loss"] = ewm_step(values["avg_loss"], loss, 1 / rsi_period)
+            values["rsi"] = rsi_from_averages(values["avg_gain"], values["avg_loss"])
+        return True
 
 
 def _default_response() -> Dict[str, Any]:
@@ -42,10 +162,14 @@ def compute_signals_multi_tf(
     htf_df: pd.DataFrame,
     *,
     config: PerpsConfig,
+    state: Optional[MultiTfSignalState] = None,
 ) -> Dict[str, Any]:
     """
     Generate long-side signals using a 5m execution timeframe with a 1h trend filter.
 
+    Pass the same ``state`` on every call for one symbol to update the
+    indicators bar by bar instead of recomputing them over the whole frames.
+
     Returns a dict containing:
         long_signal: bool
         entry_price, stop_price, tp1_price, tp2_price: floats
@@ -63,24 +187,19 @@ def compute_signals_multi_tf(
     if len(ltf_df) < ltf_required or len(htf_df) < 200:
         return response
 
-    ltf_closes = ltf_df["close"].astype(float)
-    ltf_lows = ltf_df["low"].astype(float)
-    htf_closes = htf_df["close"].astype(float)
-
-    ema20_series = ema(ltf_closes, 20)
-    ema50_series = ema(ltf_closes, 50)
-    atr_series = atr(ltf_df, period=config.atrPeriod)
-    ema200_htf_series = ema(htf_closes, 200)
-
-    ema20 = float(ema20_series.iloc[-1])
-    ema50 = float(ema50_series.iloc[-1])
-    ema200_htf = float(ema200_htf_series.iloc[-1])
-    atr_value = float(atr_series.iloc[-1])
-    close_price = float(ltf_closes.iloc[-1])
-    prev_close = float(ltf_closes.iloc[-2])
-    last_low = float(ltf_lows.iloc[-1])
-    prev_ema20 = float(ema20_series.iloc[-2])
-    prev_index = ltf_df.index[-2]
+    if state is None:
+        state = MultiTfSignalState()
+    ltf = state.ltf_values(ltf_df, config)
+    ema200_htf = state.htf_ema200(htf_df)
+
+    closes = ltf_df["close"].to_numpy(dtype=np.float64)
+    ema20 = ltf["ema20"]
+    ema50 = ltf["ema50"]
+    atr_value = ltf["atr"]
+    close_price = float(closes[-1])
+    prev_close = float(closes[-2])
+    last_low = float(ltf_df["low"].iat[-1])
+    prev_ema20 = ltf["prev_ema20"]
 
     atr_pct = atr_value / close_price if close_price > 0 else 0.0
     response.update(
@@ -97,7 +216,7 @@ def compute_signals_multi_tf(
     if any(pd.isna(v) for v in (ema20, ema50, ema200_htf, atr_value)):
         return response
 
-    htf_trend_up = htf_closes.iloc[-1] > ema200_htf
+    htf_trend_up = float(htf_df["close"].iat[-1]) > ema200_htf
     ltf_trend_up = ema20 > ema50
 
     atr_ok = True
@@ -110,33 +229,32 @@ def compute_signals_multi_tf(
     wick_near_ema = abs(last_low - ema20) <= config.wickAtrBuffer * atr_value
     pullback_ok = pullback_body or wick_near_ema
 
+    not_chasing = close_price <= ema20 + config.maxEmaDistanceAtr * atr_value
+
     rsi_ok = True
     rsi_value = float("nan")
     if config.useRsiFilter:
-        rsi_series = rsi_ema(ltf_closes, n=config.rsiPeriod)
-        rsi_value = float(rsi_series.iloc[-1])
+        rsi_value = ltf["rsi"]
         rsi_ok = config.rsiMin <= rsi_value <= config.rsiMax
 
     volume_ok = True
     if config.useVolumeFilter:
-        vol_ma = ltf_df["volume"].rolling(config.volumeLookback).mean().iloc[-1]
-        volume_ok = vol_ma > 0 and float(ltf_df["volume"].iloc[-1]) >= (
+        volumes = ltf_df["volume"].to_numpy(dtype=np.float64)
+        lookback = config.volumeLookback
+        vol_ma = volumes[-lookback:].mean() if len(volumes) >= lookback else math.nan
+        volume_ok = vol_ma > 0 and float(volumes[-1]) >= (
             vol_ma * config.volumeSpikeMultiplier
         )
 
-    not_chasing = close_price <= ema20 + config.maxEmaDistanceAtr * atr_value
-
-    long_signal = all(
-        [
-            htf_trend_up,
-            ltf_trend_up,
-            atr_ok,
-            pullback_ok,
-            rsi_ok,
-            volume_ok,
-            atr_value > 0,
-            not_chasing,
-        ]
+    long_signal = (
+        htf_trend_up
+        and ltf_trend_up
+        and atr_ok
+        and pullback_ok
+        and rsi_ok
+        and volume_ok
+        and atr_value > 0
+        and not_chasing
     )
 
     stop_distance = max(
@@ -159,7 +277,7 @@ def compute_signals_multi_tf(
             "volume_ok": bool(volume_ok),
             "rsi_ok": bool(rsi_ok),
             "pullback_ok": bool(pullback_ok),
-            "prev_index": prev_index,
+            "prev_index": ltf_df.index[-2],
         }
     )
     return response
@@ -2,43 +2,240 @@
 Perps trend-following + VWAP strategy signals
 """
 
-from typing import Dict
+import itertools
+import math
+from collections import deque
+from typing import Deque, Dict, Hashable, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from src.ta_indicators.ta_core import rsi_ema, sma, vwap
-
-
-def compute_signals(df: pd.DataFrame) -> Dict[str, float | bool]:
-    if len(df) < 35:
-        return {
-            "long_signal": False,
-            "price": float("nan"),
-            "fast": float("nan"),
-            "slow": float("nan"),
-            "vwap": float("nan"),
-            "rsi": float("nan"),
-        }
-    closes = df["close"].astype(float)
-    fast = sma(closes, 10)
-    slow = sma(closes, 30)
-    vwap_series = vwap(df)
-    rsi_series = rsi_ema(closes, 14)
-    current = df.iloc[-1]
-    prev_idx = df.index[-2]
-    long_signal = (
-        fast.iloc[-2] < slow.iloc[-2]
-        and fast.iloc[-1] > slow.iloc[-1]
-        and current["close"] > vwap_series.iloc[-1]
-        and 30 < rsi_series.iloc[-1] < 65
-    )
+from src.ta_indicators.ta_core import (
+    all_finite,
+    ewm_step,
+    rsi_ema,
+    rsi_ema_components,
+    rsi_from_averages,
+    same_bar,
+    sma,
+    vwap,
+)
+
+# Bars needed before a signal is evaluated.
+MIN_BARS = 35
+
+
+def _nan_signals() -> Dict[str, float | bool]:
     return {
-        "long_signal": bool(long_signal),
-        "price": float(current["close"]),
-        "fast": float(fast.iloc[-1]),
-        "slow": float(slow.iloc[-1]),
-        "vwap": float(vwap_series.iloc[-1]),
-        "rsi": float(rsi_series.iloc[-1]),
-        "prev_fast": float(fast.loc[prev_idx]),
-        "prev_slow": float(slow.loc[prev_idx]),
+        "long_signal": False,
+        "price": float("nan"),
+        "fast": float("nan"),
+        "slow": float("nan"),
+        "vwap": float("nan"),
+        "rsi": float("nan"),
     }
+
+
+def _frame_values(df: pd.DataFrame) -> Dict[str, float]:
+    closes = df["close"].astype(np.float64, copy=False)
+    fast = sma(closes, 10).to_numpy()
+    slow = sma(closes, 30).to_numpy()
+    return {
+        "price": float(closes.iat[-1]),
+        "fast": float(fast[-1]),
+        "slow": float(slow[-1]),
+        "vwap": float(vwap(df).iat[-1]),
+        "rsi": float(rsi_ema(closes, 14).iat[-1]),
+        "prev_fast": float(fast[-2]),
+        "prev_slow": float(slow[-2]),
+    }
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    """Float division with pandas' results for a zero denominator."""
+    if denominator == 0:
+        return math.nan if numerator == 0 else math.copysign(math.inf, numerator)
+    return numerator / denominator
+
+
+# (index label, high, low, close, volume) of one bar.
+_VwapBar = Tuple[Hashable, float, float, float, float]
+
+
+def _vwap_bar(df: pd.DataFrame, i: int) -> _VwapBar:
+    return (
+        df.index[i],
+        float(df["high"].iat[i]),
+        float(df["low"].iat[i]),
+        float(df["close"].iat[i]),
+        float(df["volume"].iat[i]),
+    )
+
+
+def _price_volume(bar: _VwapBar) -> float:
+    _, high, low, close, volume = bar
+    return (high + low + close) / 3 * volume
+
+
+class VwapSignalState:
+    """
+    Indicator state carried between ``compute_signals`` calls.
+
+    A frame that extends the previously seen one by a single bar (growing, or
+    sliding by one bar at a fixed length) updates the running VWAP sums, the
+    SMA windows and the RSI averages in O(1); anything else re-seeds from the
+    whole frame. As with ``MultiTfSignalState``, the RSI keeps its history
+    across a sliding fetch window. The VWAP sums drop the bar that left the
+    window and are re-seeded once per window length to bound rounding drift.
+    """
+
+    def __init__(self) -> None:
+        self._last: Optional[_VwapBar] = None
+        self._first: Optional[_VwapBar] = None
+        self._second_index: Hashable = None
+        self._length = 0
+        self._slides = 0
+        self._closes: Deque[float] = deque(maxlen=30)
+        self._cum_pv = 0.0
+        self._cum_v = 0.0
+        self._avg_gain = math.nan
+        self._avg_loss = math.nan
+        self._values: Dict[str, float] = {}
+
+    def values(self, df: pd.DataFrame) -> Dict[str, float]:
+        """``compute_signals``' indicator values as of the last bar of ``df``."""
+        bar = _vwap_bar(df, -1)
+        last = self._last
+        if last is not None:
+            if len(df) == self._length and same_bar(last, bar):
+                return self._values
+            if same_bar(last, _vwap_bar(df, -2)) and self._advance(df, bar):
+                return self._values
+        self._seed(df)
+        return self._values
+
+    def _seed(self, df: pd.DataFrame) -> None:
+        closes = df["close"].astype(np.float64, copy=False)
+        avg_gain, avg_loss = rsi_ema_components(closes, 14)
+        pv = (df["high"] + df["low"] + df["close"]) / 3 * df["volume"]
+        self._cum_pv = float(pv.cumsum().iat[-1])
+        self._cum_v = float(df["volume"].cumsum().iat[-1])
+        self._avg_gain = float(avg_gain.iat[-1])
+        self._avg_loss = float(avg_loss.iat[-1])
+        self._closes.clear()
+        self._closes.extend(closes.iloc[-30:].tolist())
+        self._values = _frame_values(df)
+        self._remember(df, _vwap_bar(df, -1))
+        self._slides = 0
+
+    def _remember(self, df: pd.DataFrame, bar: _VwapBar) -> None:
+        self._last = bar
+        self._first = _vwap_bar(df, 0)
+        self._second_index = df.index[1]
+        self._length = len(df)
+
+    def _advance(self, df: pd.DataFrame, bar: _VwapBar) -> bool:
+        first = self._first
+        assert first is not None
+        if len(df) == self._length + 1 and df.index[0] == first[0]:
+            dropped = None
+        elif len(df) == self._length and df.index[0] == self._second_index:
+            if self._slides + 1 >= len(df):
+                return False
+            dropped = first
+        else:
+            return False
+        prev_close = self._closes[-1]
+        close = bar[3]
+        if not all_finite(*bar[1:], prev_close, self._avg_gain, self._avg_loss):
+            return False
+
+        self._cum_pv += _price_volume(bar)
+        self._cum_v += bar[4]
+        if dropped is not None:
+            self._cum_pv -= _price_volume(dropped)
+            self._cum_v -= dropped[4]
+            self._slides += 1
+
+        delta = close - prev_close
+        self._avg_gain = ewm_step(self._avg_gain, max(delta, 0.0), 1 / 14)
+        self._avg_loss = ewm_step(self._avg_loss, max(-delta, 0.0), 1 / 14)
+        closes = self._closes
+        closes.append(close)
+        values = self._values
+        values["prev_fast"] = values["fast"]
+        values["prev_slow"] = values["slow"]
+        values["fast"] = sum(itertools.islice(closes, 20, 30)) / 10
+        values["slow"] = sum(closes) / 30
+        values["price"] = close
+        values["vwap"] = _divide(self._cum_pv, self._cum_v)
+        values["rsi"] = rsi_from_averages(self._avg_gain, self._avg_loss)
+        self._remember(df, bar)
+        return True
+
+
+def compute_signals(
+    df: pd.DataFrame, state: Optional[VwapSignalState] = None
+) -> Dict[str, float | bool]:
+    """
+    Long entry signal for the last bar of ``df``.
+
+    Pass the same ``state`` on every call for a bar-by-bar feed to update the
+    indicators incrementally instead of recomputing them over the frame.
+    """
+    if len(df) < MIN_BARS:
+        return _nan_signals()
+    values = state.values(df) if state is not None else _frame_values(df)
+    price = values["price"]
+    rsi_value = values["rsi"]
+    long_signal = (
+        values["prev_fast"] < values["prev_slow"]
+        and values["fast"] > values["slow"]
+        and price > values["vwap"]
+        and 30 < rsi_value < 65
+    )
+    return {"long_signal": bool(long_signal), **values}
+
+
+def compute_signals_batch(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    ``compute_signals`` for every bar of ``df`` at once.
+
+    Row ``i`` equals ``compute_signals(df.iloc[: i + 1])``: the indicators are
+    causal, so one pass over the whole frame serves a bar-by-bar backtest.
+    Rows before ``MIN_BARS`` bars carry NaN values and no signal.
+    """
+    closes = df["close"].astype(np.float64, copy=False)
+    fast = sma(closes, 10).to_numpy()
+    slow = sma(closes, 30).to_numpy()
+    vwap_values = vwap(df).to_numpy(dtype=np.float64)
+    rsi_values = rsi_ema(closes, 14).to_numpy()
+    price = closes.to_numpy()
+    prev_fast = np.concatenate(([np.nan], fast[:-1]))
+    prev_slow = np.concatenate(([np.nan], slow[:-1]))
+
+    with np.errstate(invalid="ignore"):
+        long_signal = (
+            (prev_fast < prev_slow)
+            & (fast > slow)
+            & (price > vwap_values)
+            & (rsi_values > 30)
+            & (rsi_values < 65)
+        )
+    signals = pd.DataFrame(
+        {
+            "long_signal": long_signal,
+            "price": price,
+            "fast": fast,
+            "slow": slow,
+            "vwap": vwap_values,
+            "rsi": rsi_values,
+            "prev_fast": prev_fast,
+            "prev_slow": prev_slow,
+        },
+        index=df.index,
+    )
+    warmup = min(MIN_BARS - 1, len(df))
+    signals.iloc[:warmup, 1:] = np.nan
+    signals.iloc[:warmup, 0] = False
+    return signals
@@ -145,10 +145,11 @@ class BreakoutVolumeStrategy(IStrategy):
         highs = np.array(self.highs[-(n + 1):])
         lows = np.array(self.lows[-(n + 1):])
         closes = np.array(self.prices[-(n + 1):])
-        tr1 = highs[1:] - lows[1:]
-        tr2 = np.abs(highs[1:] - closes[:-1])
-        tr3 = np.abs(lows[1:] - closes[:-1])
-        tr = np.maximum.reduce([tr1, tr2, tr3])
+        tr = highs[1:] - lows[1:]
+        gap = np.abs(highs[1:] - closes[:-1])
+        np.maximum(tr, gap, out=tr)
+        np.subtract(lows[1:], closes[:-1], out=gap)
+        np.maximum(tr, np.abs(gap, out=gap), out=tr)
         return float(pd.Series(tr).rolling(n).mean().iloc[-1])
 
     def _market_order(
@@ -177,10 +177,11 @@ class DualMACrossoverStrategy(IStrategy):
         plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
         minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
 
-        tr1 = highs[1:] - lows[1:]
-        tr2 = np.abs(highs[1:] - closes[:-1])
-        tr3 = np.abs(lows[1:] - closes[:-1])
-        tr = np.maximum.reduce([tr1, tr2, tr3])
+        tr = highs[1:] - lows[1:]
+        gap = np.abs(highs[1:] - closes[:-1])
+        np.maximum(tr, gap, out=tr)
+        np.subtract(lows[1:], closes[:-1], out=gap)
+        np.maximum(tr, np.abs(gap, out=gap), out=tr)
 
         atr = float(np.mean(tr))
         if atr == 0:
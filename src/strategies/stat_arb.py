@@ -1,10 +1,10 @@
+import itertools
 import logging
+import math
 import uuid
 from collections import deque
 from typing import Deque, Dict, List, Tuple
 
-import numpy as np
-
 from src.domain.entities import MarketData, Order, OrderType, Side
 from src.domain.interfaces import IStrategy
 
@@ -32,18 +32,36 @@ class StatisticalArbitrageStrategy(IStrategy):
         self.spread_state: int = (
             0  # 0 = flat, 1 = long spread (long A short B), -1 = short spread
         )
+        self._neg_threshold = -z_score_threshold
+        # Log spread of the two legs, one sample each time both legs have
+        # updated since the last one, with a sliding Welford mean / sum of
+        # squared deviations.
+        self._fresh: Dict[str, bool] = {s: False for s in symbol_pair}
+        self._spreads: Deque[float] = deque(maxlen=lookback)
+        self._spread_mean = 0.0
+        self._spread_m2 = 0.0
+        # Order ids: a per-instance random prefix plus a counter.
+        self._id_prefix = uuid.uuid4().hex[:8]
+        self._id_ctr = itertools.count()
 
     async def on_tick(self, market_data: MarketData) -> List[Order]:
         if market_data.symbol not in self.symbol_pair:
             return []
 
         self.prices[market_data.symbol].append(market_data.close)
-        if any(len(self.prices[s]) < self.lookback for s in self.symbol_pair):
+        fresh = self._fresh
+        fresh[market_data.symbol] = True
+        a, b = self.symbol_pair
+        if not (fresh[a] and fresh[b]):
+            return []
+        fresh[a] = fresh[b] = False
+        spread = math.log(self.prices[a][-1]) - math.log(self.prices[b][-1])
+        self._push_spread(spread)
+        if len(self._spreads) < self.lookback:
             return []
 
-        a, b = self.symbol_pair
-        spread = self._spread_series()
-        z_score = self._zscore(spread)
+        std = math.sqrt(max(self._spread_m2, 0.0) / self.lookback)
+        z_score = (spread - self._spread_mean) / std if std > 0 else 0.0
 
         orders: List[Order] = []
         if self.spread_state == 0:
@@ -56,7 +74,7 @@ class StatisticalArbitrageStrategy(IStrategy):
                 )
                 self.spread_state = -1
                 logger.info("StatArb opening SHORT spread %s/%s z=%.2f", a, b, z_score)
-            elif z_score < -self.z_score_threshold:
+            elif z_score < self._neg_threshold:
                 # Long A, Short B
                 orders.extend(
                     self._build_pair_orders(
@@ -79,23 +97,27 @@ class StatisticalArbitrageStrategy(IStrategy):
     async def on_order_update(self, order: Order):
         return None
 
-    def _spread_series(self) -> np.ndarray:
-        a, b = self.symbol_pair
-        return np.log(np.array(self.prices[a])) - np.log(np.array(self.prices[b]))
-
-    def _zscore(self, series: np.ndarray) -> float:
-        if series.size < 2:
-            return 0.0
-        mean = series.mean()
-        std = series.std()
-        return float((series[-1] - mean) / std) if std > 0 else 0.0
+    def _push_spread(self, spread: float) -> None:
+        spreads = self._spreads
+        mean = self._spread_mean
+        if len(spreads) == self.lookback:
+            evicted = spreads[0]
+            spreads.append(spread)
+            self._spread_mean = mean + (spread - evicted) / self.lookback
+            self._spread_m2 += (spread - evicted) * (
+                spread - self._spread_mean + evicted - mean
+            )
+        else:
+            spreads.append(spread)
+            self._spread_mean = mean + (spread - mean) / len(spreads)
+            self._spread_m2 += (spread - mean) * (spread - self._spread_mean)
 
     def _build_pair_orders(
         self, short_symbol: str, long_symbol: str, qty: float, price: float
     ) -> List[Order]:
         return [
             Order(
-                id=str(uuid.uuid4()),
+                id=f"{self._id_prefix}{next(self._id_ctr):x}",
                 symbol=long_symbol,
                 side=Side.BUY,
                 order_type=OrderType.MARKET,
@@ -104,7 +126,7 @@ class StatisticalArbitrageStrategy(IStrategy):
                 metadata={"tick_price": price},
             ),
             Order(
-                id=str(uuid.uuid4()),
+                id=f"{self._id_prefix}{next(self._id_ctr):x}",
                 symbol=short_symbol,
                 side=Side.SELL,
                 order_type=OrderType.MARKET,
@@ -1,9 +1,9 @@
+import itertools
 import logging
+import math
 import uuid
-from typing import List, Optional
-
-import numpy as np
-import pandas as pd
+from collections import deque
+from typing import Deque, List, Optional
 
 from src.domain.entities import MarketData, Order, OrderType, Side
 from src.domain.interfaces import IStrategy
@@ -23,30 +23,32 @@ class VolatilityBreakoutStrategy(IStrategy):
         self.lookback = lookback
         self.k = k
         self.atr_window = atr_window
-        self.prices: List[float] = []
-        self.highs: List[float] = []
-        self.lows: List[float] = []
         self.current_position: Optional[Side] = None
+        # Running Bollinger statistics over the last ``lookback`` closes
+        # (sliding Welford mean / sum of squared deviations).
+        self._band_window: Deque[float] = deque(maxlen=lookback)
+        self._band_mean = 0.0
+        self._band_m2 = 0.0
+        # Running sum of the last ``atr_window`` true ranges.
+        self._true_ranges: Deque[float] = deque(maxlen=atr_window)
+        self._tr_sum = 0.0
+        self._prev_close: Optional[float] = None
+        # Order ids: a per-instance random prefix plus a counter.
+        self._id_prefix = uuid.uuid4().hex[:8]
+        self._id_ctr = itertools.count()
 
     async def on_tick(self, market_data: MarketData) -> List[Order]:
         if market_data.symbol != self.symbol:
             return []
 
-        self.prices.append(market_data.close)
-        self.highs.append(market_data.high)
-        self.lows.append(market_data.low)
-
-        if len(self.prices) > max(self.lookback + 2, self.atr_window + 2):
-            self.prices.pop(0)
-            self.highs.pop(0)
-            self.lows.pop(0)
+        self._update_bands(market_data.close)
+        self._update_true_range(market_data.high, market_data.low, market_data.close)
 
-        if len(self.prices) < self.lookback:
+        if len(self._band_window) < self.lookback:
             return []
 
-        series = pd.Series(self.prices)
-        sma = series.rolling(window=self.lookback).mean().iloc[-1]
-        std = series.rolling(window=self.lookback).std(ddof=0).iloc[-1]
+        sma = self._band_mean
+        std = math.sqrt(max(self._band_m2, 0.0) / self.lookback)
         upper_band = sma + self.k * std
         lower_band = sma - self.k * std
 
@@ -95,21 +97,40 @@ class VolatilityBreakoutStrategy(IStrategy):
     async def on_order_update(self, order: Order):
         return None
 
+    def _update_bands(self, close: float) -> None:
+        window = self._band_window
+        mean = self._band_mean
+        if len(window) == self.lookback:
+            evicted = window[0]
+            window.append(close)
+            self._band_mean = mean + (close - evicted) / self.lookback
+            self._band_m2 += (close - evicted) * (
+                close - self._band_mean + evicted - mean
+            )
+        else:
+            window.append(close)
+            self._band_mean = mean + (close - mean) / len(window)
+            self._band_m2 += (close - mean) * (close - self._band_mean)
+
+    def _update_true_range(self, high: float, low: float, close: float) -> None:
+        prev_close = self._prev_close
+        self._prev_close = close
+        if prev_close is None:
+            return
+        tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        if len(self._true_ranges) == self.atr_window:
+            self._tr_sum -= self._true_ranges[0]
+        self._true_ranges.append(tr)
+        self._tr_sum += tr
+
     def _atr(self) -> float:
-        if len(self.prices) < self.atr_window + 1:
+        if len(self._true_ranges) < self.atr_window:
             return 0.0
-        highs = np.array(self.highs[-self.atr_window - 1 :])
-        lows = np.array(self.lows[-self.atr_window - 1 :])
-        closes = np.array(self.prices[-self.atr_window - 1 :])
-        tr1 = highs[1:] - lows[1:]
-        tr2 = np.abs(highs[1:] - closes[:-1])
-        tr3 = np.abs(lows[1:] - closes[:-1])
-        tr = np.maximum.reduce([tr1, tr2, tr3])
-        return float(pd.Series(tr).rolling(self.atr_window).mean().iloc[-1])
+        return self._tr_sum / self.atr_window
 
     def _market_order(self, side: Side, market_data: MarketData) -> Order:
         return Order(
-            id=str(uuid.uuid4()),
+            id=f"{self._id_prefix}{next(self._id_ctr):x}",
             symbol=self.symbol,
             side=side,
             order_type=OrderType.MARKET,
@@ -4,6 +4,7 @@ ladder entries, dual stops, and crisis mode.
 """
 
 import asyncio
+import dataclasses
 import json
 import logging
 from datetime import datetime, timezone
@@ -480,17 +481,17 @@ class TradingStrategy:
             # Component-based Strategy
             # 1. Regime Detection
             regime = self.signal_generator.detect_regime(
-                regime_data, self.config.strategy
+                regime_data, self.config.strategy, stream_id=symbol
             )
 
             # 2. Setup Detection
             setup = self.signal_generator.detect_setup(
-                setup_data, self.config.strategy
+                setup_data, self.config.strategy, stream_id=symbol
             )
 
             # 3. Signal Generation
             signals = self.signal_generator.generate_signals(
-                signal_data, self.config.strategy
+                signal_data, self.config.strategy, stream_id=symbol
             )
 
             # 4. Filter signals by regime and setup
@@ -543,7 +544,7 @@ class TradingStrategy:
                     symbol,
                 )
                 return
-            signal.timestamp = resolved
+            signal = dataclasses.replace(signal, timestamp=resolved)
         if self.data_stale_block_active:
             logger.warning(
                 "SAFETY_STALE_DATA: Blocking signal execution for %s due to stale data",
@@ -1,4 +1,5 @@
-from typing import Any, cast
+import math
+from typing import Any, Hashable, Tuple, cast
 
 import pandas as pd
 
@@ -12,13 +13,19 @@ def ema(series: pd.Series, n: int) -> pd.Series:
     return series.ewm(span=n, adjust=False, min_periods=n).mean()
 
 
-def rsi_ema(series: pd.Series, n: int = 14) -> pd.Series:
+def rsi_ema_components(series: pd.Series, n: int = 14) -> Tuple[pd.Series, pd.Series]:
+    """Smoothed average gain and loss series behind ``rsi_ema``."""
     delta = series.diff()
     delta_any = cast(Any, delta)
     gain = delta_any.where(delta_any > 0, 0.0)
     loss = -delta_any.where(delta_any < 0, 0.0)
     avg_gain = gain.ewm(alpha=1 / n, adjust=False).mean()
     avg_loss = loss.ewm(alpha=1 / n, adjust=False).mean()
+    return avg_gain, avg_loss
+
+
+def rsi_ema(series: pd.Series, n: int = 14) -> pd.Series:
+    avg_gain, avg_loss = rsi_ema_components(series, n)
     rs = avg_gain / avg_loss
     rsi = 100 - (100 / (1 + rs))
     return rsi
@@ -44,3 +51,29 @@ def atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     """Average True Range using Wilder's smoothing via EMA."""
     tr = true_range(df)
     return tr.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+
+
+def ewm_step(prev: float, x: float, alpha: float) -> float:
+    """One ``ewm(adjust=False)`` step in pandas' update order."""
+    if prev == x:
+        return prev
+    decay = 1.0 - alpha
+    return (decay * prev + alpha * x) / (decay + alpha)
+
+
+def rsi_from_averages(avg_gain: float, avg_loss: float) -> float:
+    """``rsi_ema``'s final formula, with pandas' division-by-zero results."""
+    if avg_loss == 0:
+        return math.nan if avg_gain == 0 else 100.0
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def all_finite(*values: float) -> bool:
+    return all(math.isfinite(v) for v in values)
+
+
+def same_bar(a: Tuple[Hashable, ...], b: Tuple[Hashable, ...]) -> bool:
+    """Bar equality that treats NaN prices as equal to each other."""
+    return a[0] == b[0] and all(
+        x == y or (x != x and y != y) for x, y in zip(a[1:], b[1:], strict=True)
+    )
@@ -0,0 +1,51 @@
+"""
+JSON encode/decode helpers backed by orjson when it is installed.
+
+orjson works on ``bytes`` directly and understands NumPy scalars/arrays;
+without it we fall back to the stdlib ``json`` module with identical
+call signatures so callers never need to branch.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Type
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+ORJSON_AVAILABLE = orjson is not None
+
+JSONDecodeError: Type[ValueError]
+if orjson is not None:
+    JSONDecodeError = orjson.JSONDecodeError
+    # Non-str keys are stringified to match ``json.dumps`` behaviour.
+    _DUMPS_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    _PRETTY_OPTIONS = _DUMPS_OPTIONS | orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+else:  # pragma: no cover - optional dependency
+    JSONDecodeError = json.JSONDecodeError
+    _DUMPS_OPTIONS = 0
+    _PRETTY_OPTIONS = 0
+
+
+def dumps(obj: Any, *, pretty: bool = False) -> bytes:
+    """Serialise ``obj`` to UTF-8 encoded JSON bytes.
+
+    ``pretty`` emits sorted keys with two-space indentation, for state files
+    meant to be read by humans.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=_PRETTY_OPTIONS if pretty else _DUMPS_OPTIONS)
+    if pretty:  # pragma: no cover - optional dependency
+        return json.dumps(obj, indent=2, sort_keys=True).encode("utf-8")
+    # Compact separators, matching orjson's output.
+    return json.dumps(obj, separators=(",", ":")).encode()  # pragma: no cover
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """Parse JSON from ``bytes`` or ``str`` without an intermediate decode."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)  # pragma: no cover - optional dependency
@@ -1,3 +1,6 @@
+import json
+import threading
+
 from src.state.daily_pnl_store import DailyPnlStore
 
 
@@ -11,6 +14,7 @@ def test_daily_pnl_store_persists_and_accumulates(tmp_path):
     total = store.update_pnl("acct1", "2025-01-01", 10.0)
     assert total == -40.0
 
+    store.flush()
     reloaded = DailyPnlStore(str(path))
     assert reloaded.get_pnl("acct1", "2025-01-01") == -40.0
 
@@ -19,3 +23,60 @@ def test_daily_pnl_store_defaults(tmp_path):
     path = tmp_path / "missing.json"
     store = DailyPnlStore(str(path))
     assert store.get_pnl("acct2", "2025-02-01") == 0.0
+
+
+def test_daily_pnl_store_coalesces_writes(tmp_path):
+    path = tmp_path / "pnl.json"
+    store = DailyPnlStore(str(path), flush_interval_s=3600.0)
+
+    store.update_pnl("acct1", "2025-01-01", 5.0)  # first update writes through
+    store.update_pnl("acct1", "2025-01-01", 5.0)
+    on_disk = json.loads(path.read_text())
+    assert on_disk["accounts"]["acct1"]["2025-01-01"]["realized_pnl_usd"] == 5.0
+
+    store.close()
+    on_disk = json.loads(path.read_text())
+    assert on_disk["accounts"]["acct1"]["2025-01-01"]["realized_pnl_usd"] == 10.0
+
+
+def test_daily_pnl_store_writes_losses_through(tmp_path):
+    path = tmp_path / "pnl.json"
+    store = DailyPnlStore(str(path), flush_interval_s=3600.0)
+
+    store.update_pnl("acct1", "2025-01-01", 5.0)
+    store.update_pnl("acct1", "2025-01-01", -20.0)
+
+    on_disk = json.loads(path.read_text())
+    assert on_disk["accounts"]["acct1"]["2025-01-01"]["realized_pnl_usd"] == -15.0
+    store.close()
+
+
+def test_daily_pnl_store_flushes_pending_update_after_interval(tmp_path):
+    path = tmp_path / "pnl.json"
+    store = DailyPnlStore(str(path), flush_interval_s=0.05)
+
+    store.update_pnl("acct1", "2025-01-01", 1.0)
+    store.update_pnl("acct1", "2025-01-01", 2.0)
+    timer = store._timer
+    assert timer is not None
+    timer.join(timeout=2)
+
+    on_disk = json.loads(path.read_text())
+    assert on_disk["accounts"]["acct1"]["2025-01-01"]["realized_pnl_usd"] == 3.0
+    store.close()
+
+
+def test_daily_pnl_store_concurrent_updates(tmp_path):
+    store = DailyPnlStore(str(tmp_path / "pnl.json"), flush_interval_s=3600.0)
+
+    def worker():
+        for _ in range(500):
+            store.update_pnl("acct1", "2025-01-01", 1.0)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert store.get_pnl("acct1", "2025-01-01") == 2000.0
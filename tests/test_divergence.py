@@ -45,6 +45,8 @@ class TestDivergence(unittest.TestCase):
         # Result: Regular Bullish.
 
         self.assertTrue(results["regular_bullish"])
+        self.assertTrue(results["bullish"])
+        self.assertFalse(results["bearish"])
         self.assertFalse(
             results["regular_bearish"]
         )  # Highs are 100, 105, 110, 115 (Higher), Ind 50, 60, 70, 80 (Higher). No div.
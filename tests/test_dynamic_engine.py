@@ -10,7 +10,10 @@ import pytest
 # Add repo root to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from src.strategies.dynamic_engine import DynamicStrategyEngine  # noqa: E402
+from src.strategies.dynamic_engine import (  # noqa: E402
+    DynamicStrategyEngine,
+    IndicatorLibrary,
+)
 
 
 @pytest.mark.asyncio
@@ -61,5 +64,270 @@ async def test_engine():
     assert "pnl" in result
 
 
+def test_ema_matches_recurrence():
+    values = np.random.default_rng(7).normal(100, 2, 500)
+    alpha = 2 / (14 + 1)
+    expected = np.empty_like(values)
+    expected[0] = values[0]
+    for i in range(1, len(values)):
+        expected[i] = alpha * values[i] + (1 - alpha) * expected[i - 1]
+
+    np.testing.assert_allclose(IndicatorLibrary._ema(values, 14), expected)
+    np.testing.assert_allclose(
+        IndicatorLibrary._ema(np.arange(5), 3), [0.0, 0.5, 1.25, 2.125, 3.0625]
+    )
+
+
+def test_rsi_matches_ema_of_gains_and_losses():
+    close = np.random.default_rng(3).normal(100, 2, 300)
+    delta = np.diff(close, prepend=close[0])
+    avg_gain = IndicatorLibrary._ema(np.where(delta > 0, delta, 0.0), 14)
+    avg_loss = IndicatorLibrary._ema(np.where(delta < 0, -delta, 0.0), 14)
+    rs = np.divide(avg_gain, avg_loss, out=np.zeros_like(avg_gain), where=avg_loss != 0)
+
+    rsi = IndicatorLibrary().rsi(pl.Series(close), 14).to_numpy()
+
+    np.testing.assert_allclose(rsi, 100 - 100 / (1 + rs))
+
+
+def test_divergence_marks_latest_pivot():
+    price = pl.Series([1.0, 2.0, 5.0, 2.0, 1.0, 2.0, 6.0, 2.0, 1.0])
+    indicator = pl.Series([1.0, 2.0, 9.0, 2.0, 1.0, 2.0, 7.0, 2.0, 1.0])
+
+    states = IndicatorLibrary().divergence(price, indicator, lookback=2).to_list()
+
+    assert states[6] == "bearish"
+    assert states.count("none") == len(states) - 1
+
+
+@pytest.mark.asyncio
+async def test_threshold_sweep_reuses_indicator_frames(monkeypatch):
+    engine = DynamicStrategyEngine()
+    dates = pl.datetime_range(
+        start=datetime(2023, 1, 1),
+        end=datetime(2023, 1, 1, 12),
+        interval="5m",
+        eager=True,
+    )
+    close = 100 + np.sin(np.arange(len(dates)) / 5)
+    df = pl.DataFrame(
+        {
+            "timestamp": dates,
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": np.full(len(dates), 100.0),
+        }
+    )
+    calls = []
+    original = engine._indicator_frame
+
+    def counting(frame, trigger):
+        calls.append(trigger["indicator"])
+        return original(frame, trigger)
+
+    monkeypatch.setattr(engine, "_indicator_frame", counting)
+    strategy = {"triggers": [{"indicator": "rsi", "timeframe": "5m", "operator": "<"}]}
+
+    result = await engine.run_backtest(
+        strategy,
+        "BTC/USDT",
+        "2023-01-01",
+        "2023-01-02",
+        optimization={"trigger_index": 0, "start": 30, "end": 70, "step": 10},
+        data=df,
+    )
+
+    assert len(result["optimization"]["grid"]) == 5
+    assert calls == ["rsi"]
+
+
+def test_resampled_frames_are_reused_for_the_same_base(monkeypatch):
+    engine = DynamicStrategyEngine(base_timeframe="5m")
+    dates = pl.datetime_range(
+        start=datetime(2023, 1, 1),
+        end=datetime(2023, 1, 1, 12),
+        interval="5m",
+        eager=True,
+    )
+    close = 100 + np.sin(np.arange(len(dates)) / 5)
+    df = pl.DataFrame(
+        {
+            "timestamp": dates,
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": np.full(len(dates), 100.0),
+        }
+    )
+    calls = []
+    original = engine.resample
+
+    def counting(frame, timeframe):
+        calls.append(timeframe)
+        return original(frame, timeframe)
+
+    monkeypatch.setattr(engine, "resample", counting)
+    triggers = [{"indicator": "rsi", "timeframe": "1h", "operator": "<", "value": 50}]
+
+    first = engine._evaluate_triggers(df, triggers)
+    second = engine._evaluate_triggers(df, triggers)
+    engine._evaluate_triggers(df.clone(), triggers)
+
+    assert first.equals(second)
+    assert calls == ["1h", "1h"]
+
+
+def test_condition_expressions():
+    engine = DynamicStrategyEngine()
+    frame = pl.DataFrame({"value": [10.0, 40.0, 60.0, 55.0, 20.0]})
+
+    def evaluate(trigger):
+        cond = engine._condition_series(frame, trigger)
+        return frame.with_columns(cond.alias("hit"))["hit"].to_list()
+
+    assert evaluate({"operator": "crosses_up", "value": 50}) == [
+        False,
+        False,
+        True,
+        False,
+        False,
+    ]
+    assert evaluate({"operator": ">=", "value": 55}) == [
+        False,
+        False,
+        True,
+        True,
+        False,
+    ]
+    assert evaluate({"operator": "<", "value": "n/a"}) == [False] * 5
+    assert evaluate({"operator": "==", "value": 55}) == [
+        False,
+        False,
+        False,
+        True,
+        False,
+    ]
+    assert evaluate({"operator": "==", "value": "GREEN"}) == [False] * 5
+
+
+def test_ema_ribbon_state_labels():
+    engine = DynamicStrategyEngine()
+    close = np.concatenate([np.linspace(100, 120, 30), np.linspace(120, 90, 30)])
+    df = pl.DataFrame(
+        {
+            "timestamp": pl.datetime_range(
+                start=datetime(2023, 1, 1),
+                end=datetime(2023, 1, 1, 0, 59),
+                interval="1m",
+                eager=True,
+            ),
+            "close": close,
+        }
+    )
+
+    frame = engine._indicator_frame(
+        df, {"indicator": "ema_ribbon", "params": {"periods": [3, 8]}}
+    )
+
+    assert frame["state"].dtype == pl.Utf8
+    assert frame["state"][0] == "neutral"
+    assert frame["state"][29] == "above"
+    assert frame["state"][-1] == "below"
+
+
+def test_wavetrend_wt2_is_backfilled_four_bar_mean():
+    rng = np.random.default_rng(11)
+    close = 100 + np.cumsum(rng.normal(0, 1, 400))
+    df = pl.DataFrame(
+        {"high": close + 0.5, "low": close - 0.5, "close": close, "volume": close}
+    )
+
+    wt = IndicatorLibrary().wavetrend_cipher_b(df)
+
+    expected = (
+        wt["wt1"].rolling_mean(window_size=4).fill_null(strategy="backward").to_numpy()
+    )
+    np.testing.assert_allclose(wt["wt2"].to_numpy(), expected, rtol=1e-9)
+    np.testing.assert_allclose(wt["diff"].to_numpy(), wt["wt1"] - wt["wt2"])
+    assert wt["dot"].dtype == pl.Utf8
+    assert set(wt["dot"].to_list()) <= {"NONE", "GREEN", "RED"}
+
+
+def test_max_drawdown_matches_running_peak():
+    from src import _indicators_nb as nb
+
+    equity = 1000 + np.cumsum(np.random.default_rng(5).normal(0, 10, 500))
+    peaks = np.maximum.accumulate(equity)
+
+    assert nb.max_drawdown(equity) == pytest.approx(((peaks - equity) / peaks).max())
+    assert nb.max_drawdown(np.empty(0)) == 0.0
+
+
+class _FakeExchange:
+    def __init__(self, rows, max_batch=None):
+        self.rows = rows
+        self.max_batch = max_batch
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        if self.max_batch is not None:
+            limit = min(limit, self.max_batch)
+        return [row for row in self.rows if row[0] >= since][:limit]
+
+
+@pytest.mark.asyncio
+async def test_fetch_data_pages_windows_concurrently():
+    start = datetime(2023, 1, 1)
+    start_ms = int(start.timestamp() * 1000)
+    rows = [[start_ms + i * 60_000, 1.0, 2.0, 0.5, 1.5, 10.0] for i in range(500)]
+    engine = DynamicStrategyEngine(exchange_client=_FakeExchange(rows, max_batch=30))
+
+    df = await engine.fetch_data(
+        "BTC/USDT", "1m", start, datetime(2023, 1, 1, 8, 19), limit=100
+    )
+
+    assert df.height == 500
+    assert df["timestamp"].is_sorted()
+    assert df["timestamp"].n_unique() == 500
+
+
+@pytest.mark.asyncio
+async def test_walk_forward_evaluates_every_combination():
+    start_ms = int(datetime(2023, 1, 1).timestamp() * 1000)
+    rows = []
+    for i in range(288):
+        price = 100 + 2 * np.sin(i / 6)
+        rows.append([start_ms + i * 300_000, price, price + 1, price - 1, price, 10])
+    engine = DynamicStrategyEngine(exchange_client=_FakeExchange(rows))
+    template = {
+        "triggers": [
+            {"indicator": "rsi", "timeframe": "5m", "operator": "<", "value": 50}
+        ]
+    }
+
+    result = await engine.walk_forward_optimization(
+        template,
+        "BTC/USDT",
+        "2023-01-01T00:00:00",
+        "2023-01-01T23:55:00",
+        {"rsi_period": [7, 14], "rsi_threshold": [30, 50, 70]},
+    )
+
+    combos = sorted(
+        (r["params"]["rsi_period"], r["params"]["rsi_threshold"])
+        for r in result["all_results"]
+    )
+    assert combos == [(7, 30), (7, 50), (7, 70), (14, 30), (14, 50), (14, 70)]
+    assert template["triggers"][0] == {
+        "indicator": "rsi",
+        "timeframe": "5m",
+        "operator": "<",
+        "value": 50,
+    }
+    assert result["best_pnl"] == max(r["pnl"] for r in result["all_results"])
+
+
 if __name__ == "__main__":
     asyncio.run(test_engine())
@@ -2,7 +2,7 @@
 import pytest
 import pandas as pd
 import numpy as np
-from src.indicators import TechnicalIndicators
+from src.indicators import IncrementalIndicators, TechnicalIndicators
 
 @pytest.fixture
 def sample_data():
@@ -147,3 +147,135 @@ def test_detect_divergence(close_series):
     # Just check structure, getting exact divergence with synthetic data is tricky without careful crafting
     assert "regular_bearish" in divs
     assert "regular_bullish" in divs
+
+def test_compiled_kernels_match_pandas(sample_data):
+    from scipy.signal import argrelextrema
+
+    from src import _indicators_nb as nb
+
+    high = sample_data["high"].to_numpy(dtype=float)
+    low = sample_data["low"].to_numpy(dtype=float)
+    close = sample_data["close"].to_numpy(dtype=float)
+    close[30] = np.nan  # gaps must propagate like pandas
+    series = pd.Series(close)
+
+    np.testing.assert_allclose(
+        nb.ema(close, 10), series.ewm(span=10, adjust=False).mean(), equal_nan=True
+    )
+    np.testing.assert_allclose(
+        nb.rolling_std(close, 20), series.rolling(20).std(), equal_nan=True
+    )
+    np.testing.assert_allclose(
+        nb.rolling_max(close, 20), series.rolling(20).max(), equal_nan=True
+    )
+    np.testing.assert_allclose(
+        nb.rolling_min(close, 20), series.rolling(20).min(), equal_nan=True
+    )
+
+    delta = series.diff()
+    gain = delta.where(delta > 0, 0).rolling(14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    np.testing.assert_allclose(
+        nb.rsi(close, 14), 100 - 100 / (1 + gain / loss), equal_nan=True
+    )
+
+    frame = pd.DataFrame({"high": high, "low": low, "close": close})
+    tr = pd.concat(
+        [
+            frame["high"] - frame["low"],
+            (frame["high"] - frame["close"].shift()).abs(),
+            (frame["low"] - frame["close"].shift()).abs(),
+        ],
+        axis=1,
+    ).max(axis=1)
+    np.testing.assert_allclose(
+        nb.atr(high, low, close, 14), tr.rolling(14).mean(), equal_nan=True
+    )
+
+    clean = sample_data["close"].to_numpy(dtype=float)
+    for order in (1, 3):
+        assert nb.pivots(clean, order, 1).tolist() == (
+            argrelextrema(clean, np.greater, order=order)[0].tolist()
+        )
+        assert nb.pivots(clean, order, -1).tolist() == (
+            argrelextrema(clean, np.less, order=order)[0].tolist()
+        )
+
+
+def test_incremental_indicators_match_full_recompute(sample_data):
+    inc = IncrementalIndicators(
+        emas=(21,),
+        rsi_period=14,
+        atr_period=14,
+        adx_period=14,
+        donchian_period=20,
+        bollinger=(20, 2.0),
+    )
+    for end in range(60, len(sample_data) + 1):
+        window = sample_data.iloc[end - 60 : end]
+        values = inc.advance(window)
+
+    upper, middle, lower = TechnicalIndicators.bollinger_bands(window["close"], 20, 2.0)
+    high, low = TechnicalIndicators.donchian_channels(window, 20)
+    expected = {
+        "rsi": TechnicalIndicators.rsi(window["close"], 14).iloc[-1],
+        "atr": TechnicalIndicators.atr(window, 14).iloc[-1],
+        "adx": TechnicalIndicators.adx(window, 14).iloc[-1],
+        "donchian_high": high.iloc[-1],
+        "donchian_low": low.iloc[-1],
+        "bb_upper": upper.iloc[-1],
+        "bb_middle": middle.iloc[-1],
+        "bb_lower": lower.iloc[-1],
+    }
+    for key, value in expected.items():
+        assert values[key] == pytest.approx(value, nan_ok=True), key
+    # EMAs carry state across windows, so compare against the full history
+    assert values["ema_21"] == pytest.approx(
+        TechnicalIndicators.ema(sample_data["close"], 21).iloc[-1]
+    )
+
+def test_incremental_indicators_reseed_on_gap(sample_data):
+    inc = IncrementalIndicators(emas=(10,))
+    inc.advance(sample_data.iloc[:50])
+    values = inc.advance(sample_data.iloc[60:80])
+    assert values["ema_10"] == pytest.approx(
+        TechnicalIndicators.ema(sample_data["close"].iloc[60:80], 10).iloc[-1]
+    )
+
+def test_array_variants_match_series(sample_data):
+    high = sample_data["high"].to_numpy()
+    low = sample_data["low"].to_numpy()
+    close = sample_data["close"].to_numpy()
+
+    np.testing.assert_allclose(
+        TechnicalIndicators.ema_np(close, 10),
+        TechnicalIndicators.ema(sample_data["close"], 10),
+    )
+    for arr, series in zip(
+        TechnicalIndicators.macd_np(close),
+        TechnicalIndicators.macd(sample_data["close"]),
+        strict=True,
+    ):
+        np.testing.assert_allclose(arr, series)
+    for arr, series in zip(
+        TechnicalIndicators.bollinger_np(close, 20, 2.0),
+        TechnicalIndicators.bollinger_bands(sample_data["close"], 20, 2.0),
+        strict=True,
+    ):
+        np.testing.assert_allclose(arr, series, equal_nan=True)
+    np.testing.assert_allclose(
+        TechnicalIndicators.atr_np(high, low, close, 14),
+        TechnicalIndicators.atr(sample_data, 14),
+        equal_nan=True,
+    )
+    np.testing.assert_allclose(
+        TechnicalIndicators.adx_np(high, low, close, 14),
+        TechnicalIndicators.adx(sample_data, 14),
+        equal_nan=True,
+    )
+    for arr, series in zip(
+        TechnicalIndicators.donchian_np(high, low, 20),
+        TechnicalIndicators.donchian_channels(sample_data, 20),
+        strict=True,
+    ):
+        np.testing.assert_allclose(arr, series, equal_nan=True)
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+import numpy as np
+
+from src.domain.entities import MarketData
+from src.strategies.ml_skeleton import MLStrategy
+
+
+def _tick(price: float) -> MarketData:
+    return MarketData(
+        symbol="BTC/USDT",
+        timestamp=datetime(2024, 1, 1),
+        open=price,
+        high=price,
+        low=price,
+        close=price,
+        volume=1.0,
+    )
+
+
+async def test_features_use_latest_closes_after_wraparound():
+    strategy = MLStrategy(model_path="unused", lookback=12)
+    prices = 100 + np.cumsum(np.random.default_rng(3).normal(0, 1, 40))
+
+    for price in prices:
+        await strategy.on_tick(_tick(float(price)))
+
+    tail = prices[-11:]
+    returns = np.diff(tail) / tail[:-1]
+    np.testing.assert_allclose(
+        strategy._extract_features(),
+        [returns[-1], returns[-5:].sum(), returns.std()],
+    )
+
+
+async def test_no_orders_until_window_is_full():
+    strategy = MLStrategy(model_path="unused", lookback=5)
+
+    for price in (100.0, 101.0, 102.0, 103.0):
+        assert await strategy.on_tick(_tick(price)) == []
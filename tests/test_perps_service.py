@@ -1,4 +1,7 @@
+import asyncio
 import logging
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock
 
@@ -8,7 +11,9 @@ from src.alerts.base import AlertSink
 from src.config import CrisisModeConfig, PerpsConfig, TradingConfig
 from src.exchanges.zoomex_v3 import Precision
 from src.risk.risk_manager import RiskManager
+from src.services import perps as perps_module
 from src.services.perps import PerpsService
+from src.state.perps_state_store import save_perps_state
 
 
 @pytest.mark.asyncio
@@ -40,12 +45,14 @@ async def test_check_position_pnl_runs_when_flat_and_updates_tracker():
     )
 
     await service._check_position_pnl()
-    assert service.last_position_check_time is not None
+    assert service.last_position_check_monotonic is not None
     assert service.pnl_tracker.trade_history == []
 
-    service.last_position_check_time = datetime.now(timezone.utc) - timedelta(
-        minutes=10
-    )
+    # Within the 5-minute throttle window the exchange is not queried again.
+    await service._check_position_pnl()
+    assert client.get_closed_pnl.await_count == 1
+
+    service.last_position_check_monotonic -= 600
     service.equity_usdt = 1000.0
     await service._check_position_pnl()
 
@@ -55,6 +62,31 @@ async def test_check_position_pnl_runs_when_flat_and_updates_tracker():
     assert client.get_closed_pnl.await_count == 2
 
 
+@pytest.mark.asyncio
+async def test_check_position_pnl_advances_fetch_cursor():
+    config = PerpsConfig(enabled=True, symbol="SOLUSDT", interval="5")
+    client = AsyncMock()
+    trade_ms = int(datetime.now(timezone.utc).timestamp() * 1000) - 60_000
+    client.get_closed_pnl = AsyncMock(
+        side_effect=[
+            {"list": [{"closedPnl": "5.0", "createdTime": trade_ms}]},
+            {"list": [{"closedPnl": "5.0", "createdTime": trade_ms}]},
+        ]
+    )
+    service = PerpsService(config, client, trading_config=TradingConfig())
+
+    await service._check_position_pnl()
+    first_start = client.get_closed_pnl.await_args.kwargs["start_time"]
+    assert first_start < trade_ms - 23 * 3600 * 1000
+
+    service.last_position_check_monotonic -= 600
+    await service._check_position_pnl()
+
+    assert client.get_closed_pnl.await_args.kwargs["start_time"] == trade_ms - 300_000
+    # The overlapping row is fetched again but recorded only once.
+    assert len(service.pnl_tracker.trade_history) == 1
+
+
 def _build_service(perps_kwargs=None, alert_sink=None):
     config_kwargs = perps_kwargs or {}
     config = PerpsConfig(enabled=True, symbol="SOLUSDT", interval="5", **config_kwargs)
@@ -188,3 +220,93 @@ async def test_risk_manager_blocks_order_submission():
 
     assert client.create_market_with_brackets.await_count == 0
     assert risk_manager.total_open_risk == 0
+
+
+@pytest.mark.asyncio
+async def test_schedule_persist_coalesces_and_writes_off_loop(tmp_path):
+    state_file = tmp_path / "perps_state.json"
+    service = _build_service({"stateFile": str(state_file)})
+    service.pnl_tracker.consecutive_losses = 1
+
+    service._schedule_persist()
+    first_task = service._persist_task
+    service.pnl_tracker.consecutive_losses = 2
+    service._schedule_persist()
+    assert service._persist_task is first_task
+
+    await first_task
+    restored = _build_service({"stateFile": str(state_file)})
+    restored._load_persisted_state()
+    assert restored.pnl_tracker.consecutive_losses == 2
+
+
+@pytest.mark.asyncio
+async def test_schedule_persist_rewrites_updates_made_during_a_write(
+    tmp_path, monkeypatch
+):
+    state_file = tmp_path / "perps_state.json"
+    service = _build_service({"stateFile": str(state_file)})
+    monkeypatch.setattr(perps_module, "STATE_PERSIST_DEBOUNCE_SECONDS", 0.0)
+    writes = []
+
+    def save(path, state):
+        writes.append(state.consecutive_losses)
+        if len(writes) == 1:  # a trade lands while the first write runs
+            service.pnl_tracker.consecutive_losses = 2
+            loop.call_soon_threadsafe(service._schedule_persist)
+        save_perps_state(path, state)
+
+    loop = asyncio.get_running_loop()
+    monkeypatch.setattr(perps_module, "save_perps_state", save)
+    service.pnl_tracker.consecutive_losses = 1
+    service._schedule_persist()
+    await service._persist_task
+
+    assert writes == [1, 2]
+    restored = _build_service({"stateFile": str(state_file)})
+    restored._load_persisted_state()
+    assert restored.pnl_tracker.consecutive_losses == 2
+
+
+@pytest.mark.asyncio
+async def test_flush_state_supersedes_debounced_write(tmp_path):
+    state_file = tmp_path / "perps_state.json"
+    service = _build_service({"stateFile": str(state_file)})
+    service._persist_state()
+    service.pnl_tracker.peak_equity = 1234.0
+
+    service._schedule_persist()  # debounced: waits out the remaining window
+    pending = service._persist_task
+    await service.flush_state()
+
+    assert pending.cancelled()
+    restored = _build_service({"stateFile": str(state_file)})
+    restored._load_persisted_state()
+    assert restored.pnl_tracker.peak_equity == 1234.0
+
+
+@pytest.mark.asyncio
+async def test_flush_state_waits_for_a_write_already_in_a_thread(tmp_path, monkeypatch):
+    state_file = tmp_path / "perps_state.json"
+    service = _build_service({"stateFile": str(state_file)})
+    started = threading.Event()
+    writes = []
+
+    def save(path, state):
+        if threading.current_thread() is not threading.main_thread():
+            started.set()
+            time.sleep(0.05)  # still writing when flush_state runs
+        writes.append(state.consecutive_losses)
+        save_perps_state(path, state)
+
+    monkeypatch.setattr(perps_module, "save_perps_state", save)
+    service.pnl_tracker.consecutive_losses = 1
+    service._schedule_persist()
+    await asyncio.to_thread(started.wait, 1.0)
+    service.pnl_tracker.consecutive_losses = 2
+    await service.flush_state()
+
+    assert writes == [1, 2]
+    restored = _build_service({"stateFile": str(state_file)})
+    restored._load_persisted_state()
+    assert restored.pnl_tracker.consecutive_losses == 2
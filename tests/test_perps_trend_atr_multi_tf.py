@@ -1,8 +1,12 @@
 import numpy as np
 import pandas as pd
+import pytest
 
 from src.config import PerpsConfig
-from src.strategies.perps_trend_atr_multi_tf import compute_signals_multi_tf
+from src.strategies.perps_trend_atr_multi_tf import (
+    MultiTfSignalState,
+    compute_signals_multi_tf,
+)
 from src.ta_indicators.ta_core import ema
 
 
@@ -59,6 +63,18 @@ def test_bearish_htf_blocks_entry():
     assert signals["long_signal"] is False
 
 
+def test_volume_filter_reported_when_other_gates_fail():
+    ltf_df = _build_trending_df(260, "5min", start=100, slope=0.05)
+    htf_df = _build_trending_df(240, "60min", start=200, slope=-0.5)
+
+    config = PerpsConfig(minAtrPct=0.0005, useVolumeFilter=True)
+    signals = compute_signals_multi_tf(ltf_df, htf_df, config=config)
+
+    assert signals["long_signal"] is False
+    # Flat volume never spikes, even though the HTF gate already failed.
+    assert signals["volume_ok"] is False
+
+
 def test_low_atr_filters_out_signal():
     ltf_df = _build_trending_df(260, "5min", start=100, slope=0.001)
     htf_df = _build_trending_df(240, "60min", start=90, slope=0.2)
@@ -94,3 +110,24 @@ def test_max_bars_in_trade_propagates():
     config = PerpsConfig(maxBarsInTrade=80)
     signals = compute_signals_multi_tf(ltf_df, htf_df, config=config)
     assert signals["max_bars_in_trade"] == config.maxBarsInTrade
+
+
+def test_state_advances_bar_by_bar_like_full_recompute():
+    rng = np.random.default_rng(4)
+    ltf_df = _build_trending_df(400, "5min", start=100, slope=0.02)
+    ltf_df["close"] += rng.normal(0, 0.3, len(ltf_df))
+    ltf_df["volume"] = rng.uniform(500, 1500, len(ltf_df))
+    htf_df = _build_trending_df(240, "60min", start=90, slope=0.3)
+    config = PerpsConfig(minAtrPct=0.0005, useVolumeFilter=True)
+    state = MultiTfSignalState()
+
+    for end in range(300, len(ltf_df) + 1):
+        window = ltf_df.iloc[:end]
+        incremental = compute_signals_multi_tf(
+            window, htf_df, config=config, state=state
+        )
+        full = compute_signals_multi_tf(window, htf_df, config=config)
+        for key in ("ema20", "ema50", "ema200_htf", "atr", "rsi", "stop_price"):
+            assert incremental[key] == pytest.approx(full[key], rel=1e-12), key
+        assert incremental["long_signal"] == full["long_signal"]
+        assert incremental["volume_ok"] == full["volume_ok"]
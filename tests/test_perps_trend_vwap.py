@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.strategies.perps_trend_vwap import (
+    MIN_BARS,
+    VwapSignalState,
+    compute_signals,
+    compute_signals_batch,
+)
+
+
+def _random_walk_df(periods: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, periods)))
+    idx = pd.date_range("2024-01-01", periods=periods, freq="5min", tz="UTC")
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close * 1.002,
+            "low": close * 0.998,
+            "close": close,
+            "volume": rng.uniform(10, 100, periods),
+        },
+        index=idx,
+    )
+
+
+def test_batch_rows_match_per_bar_signals():
+    df = _random_walk_df(250, seed=3)
+
+    batch = compute_signals_batch(df)
+
+    assert len(batch) == len(df)
+    assert not batch["long_signal"].iloc[:34].any()
+    assert batch["price"].iloc[:34].isna().all()
+    for i in range(34, len(df)):
+        expected = compute_signals(df.iloc[: i + 1])
+        row = batch.iloc[i]
+        assert bool(row["long_signal"]) == expected["long_signal"]
+        for key in ("price", "fast", "slow", "vwap", "rsi", "prev_fast", "prev_slow"):
+            assert row[key] == pytest.approx(expected[key], nan_ok=True), (i, key)
+
+
+def test_state_tracks_growing_and_sliding_frames():
+    df = _random_walk_df(400, seed=5)
+    state = VwapSignalState()
+
+    for i in range(MIN_BARS, len(df)):
+        window = df.iloc[max(0, i + 1 - 200) : i + 1]
+        expected = compute_signals(window)
+        result = compute_signals(window, state=state)
+        assert result["long_signal"] == expected["long_signal"], i
+        keys = ["price", "fast", "slow", "vwap", "prev_fast", "prev_slow"]
+        if i < 200:
+            keys.append("rsi")  # RSI keeps its history once the window slides
+        for key in keys:
+            assert result[key] == pytest.approx(expected[key], rel=1e-9), (i, key)
@@ -144,3 +144,22 @@ def test_cleanup_old_days():
     assert len(tracker.daily_pnl) == 1
     recent_key = recent_date.strftime("%Y-%m-%d")
     assert recent_key in tracker.daily_pnl
+
+
+def test_has_trade_tracks_recorded_timestamps():
+    tracker = PnLTracker()
+    ts = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+    assert not tracker.has_trade(ts)
+    tracker.record_trade(5.0, ts)
+    assert tracker.has_trade(ts)
+    assert not tracker.has_trade(ts + timedelta(seconds=1))
+
+
+def test_get_daily_pnl_uses_supplied_clock():
+    tracker = PnLTracker()
+    ts = datetime(2024, 3, 1, 9, 30, tzinfo=timezone.utc)
+    tracker.record_trade(-7.5, ts)
+
+    assert tracker.get_daily_pnl(now=ts + timedelta(hours=1)) == -7.5
+    assert tracker.get_daily_pnl(now=ts + timedelta(days=1)) == 0.0
@@ -1,11 +1,14 @@
 """Tests for src/services/replay.py — ReplayService."""
 
+import asyncio
+import json
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 from types import ModuleType
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
 
 # Stub nats modules if not installed so the import doesn't fail at collection
@@ -55,13 +58,33 @@ def service():
 # Unit tests — static/helper methods
 # ---------------------------------------------------------------------------
 
+def _build_snapshot(symbol, ts, open_price, high, low, close, volume):
+    """Render a single-row snapshot through the column builder."""
+    import pandas as pd
+
+    df = pd.DataFrame(
+        {
+            "timestamp": [ts.isoformat()],
+            "symbol": [symbol],
+            "open": [float(open_price)],
+            "high": [float(high)],
+            "low": [float(low)],
+            "close": [float(close)],
+            "volume": [float(volume)],
+        }
+    )
+    replay = ReplayService()
+    replay._set_dataset(ReplayService._build_columns(df))
+    return replay._snapshot_at(0)
+
+
 class TestReplayBuildSnapshot:
-    """Test ReplayService._build_snapshot() static method."""
+    """Test ReplayService._build_columns() and _snapshot_at()."""
 
     def test_build_snapshot_structure(self):
         """Snapshot has expected keys (symbol, best_bid, best_ask, etc.)."""
         ts = datetime(2024, 1, 1, tzinfo=timezone.utc)
-        snap = ReplayService._build_snapshot("BTCUSDT", ts, 40000, 41000, 39000, 40500, 100)
+        snap = _build_snapshot("BTCUSDT", ts, 40000, 41000, 39000, 40500, 100)
 
         assert snap["symbol"] == "BTCUSDT"
         assert snap["close"] == 40500
@@ -79,16 +102,38 @@ class TestReplayBuildSnapshot:
     def test_build_snapshot_buy_side(self):
         """Close >= open → last_side is 'buy'."""
         ts = datetime(2024, 1, 1, tzinfo=timezone.utc)
-        snap = ReplayService._build_snapshot("ETH", ts, 100, 110, 90, 105, 50)
+        snap = _build_snapshot("ETH", ts, 100, 110, 90, 105, 50)
         assert snap["last_side"] == "buy"
 
     def test_build_snapshot_sell_side(self):
         """Close < open → last_side is 'sell'."""
         ts = datetime(2024, 1, 1, tzinfo=timezone.utc)
-        snap = ReplayService._build_snapshot("ETH", ts, 100, 110, 90, 95, 50)
+        snap = _build_snapshot("ETH", ts, 100, 110, 90, 95, 50)
         assert snap["last_side"] == "sell"
 
 
+    def test_build_columns_share_symbol_and_side_objects(self):
+        import pandas as pd
+
+        df = pd.DataFrame(
+            {
+                "timestamp": ["t0", "t1", "t2"],
+                "symbol": ["BTC" + "USDT", "".join(["BTC", "USDT"]), "ETHUSDT"],
+                "open": [1.0, 2.0, 3.0],
+                "high": [1.0, 2.0, 3.0],
+                "low": [1.0, 2.0, 3.0],
+                "close": [2.0, 3.0, 2.0],
+                "volume": [1.0, 1.0, 1.0],
+            }
+        )
+        columns = ReplayService._build_columns(df)
+
+        assert list(columns["symbol"]) == ["BTCUSDT", "BTCUSDT", "ETHUSDT"]
+        assert columns["symbol"][0] is columns["symbol"][1]
+        assert list(columns["last_side"]) == ["buy", "buy", "sell"]
+        assert columns["last_side"][0] is columns["last_side"][1]
+
+
 class TestReplayParseSource:
     """Test ReplayService._parse_source()."""
 
@@ -103,6 +148,39 @@ class TestReplayParseSource:
         assert isinstance(path, Path)
 
 
+class TestReplayNormaliseColumns:
+    """Test ReplayService._normalise_columns()."""
+
+    def test_missing_columns_get_defaults_and_float_dtype(self):
+        import pandas as pd
+
+        df = pd.DataFrame({"timestamp": [0, 1], "open": [10, 11], "volume": [5, 6]})
+        out = ReplayService._normalise_columns(df, "ETHUSDT")
+
+        assert list(out["symbol"]) == ["ETHUSDT", "ETHUSDT"]
+        for col in ("high", "low", "close"):
+            assert list(out[col]) == [10.0, 11.0]
+        for col in ("open", "high", "low", "close", "volume"):
+            assert out[col].dtype == "float64"
+
+
+class TestReplayFormatTimestamps:
+    """Test ReplayService._format_timestamps()."""
+
+    def test_matches_isoformat(self):
+        import pandas as pd
+
+        ts = pd.Series(
+            pd.to_datetime(
+                ["2024-01-01T00:00:00", "2024-01-01T00:00:01.250000"],
+                utc=True,
+                format="ISO8601",
+            )
+        )
+        rendered = ReplayService._format_timestamps(ts)
+        assert list(rendered) == [value.isoformat() for value in ts]
+
+
 class TestReplayCoerceTimestamp:
     """Test ReplayService._coerce_timestamp()."""
 
@@ -170,6 +248,17 @@ class TestReplayStatusPayload:
         assert payload["dataset_size"] == 0
         assert payload["last_control"] is None
 
+    def test_status_payload_uses_refreshed_template(self, service):
+        service.config = _mock_config(speed="10x")
+        service._set_dataset({"close": np.zeros(2)})
+        service._interval = service._derive_interval()
+        service._refresh_status_template()
+
+        payload = service.status_payload()
+        assert payload["interval"] == 0.1
+        assert payload["dataset_size"] == 2
+        assert payload["speed"] == "10x"
+
     async def test_status_payload_after_control(self, service):
         await service.set_state("pause")
         payload = service.status_payload()
@@ -190,10 +279,10 @@ class TestReplayOnStartupEmpty:
         mock_client.subscribe.return_value = AsyncMock()
         MockMessaging.return_value = mock_client
 
-        with patch.object(service, "_load_dataset", return_value=[]):
+        with patch.object(service, "_load_dataset", return_value={}):
             await service.on_startup()
 
-        assert service._dataset == []
+        assert service.dataset_size == 0
         assert service._loop_task is None  # no loop started
         mock_client.subscribe.assert_awaited_once()  # control sub registered
 
@@ -209,11 +298,109 @@ class TestReplayOnStartupEmpty:
         mock_client.subscribe.return_value = mock_sub
         MockMessaging.return_value = mock_client
 
-        with patch.object(service, "_load_dataset", return_value=[]):
+        with patch.object(service, "_load_dataset", return_value={}):
             await service.on_startup()
             await service.on_shutdown()
 
         mock_sub.unsubscribe.assert_awaited_once()
         mock_client.close.assert_awaited_once()
         assert service.messaging is None
-        assert service._dataset == []
+        assert service._dataset_cols == {}
+
+
+class TestReplayRunLoopBatching:
+    """Test ReplayService._run_loop() publish batching."""
+
+    async def test_flushes_and_sleeps_once_per_batch(self, service):
+        config = _mock_config()
+        config.replay.batch_size = 3
+        service.config = config
+        service.messaging = AsyncMock()
+        service._set_dataset({"i": np.arange(5)})
+        service._interval = 0.1
+        service._running.set()
+
+        sleep = AsyncMock(side_effect=[None, None, asyncio.CancelledError()])
+        with patch("src.services.replay.asyncio.sleep", sleep):
+            with pytest.raises(asyncio.CancelledError):
+                await service._run_loop()
+
+        # Full batch of 3, tail batch of 2, then the next pass's first batch.
+        assert service.messaging.publish.await_count == 8
+        assert service.messaging.flush.await_count == 3
+        assert [c.args[0] for c in sleep.await_args_list] == pytest.approx(
+            [0.3, 0.2, 0.3]
+        )
+
+    async def test_batch_of_one_does_not_flush(self, service):
+        config = _mock_config()
+        config.replay.batch_size = 1
+        service.config = config
+        service.messaging = AsyncMock()
+        service._set_dataset({"i": np.arange(2)})
+        service._interval = 0.1
+        service._running.set()
+
+        sleep = AsyncMock(side_effect=[None, asyncio.CancelledError()])
+        with patch("src.services.replay.asyncio.sleep", sleep):
+            with pytest.raises(asyncio.CancelledError):
+                await service._run_loop()
+
+        assert service.messaging.publish.await_count == 2
+        service.messaging.flush.assert_not_awaited()
+
+    async def test_publishes_encoded_snapshots(self, service):
+        service.config = _mock_config()
+        service.messaging = AsyncMock()
+        service._set_dataset(
+            {"symbol": np.array(["BTCUSDT"], dtype=object), "close": np.array([1.5])}
+        )
+        service._running.set()
+
+        with patch(
+            "src.services.replay.asyncio.sleep",
+            AsyncMock(side_effect=asyncio.CancelledError()),
+        ):
+            with pytest.raises(asyncio.CancelledError):
+                await service._run_loop()
+
+        subject, payload = service.messaging.publish.await_args.args
+        assert subject == "market.tick"
+        assert json.loads(payload) == {"symbol": "BTCUSDT", "close": 1.5}
+
+
+class TestReplayLoadDataset:
+    """Test ReplayService._load_dataset()."""
+
+    def test_load_csv_sorts_and_fills_missing_columns(self, service, tmp_path):
+        path = tmp_path / "bars.csv"
+        path.write_text(
+            "timestamp,close\n"
+            "2024-01-01T00:01:00+00:00,101.0\n"
+            "2024-01-01T00:00:00+00:00,100.0\n"
+        )
+        service.config = _mock_config(source=f"csv://{path}")
+
+        service._set_dataset(service._load_dataset())
+
+        assert service.dataset_size == 2
+        assert list(service._dataset_cols["close"]) == [100.0, 101.0]
+        first = service._snapshot_at(0)
+        assert first["symbol"] == "BTCUSDT"
+        assert first["open"] == first["high"] == first["low"] == 100.0
+        assert first["volume"] == 1.0
+        assert first["timestamp"] == "2024-01-01T00:00:00+00:00"
+
+    def test_load_drops_unparseable_timestamps(self, service, tmp_path):
+        path = tmp_path / "bars.csv"
+        path.write_text(
+            "timestamp,close\n"
+            "2024-01-01T00:00:00+00:00,100.0\n"
+            "not-a-date,101.0\n"
+        )
+        service.config = _mock_config(source=f"csv://{path}")
+
+        service._set_dataset(service._load_dataset())
+
+        assert service.dataset_size == 1
+        assert list(service._dataset_cols["close"]) == [100.0]
@@ -152,7 +152,53 @@ class TestReporterService:
         # Should have published once
         mock_client.publish.assert_awaited_once()
         published_subject = mock_client.publish.call_args[0][0]
-        published_data = mock_client.publish.call_args[0][1]
+        published_data = json.loads(mock_client.publish.call_args[0][1])
         assert published_subject == "reports.performance"
         assert "timestamp" in published_data
         assert published_data["equity"] == 50000
+
+    async def test_handle_metrics_accepts_raw_bytes(self, reporter):
+        """Payload bytes are parsed directly, including non-ASCII content."""
+        msg = MagicMock()
+        msg.data = '{"strategy": "héron", "pnl": 1.5}'.encode("utf-8")
+
+        await reporter._handle_metrics(msg)
+
+        assert reporter._latest_metrics == {"strategy": "héron", "pnl": 1.5}
+
+    async def test_publish_summary_sleeps_to_monotonic_deadline(self, reporter):
+        """Publish time is subtracted from the sleep so the cadence doesn't drift."""
+        reporter.config = _mock_config()
+        reporter.messaging = AsyncMock()
+        reporter._latest_metrics = {"pnl": 1}
+
+        sleep = AsyncMock(side_effect=[None, asyncio.CancelledError()])
+        clock = iter([1000.0, 1002.5, 1061.0])
+        monotonic = patch(
+            "src.services.reporter.time.monotonic", side_effect=lambda: next(clock)
+        )
+        with monotonic, patch("src.services.reporter.asyncio.sleep", sleep):
+            with pytest.raises(asyncio.CancelledError):
+                await reporter._publish_summary_loop()
+
+        assert [c.args[0] for c in sleep.await_args_list] == pytest.approx([57.5, 59.0])
+
+    async def test_publish_summary_reuses_buffer(self, reporter):
+        """The summary dict is refilled in place rather than copied per publish."""
+        reporter.config = _mock_config()
+        reporter.messaging = AsyncMock()
+        reporter._latest_metrics = {"pnl": 1}
+        buffer = reporter._summary_buffer
+
+        with patch(
+            "src.services.reporter.asyncio.sleep",
+            AsyncMock(side_effect=[None, asyncio.CancelledError()]),
+        ):
+            with pytest.raises(asyncio.CancelledError):
+                await reporter._publish_summary_loop()
+
+        assert reporter._summary_buffer is buffer
+        assert reporter.messaging.publish.await_count == 2
+        payload = json.loads(reporter.messaging.publish.await_args.args[1])
+        assert payload["pnl"] == 1
+        assert "timestamp" in payload
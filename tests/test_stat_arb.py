@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.domain.entities import MarketData, Side
+from src.strategies.stat_arb import StatisticalArbitrageStrategy
+
+
+def _tick(symbol: str, price: float) -> MarketData:
+    return MarketData(
+        symbol=symbol,
+        timestamp=datetime(2024, 1, 1),
+        open=price,
+        high=price,
+        low=price,
+        close=price,
+        volume=1.0,
+    )
+
+
+async def test_running_spread_statistics_match_window():
+    rng = np.random.default_rng(2)
+    prices_a = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 200)))
+    prices_b = 50 * np.exp(np.cumsum(rng.normal(0, 0.01, 200)))
+    strategy = StatisticalArbitrageStrategy(
+        ("A", "B"), z_score_threshold=1e9, lookback=60
+    )
+
+    for price_a, price_b in zip(prices_a, prices_b, strict=True):
+        await strategy.on_tick(_tick("A", price_a))
+        await strategy.on_tick(_tick("B", price_b))
+
+    spreads = np.log(prices_a) - np.log(prices_b)
+    window = spreads[-60:]
+    assert list(strategy._spreads) == pytest.approx(window)
+    assert strategy._spread_mean == pytest.approx(window.mean(), rel=1e-12)
+    assert strategy._spread_m2 / 60 == pytest.approx(window.var(), rel=1e-6)
+
+
+async def test_waits_for_both_legs():
+    strategy = StatisticalArbitrageStrategy(("A", "B"), lookback=2)
+
+    assert await strategy.on_tick(_tick("A", 100.0)) == []
+    assert await strategy.on_tick(_tick("A", 101.0)) == []
+    assert len(strategy._spreads) == 0
+
+    await strategy.on_tick(_tick("B", 50.0))
+    await strategy.on_tick(_tick("B", 51.0))
+    assert list(strategy._spreads) == pytest.approx([np.log(101.0 / 50.0)])
+
+
+async def test_opens_short_spread_when_a_rallies():
+    strategy = StatisticalArbitrageStrategy(
+        ("A", "B"), z_score_threshold=1.5, lookback=20
+    )
+    for i in range(19):
+        await strategy.on_tick(_tick("A", 100.0 + 0.01 * (i % 2)))
+        await strategy.on_tick(_tick("B", 100.0))
+    await strategy.on_tick(_tick("B", 100.0))
+
+    orders = await strategy.on_tick(_tick("A", 110.0))
+
+    assert {(o.symbol, o.side) for o in orders} == {
+        ("A", Side.SELL),
+        ("B", Side.BUY),
+    }
+    assert strategy.spread_state == -1
+
+
+def test_pair_order_ids_are_unique_per_instance():
+    strategy = StatisticalArbitrageStrategy(("A", "B"))
+    other = StatisticalArbitrageStrategy(("A", "B"))
+
+    ids = [
+        order.id
+        for s in (strategy, other)
+        for _ in range(3)
+        for order in s._build_pair_orders("A", "B", qty=1.0, price=100.0)
+    ]
+
+    assert len(set(ids)) == len(ids)
+    assert all(i.startswith(strategy._id_prefix) for i in ids[:6])
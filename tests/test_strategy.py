@@ -17,6 +17,7 @@ from src.models import (
     TradingSetup,
     TradingSignal,
 )
+from src.signal_generator import _compile_rules, _Last
 from src.strategy import TradingStrategy
 
 
@@ -349,6 +350,49 @@ class TestSignalGeneration:
             assert signal.stop_loss > 0
             assert signal.take_profit > 0
 
+    def test_signal_generation_reuses_stream_state(self, strategy, sample_data):
+        """Sliding the window by one bar advances the cached stream state."""
+        generator = strategy.signal_generator
+        config = strategy.config.strategy
+
+        generator.generate_signals(sample_data.iloc[:-1], config, stream_id="BTC")
+        stream = next(
+            s for key, s in generator._streams.items() if key[:2] == ("signals", "BTC")
+        )
+        stream.reset = None  # a re-seed would now fail loudly
+
+        generator.generate_signals(sample_data.iloc[1:], config, stream_id="BTC")
+
+        expected = TechnicalIndicators.rsi(
+            sample_data["close"].iloc[1:], config.signals.rsi_period
+        ).iloc[-1]
+        assert stream.values["rsi"] == pytest.approx(expected, nan_ok=True)
+
+    def test_compiled_rules_follow_thresholds(self, strategy):
+        """Rules compiled for a config use that config's RSI thresholds."""
+        config = strategy.config.strategy.model_copy(deep=True)
+        last = _Last(
+            price=100.0,
+            ema21=100.0,
+            rsi=25.0,
+            high=200.0,
+            low=0.0,
+            bb_upper=200.0,
+            bb_middle=100.0,
+            bb_lower=0.0,
+        )
+        timestamp = datetime.now(timezone.utc)
+
+        config.signals.rsi_oversold = 30
+        strategy.signal_generator.bind(config)
+        signals = []
+        _compile_rules(30, config.signals.rsi_overbought)(last, {}, timestamp, signals)
+        assert [(s.signal_type, s.direction) for s in signals] == [("pullback", "long")]
+
+        signals = []
+        _compile_rules(20, config.signals.rsi_overbought)(last, {}, timestamp, signals)
+        assert signals == []
+
 
 class TestConfidenceScoring:
     """Test confidence scoring system."""
@@ -543,6 +587,35 @@ class TestRiskManagement:
         assert len(filtered) == 1
         assert filtered[0].direction == "long"
 
+    def test_microstructure_filtering(self, strategy):
+        """VWAP and order book imbalance gate signals by direction."""
+        config = strategy.config.strategy.model_copy(deep=True)
+        config.vwap.enabled = True
+        config.vwap.require_price_above_vwap_for_longs = True
+        config.vwap.require_price_below_vwap_for_shorts = True
+        config.orderbook.enabled = True
+        config.orderbook.use_for_entry = True
+        config.orderbook.imbalance_threshold = 0.1
+
+        def make(direction, entry):
+            return TradingSignal(
+                signal_type="breakout",
+                direction=direction,
+                strength=0.8,
+                confidence=0.7,
+                entry_price=entry,
+                stop_loss=entry * 0.98,
+                take_profit=entry * 1.02,
+            )
+
+        signals = [make("long", 101.0), make("long", 99.0), make("short", 99.0)]
+        filtered = strategy.signal_generator.apply_microstructure_filters(
+            signals, 100.0, {"imbalance": 0.2}, config
+        )
+
+        # Long below VWAP is dropped; short is dropped by positive imbalance
+        assert filtered == [signals[0]]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,65 @@
+import sqlite3
+
+import pytest
+
+from src.database import DatabaseManager
+from src.services.strategy_store import StrategyService
+
+
+@pytest.mark.asyncio
+async def test_save_strategy_upserts_by_name(tmp_path):
+    database = DatabaseManager(f"sqlite:///{tmp_path / 'strategies.db'}")
+    await database.initialize()
+    service = StrategyService(database)
+
+    first_id = await service.save_strategy("trend", {"ema": 21})
+    assert first_id is not None
+    assert await service.activate_strategy("trend")
+
+    second_id = await service.save_strategy("trend", {"ema": 55})
+    assert second_id == first_id
+
+    strategies = await database.get_strategies()
+    assert len(strategies) == 1
+    assert strategies[0].config == {"ema": 55}
+    assert strategies[0].is_active  # saving a new config keeps the active flag
+
+    other_id = await service.save_strategy("breakout", {"period": 20})
+    assert other_id not in (None, first_id)
+
+    await database.close()
+
+
+@pytest.mark.asyncio
+async def test_save_strategy_falls_back_when_names_are_duplicated(tmp_path):
+    path = tmp_path / "strategies.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE strategies (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                config TEXT NOT NULL,
+                is_active INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        conn.executemany(
+            "INSERT INTO strategies (name, config) VALUES (?, ?)",
+            [("trend", "{}"), ("trend", "{}")],
+        )
+    database = DatabaseManager(f"sqlite:///{path}")
+    await database.initialize()
+    assert not database.backend.strategy_names_unique
+    service = StrategyService(database)
+
+    assert await service.save_strategy("trend", {"ema": 55}) is not None
+    assert await service.save_strategy("breakout", {"period": 20}) is not None
+
+    configs = [(s.name, s.config) for s in await database.get_strategies()]
+    assert ("breakout", {"period": 20}) in configs
+    assert ("trend", {"ema": 55}) in configs
+
+    await database.close()
@@ -1,5 +1,8 @@
+import json
 from datetime import datetime, timedelta, timezone
 
+import pytest
+
 from src.state.symbol_health_store import SymbolHealthStore, _format_iso
 
 
@@ -58,3 +61,148 @@ def test_is_blocked_and_multiplier(tmp_path):
         store.get_effective_size_multiplier("SOLUSDT", warning_size_multiplier=0.5)
         == 0.5
     )
+
+
+def test_blocked_until_memoized_but_not_persisted(tmp_path):
+    path = tmp_path / "health.json"
+    store = SymbolHealthStore(path)
+    now = datetime.now(timezone.utc)
+    store.update_symbol_state(
+        "BTCUSDT",
+        status="FAILING",
+        reasons=["cooldown"],
+        blocked_until=_format_iso(now + timedelta(minutes=5)),
+    )
+
+    store.close()
+    store.export_json()
+    assert "_blocked_until" not in path.read_text()
+    assert set(store.get_symbol_state("BTCUSDT")) == {
+        "last_status",
+        "last_evaluated_at",
+        "blocked_until",
+        "last_reasons",
+    }
+
+    reloaded = SymbolHealthStore(path)
+    assert reloaded._data["symbols"]["BTCUSDT"].blocked_until_ts is not None
+    assert reloaded.is_blocked("BTCUSDT", now=now)
+    assert not reloaded.is_blocked("ETHUSDT", now=now)
+
+
+def test_updates_journaled_then_compacted(tmp_path):
+    path = tmp_path / "health.json"
+    journal = tmp_path / "health.json.log"
+    store = SymbolHealthStore(path, compact_every=3, flush_interval_s=0.0)
+    for status in ("OK", "WARNING"):
+        store.update_symbol_state(
+            "BTCUSDT", status=status, reasons=[], blocked_until=None
+        )
+
+    assert not path.exists()
+    assert len(journal.read_bytes().splitlines()) == 2
+    replayed = SymbolHealthStore(path).get_symbol_state("BTCUSDT")
+    assert replayed["last_status"] == "WARNING"
+
+    store.update_symbol_state(
+        "ETHUSDT", status="FAILING", reasons=[], blocked_until=None
+    )
+
+    assert journal.read_bytes() == b""
+    reloaded = SymbolHealthStore(path)
+    assert reloaded.get_symbol_state("BTCUSDT")["last_status"] == "WARNING"
+    assert reloaded.get_symbol_state("ETHUSDT")["last_status"] == "FAILING"
+
+
+def test_journal_writes_coalesced_until_flush(tmp_path):
+    path = tmp_path / "health.json"
+    journal = tmp_path / "health.json.log"
+    store = SymbolHealthStore(path, flush_interval_s=3600.0)
+    for symbol in ("BTCUSDT", "ETHUSDT", "SOLUSDT"):
+        store.update_symbol_state(symbol, status="OK", reasons=[], blocked_until=None)
+
+    # The first update flushes immediately; the rest wait for the interval.
+    assert len(journal.read_bytes().splitlines()) == 1
+
+    store.flush()
+    assert len(journal.read_bytes().splitlines()) == 3
+
+
+def test_legacy_json_snapshot_migrates_to_msgpack(tmp_path):
+    pytest.importorskip("msgpack")
+    path = tmp_path / "health.json"
+    legacy = {"symbols": {"BTCUSDT": {"last_status": "WARNING"}}}
+    path.write_text(json.dumps(legacy))
+
+    store = SymbolHealthStore(path)
+    assert store.get_symbol_state("BTCUSDT")["last_status"] == "WARNING"
+    store.update_symbol_state("ETHUSDT", status="OK", reasons=[], blocked_until=None)
+    store.close()
+
+    assert (tmp_path / "health.mpk").exists()
+    assert not path.exists()
+    reloaded = SymbolHealthStore(path)
+    assert reloaded.get_symbol_state("BTCUSDT")["last_status"] == "WARNING"
+    assert reloaded.get_symbol_state("ETHUSDT")["last_status"] == "OK"
+
+
+def test_status_normalized_on_write(tmp_path):
+    store = SymbolHealthStore(tmp_path / "health.json")
+    store.update_symbol_state(
+        "btcusdt", status="warning", reasons=[], blocked_until=None
+    )
+
+    assert store.get_symbol_state("BTCUSDT")["last_status"] == "WARNING"
+    assert store.get_effective_size_multiplier("BTCUSDT", 0.5) == 0.5
+
+
+def test_unchanged_state_is_not_journaled(tmp_path):
+    path = tmp_path / "health.json"
+    journal = tmp_path / "health.json.log"
+    store = SymbolHealthStore(path, flush_interval_s=0.0)
+    for evaluated_at in ("2025-01-01T00:00:00Z", "2025-01-01T00:05:00Z"):
+        store.update_symbol_state(
+            "BTCUSDT",
+            status="OK",
+            reasons=["healthy"],
+            blocked_until=None,
+            evaluated_at=evaluated_at,
+        )
+
+    assert len(journal.read_bytes().splitlines()) == 1
+    state = store.get_symbol_state("BTCUSDT")
+    assert state["last_evaluated_at"] == "2025-01-01T00:05:00Z"
+
+    store.close()
+    reloaded = SymbolHealthStore(path).get_symbol_state("BTCUSDT")
+    assert reloaded["last_evaluated_at"] == "2025-01-01T00:05:00Z"
+
+
+def test_unknown_symbol_is_not_blocked(tmp_path):
+    store = SymbolHealthStore(tmp_path / "health.json")
+    assert not store.is_blocked("NEWUSDT")
+    assert store.get_effective_size_multiplier("NEWUSDT", 0.5) == 1.0
+    assert "NEWUSDT" not in store._data["symbols"]
+
+
+def test_get_symbol_state_returns_a_detached_dict(tmp_path):
+    store = SymbolHealthStore(tmp_path / "health.json")
+    store.update_symbol_state(
+        "BTCUSDT",
+        status="warning",
+        reasons=["drawdown"],
+        blocked_until=None,
+        evaluated_at="2025-01-01T00:00:00Z",
+    )
+
+    state = store.get_symbol_state("BTCUSDT")
+    assert state == {
+        "last_status": "WARNING",
+        "last_evaluated_at": "2025-01-01T00:00:00Z",
+        "blocked_until": None,
+        "last_reasons": ["drawdown"],
+    }
+    assert json.loads(json.dumps(state)) == state
+
+    state["last_reasons"].append("mutated")
+    assert store.get_symbol_state("BTCUSDT")["last_reasons"] == ["drawdown"]
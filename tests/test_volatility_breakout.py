@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.domain.entities import MarketData
+from src.strategies.volatility_breakout import VolatilityBreakoutStrategy
+
+
+def _tick(close: float, high: float, low: float, symbol: str = "BTC/USDT"):
+    return MarketData(
+        symbol=symbol,
+        timestamp=datetime(2024, 1, 1),
+        open=close,
+        high=high,
+        low=low,
+        close=close,
+        volume=1.0,
+    )
+
+
+async def test_running_bands_and_atr_match_window_statistics():
+    rng = np.random.default_rng(7)
+    closes = 30_000 * np.exp(np.cumsum(rng.normal(0, 0.01, 500)))
+    highs = closes * (1 + rng.random(500) * 0.01)
+    lows = closes * (1 - rng.random(500) * 0.01)
+    strategy = VolatilityBreakoutStrategy("BTC/USDT", lookback=20, atr_window=14)
+
+    for close, high, low in zip(closes, highs, lows, strict=True):
+        await strategy.on_tick(_tick(close, high, low))
+
+    window = closes[-20:]
+    assert strategy._band_mean == pytest.approx(window.mean(), rel=1e-12)
+    assert strategy._band_m2 / 20 == pytest.approx(window.var(), rel=1e-6)
+
+    prev_close = closes[-15:-1]
+    tr = np.maximum.reduce(
+        [
+            highs[-14:] - lows[-14:],
+            np.abs(highs[-14:] - prev_close),
+            np.abs(lows[-14:] - prev_close),
+        ]
+    )
+    assert strategy._atr() == pytest.approx(tr.mean(), rel=1e-9)
+
+
+async def test_other_symbols_are_ignored():
+    strategy = VolatilityBreakoutStrategy("BTC/USDT", lookback=3, atr_window=2)
+
+    assert await strategy.on_tick(_tick(1.0, 2.0, 0.5, symbol="ETH/USDT")) == []
+    assert strategy._atr() == 0.0
+    assert len(strategy._band_window) == 0
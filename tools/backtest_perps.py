@@ -29,8 +29,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.config import PerpsConfig, get_config
 from src.engine.perps_executor import risk_position_size
 from src.exchanges.zoomex_v3 import ZoomexV3Client
-from src.strategies.perps_trend_atr_multi_tf import compute_signals_multi_tf
-from src.strategies.perps_trend_vwap import compute_signals
+from src.strategies.perps_trend_atr_multi_tf import (
+    MultiTfSignalState,
+    compute_signals_multi_tf,
+)
+from src.strategies.perps_trend_vwap import compute_signals_batch
 
 logging.basicConfig(
     level=logging.INFO,
@@ -315,6 +318,12 @@ class PerpsBacktest:
             if htf_df is None or htf_df.empty:
                 return {"error": "HTF data required for multi-timeframe strategy"}
 
+        signal_state = MultiTfSignalState()
+        # The single-timeframe signals are causal, so compute them for every
+        # bar in one pass instead of re-running them on each growing window.
+        batch_signals = None
+        if not self.use_multi_tf:
+            batch_signals = compute_signals_batch(ltf_df).to_dict("records")
         for i in range(start_idx, len(ltf_df)):
             window_ltf = ltf_df.iloc[: i + 1]
             ts = window_ltf.index[-1]
@@ -323,10 +332,11 @@ class PerpsBacktest:
                 assert htf_df is not None
                 htf_window = htf_df.loc[htf_df.index <= ts]
                 signals = compute_signals_multi_tf(
-                    window_ltf, htf_window, config=self.config
+                    window_ltf, htf_window, config=self.config, state=signal_state
                 )
             else:
-                signals = compute_signals(window_ltf)
+                assert batch_signals is not None
+                signals = batch_signals[i]
 
             bar = window_ltf.iloc[-1]
             self.manage_open_position(bar, signals, ts)